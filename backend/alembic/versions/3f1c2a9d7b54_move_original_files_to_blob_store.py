@@ -0,0 +1,73 @@
+"""move_original_files_to_blob_store
+
+Revision ID: 3f1c2a9d7b54
+Revises: e24010cbc71d
+Create Date: 2026-10-18 10:12:31.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.blob_store import get_blob_store
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a9d7b54'
+down_revision: Union[str, Sequence[str], None] = 'e24010cbc71d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('submissions', sa.Column('file_hash', sa.String(length=64), nullable=True, comment='原始文件SHA-256（文件内容保存在文件存储中）'))
+    op.add_column('submissions', sa.Column('file_size', sa.Integer(), nullable=True, comment='原始文件大小（字节）'))
+    op.create_index(op.f('ix_submissions_file_hash'), 'submissions', ['file_hash'], unique=False)
+
+    # 逐行把原始文件迁移到文件存储，避免一次性把所有文件读入内存
+    conn = op.get_bind()
+    blob_store = get_blob_store()
+    submission_ids = [row.id for row in conn.execute(
+        sa.text("SELECT id FROM submissions WHERE original_file IS NOT NULL")
+    )]
+    for submission_id in submission_ids:
+        content = conn.execute(
+            sa.text("SELECT original_file FROM submissions WHERE id = :id"),
+            {"id": submission_id}
+        ).scalar()
+        file_hash, file_size = blob_store.put_bytes(content)
+        conn.execute(
+            sa.text("UPDATE submissions SET file_hash = :file_hash, file_size = :file_size WHERE id = :id"),
+            {"file_hash": file_hash, "file_size": file_size, "id": submission_id}
+        )
+
+    with op.batch_alter_table('submissions') as batch_op:
+        batch_op.drop_column('original_file')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('submissions', sa.Column('original_file', sa.LargeBinary(), nullable=True, comment='原始文件内容'))
+
+    # 把文件存储中的内容写回数据库（文件存储中的内容保留不删除）
+    conn = op.get_bind()
+    blob_store = get_blob_store()
+    rows = conn.execute(
+        sa.text("SELECT id, file_hash FROM submissions WHERE file_hash IS NOT NULL")
+    ).fetchall()
+    for row in rows:
+        if not blob_store.exists(row.file_hash):
+            continue
+        with blob_store.open(row.file_hash) as f:
+            content = f.read()
+        conn.execute(
+            sa.text("UPDATE submissions SET original_file = :content WHERE id = :id"),
+            {"content": content, "id": row.id}
+        )
+
+    op.drop_index(op.f('ix_submissions_file_hash'), table_name='submissions')
+    with op.batch_alter_table('submissions') as batch_op:
+        batch_op.drop_column('file_size')
+        batch_op.drop_column('file_hash')
@@ -0,0 +1,30 @@
+"""add_parse_job_lease
+
+Revision ID: 6c2f8e1b9d47
+Revises: b8e1d4c7f2a6
+Create Date: 2026-10-19 10:12:36.208415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c2f8e1b9d47'
+down_revision: Union[str, Sequence[str], None] = 'b8e1d4c7f2a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 已有的解析中任务没有租约，视为已过期，由下一个启动的进程重新排队
+    op.add_column('parse_jobs', sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True, comment='租约到期时间（解析中的任务由所在进程定期续约，过期视为进程已退出）'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('parse_jobs') as batch_op:
+        batch_op.drop_column('lease_expires_at')
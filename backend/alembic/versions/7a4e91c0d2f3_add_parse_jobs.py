@@ -0,0 +1,61 @@
+"""add_parse_jobs
+
+Revision ID: 7a4e91c0d2f3
+Revises: 3f1c2a9d7b54
+Create Date: 2026-10-18 11:03:47.518220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a4e91c0d2f3'
+down_revision: Union[str, Sequence[str], None] = '3f1c2a9d7b54'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# PostgreSQL 中枚举是独立的类型：add_column 不会自动创建，drop_table/drop_column 也不会删除
+parse_status_enum = sa.Enum('PARSING', 'PARSED', 'FAILED', name='parsestatus')
+parse_job_status_enum = sa.Enum('PENDING', 'RUNNING', 'DONE', 'FAILED', 'CANCELLED', name='parsejobstatus')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('parse_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('submission_id', sa.Integer(), nullable=False, comment='提交ID'),
+    sa.Column('file_hash', sa.String(length=64), nullable=False, comment='待解析文件的SHA-256'),
+    sa.Column('status', parse_job_status_enum, nullable=False, comment='任务状态'),
+    sa.Column('attempts', sa.Integer(), nullable=False, comment='已尝试次数'),
+    sa.Column('error', sa.Text(), nullable=True, comment='失败原因'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True, comment='创建时间'),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True, comment='更新时间'),
+    sa.ForeignKeyConstraint(['submission_id'], ['submissions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_parse_jobs_id'), 'parse_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_parse_jobs_submission_id'), 'parse_jobs', ['submission_id'], unique=False)
+    op.create_index(op.f('ix_parse_jobs_status'), 'parse_jobs', ['status'], unique=False)
+
+    # 已有提交都是同步解析的：有解析数据的视为解析完成，否则视为解析失败
+    parse_status_enum.create(op.get_bind(), checkfirst=True)
+    op.add_column('submissions', sa.Column('parse_status', parse_status_enum, nullable=True, comment='文件解析状态'))
+    op.execute("UPDATE submissions SET parse_status = 'FAILED' WHERE file_json IS NULL")
+    op.execute("UPDATE submissions SET parse_status = 'PARSED' WHERE file_json IS NOT NULL")
+    with op.batch_alter_table('submissions') as batch_op:
+        batch_op.alter_column('parse_status', existing_type=parse_status_enum, nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('submissions') as batch_op:
+        batch_op.drop_column('parse_status')
+    op.drop_index(op.f('ix_parse_jobs_status'), table_name='parse_jobs')
+    op.drop_index(op.f('ix_parse_jobs_submission_id'), table_name='parse_jobs')
+    op.drop_index(op.f('ix_parse_jobs_id'), table_name='parse_jobs')
+    op.drop_table('parse_jobs')
+    parse_status_enum.drop(op.get_bind(), checkfirst=True)
+    parse_job_status_enum.drop(op.get_bind(), checkfirst=True)
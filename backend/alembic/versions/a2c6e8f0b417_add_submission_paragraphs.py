@@ -0,0 +1,126 @@
+"""add_submission_paragraphs
+
+Revision ID: a2c6e8f0b417
+Revises: e7b3c915d0a4
+Create Date: 2026-10-18 16:35:52.604117
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.outline_utils import build_outline_tree
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2c6e8f0b417'
+down_revision: Union[str, Sequence[str], None] = 'e7b3c915d0a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+paragraphs_table = sa.table(
+    'submission_paragraphs',
+    sa.column('submission_id', sa.Integer),
+    sa.column('position', sa.Integer),
+    sa.column('text', sa.Text),
+    sa.column('word_count', sa.Integer),
+    sa.column('heading_level', sa.Integer),
+    sa.column('style', sa.String),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('submission_paragraphs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('submission_id', sa.Integer(), nullable=False, comment='提交ID'),
+    sa.Column('position', sa.Integer(), nullable=False, comment='段落在文档中的序号（包括空段落）'),
+    sa.Column('text', sa.Text(), nullable=False, comment='段落文本'),
+    sa.Column('word_count', sa.Integer(), nullable=False, comment='字数（不含空格）'),
+    sa.Column('heading_level', sa.Integer(), nullable=True, comment='标题级别（Title 为 0，非标题段落为空）'),
+    sa.Column('style', sa.String(length=100), nullable=True, comment='标题样式名（非标题段落为空）'),
+    sa.ForeignKeyConstraint(['submission_id'], ['submissions.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('submission_id', 'position', name='unique_submission_paragraph')
+    )
+    op.create_index('ix_submission_paragraphs_outline', 'submission_paragraphs', ['submission_id', 'position'], unique=False,
+                    sqlite_where=sa.text('heading_level IS NOT NULL'), postgresql_where=sa.text('heading_level IS NOT NULL'))
+    op.add_column('submissions', sa.Column('paragraph_count', sa.Integer(), nullable=True, comment='非空段落数（解析完成前为空）'))
+    op.add_column('submissions', sa.Column('total_words_count', sa.Integer(), nullable=True, comment='总字数（解析完成前为空）'))
+
+    # 逐个提交把 file_json 拆分为段落行，避免一次性把所有文档读入内存
+    conn = op.get_bind()
+    submission_ids = [row.id for row in conn.execute(
+        sa.text("SELECT id FROM submissions WHERE file_json IS NOT NULL")
+    )]
+    for submission_id in submission_ids:
+        content = conn.execute(
+            sa.text("SELECT file_json FROM submissions WHERE id = :id"), {"id": submission_id}
+        ).scalar()
+        try:
+            document = json.loads(content)
+        except json.JSONDecodeError:
+            continue
+        headings = {item["id"]: item for item in document.get("outline", [])}
+        rows = []
+        for paragraph in document.get("paragraphs", []):
+            heading = headings.get(paragraph["id"])
+            rows.append({
+                "submission_id": submission_id,
+                "position": paragraph["id"],
+                "text": paragraph["text"],
+                "word_count": paragraph["word_count"],
+                "heading_level": heading["level"] if heading else None,
+                "style": heading["style"] if heading else None,
+            })
+        if rows:
+            conn.execute(paragraphs_table.insert(), rows)
+        conn.execute(
+            sa.text("UPDATE submissions SET paragraph_count = :paragraph_count, total_words_count = :total_words_count WHERE id = :id"),
+            {"paragraph_count": document.get("paragraph_count", len(rows)),
+             "total_words_count": document.get("total_words_count", 0), "id": submission_id}
+        )
+
+    with op.batch_alter_table('submissions') as batch_op:
+        batch_op.drop_column('file_json')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('submissions', sa.Column('file_json', sa.Text(), nullable=True, comment='文件JSON数据（教师查看用）'))
+
+    # 把段落表还原为 parse_docx 格式的 JSON
+    conn = op.get_bind()
+    submissions = conn.execute(
+        sa.text("SELECT id, paragraph_count, total_words_count FROM submissions WHERE paragraph_count IS NOT NULL")
+    ).fetchall()
+    for submission in submissions:
+        rows = conn.execute(
+            sa.text("SELECT position, text, word_count, heading_level, style FROM submission_paragraphs "
+                    "WHERE submission_id = :id ORDER BY position"),
+            {"id": submission.id}
+        ).fetchall()
+        outline = [
+            {"id": row.position, "text": row.text, "level": row.heading_level, "style": row.style}
+            for row in rows if row.heading_level is not None
+        ]
+        document = {
+            "total_words_count": submission.total_words_count,
+            "paragraph_count": submission.paragraph_count,
+            "paragraphs": [{"id": row.position, "text": row.text, "word_count": row.word_count} for row in rows],
+            "outline": outline,
+            "outline_tree": build_outline_tree(outline),
+        }
+        conn.execute(
+            sa.text("UPDATE submissions SET file_json = :file_json WHERE id = :id"),
+            {"file_json": json.dumps(document, ensure_ascii=False), "id": submission.id}
+        )
+
+    with op.batch_alter_table('submissions') as batch_op:
+        batch_op.drop_column('total_words_count')
+        batch_op.drop_column('paragraph_count')
+    op.drop_index('ix_submission_paragraphs_outline', table_name='submission_paragraphs',
+                  sqlite_where=sa.text('heading_level IS NOT NULL'), postgresql_where=sa.text('heading_level IS NOT NULL'))
+    op.drop_table('submission_paragraphs')
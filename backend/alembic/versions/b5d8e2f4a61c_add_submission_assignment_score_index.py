@@ -0,0 +1,28 @@
+"""add_submission_assignment_score_index
+
+Revision ID: b5d8e2f4a61c
+Revises: 7a4e91c0d2f3
+Create Date: 2026-10-18 13:20:41.862503
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d8e2f4a61c'
+down_revision: Union[str, Sequence[str], None] = '7a4e91c0d2f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_submissions_assignment_score', 'submissions', ['assignment_id', 'score'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_submissions_assignment_score', table_name='submissions')
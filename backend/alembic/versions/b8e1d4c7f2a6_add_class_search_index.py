@@ -0,0 +1,30 @@
+"""add_class_search_index
+
+Revision ID: b8e1d4c7f2a6
+Revises: f3b9d2a1c7e5
+Create Date: 2026-10-18 21:05:12.504117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from app.models.class_search import create_class_search_index, drop_class_search_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e1d4c7f2a6'
+down_revision: Union[str, Sequence[str], None] = 'f3b9d2a1c7e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite：FTS5 全文索引表和同步触发器（并为已有班级建立索引）；PostgreSQL：pg_trgm 三元组索引
+    create_class_search_index(op.get_bind())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_class_search_index(op.get_bind())
@@ -0,0 +1,71 @@
+"""add_assignment_stats
+
+Revision ID: c9a3f17e5b28
+Revises: b5d8e2f4a61c
+Create Date: 2026-10-18 14:02:16.307715
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9a3f17e5b28'
+down_revision: Union[str, Sequence[str], None] = 'b5d8e2f4a61c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('assignment_stats',
+    sa.Column('assignment_id', sa.Integer(), nullable=False, comment='任务ID'),
+    sa.Column('submission_count', sa.Integer(), nullable=False, comment='提交数'),
+    sa.Column('graded_count', sa.Integer(), nullable=False, comment='已评分数'),
+    sa.Column('score_sum', sa.Float(), nullable=False, comment='分数总和'),
+    sa.Column('score_sum_squares', sa.Float(), nullable=False, comment='分数平方和'),
+    sa.Column('min_score', sa.Float(), nullable=True, comment='最低分'),
+    sa.Column('max_score', sa.Float(), nullable=True, comment='最高分'),
+    sa.Column('bucket_0', sa.Integer(), nullable=False, comment='[0, 10) 分段人数'),
+    sa.Column('bucket_1', sa.Integer(), nullable=False, comment='[10, 20) 分段人数'),
+    sa.Column('bucket_2', sa.Integer(), nullable=False, comment='[20, 30) 分段人数'),
+    sa.Column('bucket_3', sa.Integer(), nullable=False, comment='[30, 40) 分段人数'),
+    sa.Column('bucket_4', sa.Integer(), nullable=False, comment='[40, 50) 分段人数'),
+    sa.Column('bucket_5', sa.Integer(), nullable=False, comment='[50, 60) 分段人数'),
+    sa.Column('bucket_6', sa.Integer(), nullable=False, comment='[60, 70) 分段人数'),
+    sa.Column('bucket_7', sa.Integer(), nullable=False, comment='[70, 80) 分段人数'),
+    sa.Column('bucket_8', sa.Integer(), nullable=False, comment='[80, 90) 分段人数'),
+    sa.Column('bucket_9', sa.Integer(), nullable=False, comment='[90, 100] 分段人数'),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True, comment='更新时间'),
+    sa.ForeignKeyConstraint(['assignment_id'], ['assignments.id'], ),
+    sa.PrimaryKeyConstraint('assignment_id')
+    )
+
+    # 根据已有提交生成每个任务的统计汇总
+    op.execute("""
+        INSERT INTO assignment_stats (assignment_id, submission_count, graded_count, score_sum, score_sum_squares,
+                                      min_score, max_score, bucket_0, bucket_1, bucket_2, bucket_3, bucket_4,
+                                      bucket_5, bucket_6, bucket_7, bucket_8, bucket_9)
+        SELECT a.id, COUNT(s.id), COUNT(s.score), COALESCE(SUM(s.score), 0), COALESCE(SUM(s.score * s.score), 0),
+               MIN(s.score), MAX(s.score),
+               COUNT(CASE WHEN s.score < 10 THEN 1 END),
+               COUNT(CASE WHEN s.score >= 10 AND s.score < 20 THEN 1 END),
+               COUNT(CASE WHEN s.score >= 20 AND s.score < 30 THEN 1 END),
+               COUNT(CASE WHEN s.score >= 30 AND s.score < 40 THEN 1 END),
+               COUNT(CASE WHEN s.score >= 40 AND s.score < 50 THEN 1 END),
+               COUNT(CASE WHEN s.score >= 50 AND s.score < 60 THEN 1 END),
+               COUNT(CASE WHEN s.score >= 60 AND s.score < 70 THEN 1 END),
+               COUNT(CASE WHEN s.score >= 70 AND s.score < 80 THEN 1 END),
+               COUNT(CASE WHEN s.score >= 80 AND s.score < 90 THEN 1 END),
+               COUNT(CASE WHEN s.score >= 90 THEN 1 END)
+        FROM assignments a
+        LEFT JOIN submissions s ON s.assignment_id = a.id
+        GROUP BY a.id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('assignment_stats')
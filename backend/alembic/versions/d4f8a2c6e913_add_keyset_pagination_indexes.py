@@ -0,0 +1,36 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: d4f8a2c6e913
+Revises: c9a3f17e5b28
+Create Date: 2026-10-18 15:02:17.418236
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f8a2c6e913'
+down_revision: Union[str, Sequence[str], None] = 'c9a3f17e5b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_submissions_assignment_submitted', 'submissions', ['assignment_id', 'submitted_at', 'id'], unique=False)
+    op.create_index('ix_submissions_student_submitted', 'submissions', ['student_id', 'submitted_at', 'id'], unique=False)
+    op.create_index('ix_assignments_class_created', 'assignments', ['class_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_assignments_teacher_created', 'assignments', ['teacher_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_classes_teacher_created', 'classes', ['teacher_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_classes_teacher_created', table_name='classes')
+    op.drop_index('ix_assignments_teacher_created', table_name='assignments')
+    op.drop_index('ix_assignments_class_created', table_name='assignments')
+    op.drop_index('ix_submissions_student_submitted', table_name='submissions')
+    op.drop_index('ix_submissions_assignment_submitted', table_name='submissions')
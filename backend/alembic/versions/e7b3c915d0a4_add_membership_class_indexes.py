@@ -0,0 +1,30 @@
+"""add_membership_class_indexes
+
+Revision ID: e7b3c915d0a4
+Revises: d4f8a2c6e913
+Create Date: 2026-10-18 15:48:05.271934
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b3c915d0a4'
+down_revision: Union[str, Sequence[str], None] = 'd4f8a2c6e913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_student_classes_class_student', 'student_classes', ['class_id', 'student_id'], unique=False)
+    op.create_index('ix_teacher_classes_class_teacher', 'teacher_classes', ['class_id', 'teacher_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_teacher_classes_class_teacher', table_name='teacher_classes')
+    op.drop_index('ix_student_classes_class_student', table_name='student_classes')
@@ -0,0 +1,43 @@
+"""add_parse_cache
+
+Revision ID: f3b9d2a1c7e5
+Revises: a2c6e8f0b417
+Create Date: 2026-10-18 17:20:41.318604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b9d2a1c7e5'
+down_revision: Union[str, Sequence[str], None] = 'a2c6e8f0b417'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('parse_cache',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('file_hash', sa.String(length=64), nullable=False, comment='文件的SHA-256'),
+    sa.Column('parser_version', sa.String(length=32), nullable=False, comment='生成结果的解析器版本'),
+    sa.Column('result', sa.Text(), nullable=False, comment='解析结果（parse_docx 输出的 JSON）'),
+    sa.Column('size', sa.Integer(), nullable=False, comment='解析结果的字节数'),
+    sa.Column('hit_count', sa.Integer(), nullable=False, comment='命中次数'),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True, comment='创建时间'),
+    sa.Column('last_used_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True, comment='最近使用时间（用于LRU淘汰）'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('file_hash', 'parser_version', name='unique_parse_cache_entry')
+    )
+    op.create_index(op.f('ix_parse_cache_id'), 'parse_cache', ['id'], unique=False)
+    op.create_index(op.f('ix_parse_cache_last_used_at'), 'parse_cache', ['last_used_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_parse_cache_last_used_at'), table_name='parse_cache')
+    op.drop_index(op.f('ix_parse_cache_id'), table_name='parse_cache')
+    op.drop_table('parse_cache')
@@ -1,21 +1,108 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-# 创建SQLite数据库引擎
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False}
-)
+
+def _is_sqlite_file(url) -> bool:
+    """是否为 SQLite 文件数据库（内存数据库不使用 WAL 和连接池配置）"""
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def _set_sqlite_pragmas(dbapi_connection, read_only: bool) -> None:
+    """为新的 SQLite 连接设置 PRAGMA"""
+    cursor = dbapi_connection.cursor()
+    try:
+        # journal_mode 是数据库级设置，只读连接不能修改，由读写连接设置即可
+        if not read_only:
+            cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT}")
+        cursor.execute(f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE}")
+        cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA temp_store={settings.SQLITE_TEMP_STORE}")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+    finally:
+        cursor.close()
+
+
+def create_db_engine(database_url: str, read_only: bool = False) -> Engine:
+    """根据配置创建数据库引擎
+
+    SQLite 文件数据库：每个连接开启 WAL 等 PRAGMA，使用按配置大小的连接池；
+    其他数据库（如 PostgreSQL）：使用连接池并在取出连接前检测连接是否可用，
+    PostgreSQL 连接的时区固定为 UTC 并设置语句超时。
+    """
+    url = make_url(database_url)
+    options = {"echo": settings.DB_ECHO}
+
+    if url.get_backend_name() == "sqlite":
+        # 连接会在线程池的不同线程间复用
+        options["connect_args"] = {"check_same_thread": False}
+        if _is_sqlite_file(url):
+            options.update(
+                pool_size=settings.DB_POOL_SIZE,
+                max_overflow=settings.DB_MAX_OVERFLOW,
+                pool_timeout=settings.DB_POOL_TIMEOUT,
+            )
+    else:
+        # 会话时区固定为 UTC（与 SQLite 中保存的时间一致）；限制单条语句的执行时间
+        if url.get_backend_name() == "postgresql":
+            options["connect_args"] = {
+                "options": f"-c timezone=UTC -c statement_timeout={settings.DB_STATEMENT_TIMEOUT}"
+            }
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=True,
+        )
+
+    db_engine = create_engine(url, **options)
+
+    if url.get_backend_name() == "sqlite":
+        @event.listens_for(db_engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            _set_sqlite_pragmas(dbapi_connection, read_only and _is_sqlite_file(url))
+    elif read_only:
+        @event.listens_for(db_engine, "begin")
+        def _on_begin(connection):
+            connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+
+    return db_engine
+
+
+# 读写引擎
+engine = create_db_engine(settings.DATABASE_URL)
+
+# 只读引擎：配置了只读副本时连接副本；SQLite 文件数据库使用同一文件的只读连接（WAL 模式下不会被写入阻塞）；
+# 其他情况直接复用读写引擎
+if settings.READ_DATABASE_URL:
+    read_engine = create_db_engine(settings.READ_DATABASE_URL, read_only=True)
+elif _is_sqlite_file(engine.url):
+    read_engine = create_db_engine(settings.DATABASE_URL, read_only=True)
+else:
+    read_engine = engine
 
 # 创建会话工厂
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 # 创建基础模型类
 Base = declarative_base()
 
 
+def stream_query(query, batch_size: int = None):
+    """分批迭代大查询的结果（用于导出等场景）
+
+    PostgreSQL 上使用服务端游标，每次只从数据库取 batch_size 行；SQLite 上按批从游标读取，内存占用同样有上限。
+    """
+    return query.execution_options(stream_results=True, yield_per=batch_size or settings.DB_STREAM_BATCH_SIZE)
+
+
 def get_db():
     """获取数据库会话的依赖注入函数"""
     db = SessionLocal()
@@ -23,3 +110,12 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """获取只读数据库会话的依赖注入函数（只用于不写数据库的查询接口）"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -1,8 +1,20 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import auth, class_management, assignment, submission
+from app.services.parse_queue import parse_queue
+from app.utils.pagination import NEXT_CURSOR_HEADER
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期：启动和停止文档解析队列"""
+    await parse_queue.start()
+    yield
+    await parse_queue.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # 添加CORS中间件
 app.add_middleware(
@@ -11,6 +23,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],  # 允许前端读取分页游标
 )
 app.include_router(auth.router)
 app.include_router(class_management.router)
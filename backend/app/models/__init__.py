@@ -5,5 +5,10 @@ from .assignment import Assignment
 from .student_class import StudentClass
 from .teacher_class import TeacherClass
 from .submission import Submission
+from .submission_paragraph import SubmissionParagraph
+from .parse_job import ParseJob
+from .parse_cache import ParseCache
+from .assignment_stats import AssignmentStats
+from . import class_search  # noqa: F401  注册班级搜索索引的建表事件
 
-__all__ = ["User", "Class", "Assignment", "StudentClass", "TeacherClass", "Submission"]
+__all__ = ["User", "Class", "Assignment", "StudentClass", "TeacherClass", "Submission", "SubmissionParagraph", "ParseJob", "ParseCache", "AssignmentStats"]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -23,6 +23,14 @@ class Assignment(Base):
     teacher = relationship("User", foreign_keys=[teacher_id], overlaps="created_assignments")
     # 任务的提交
     submissions = relationship("Submission", back_populates="assignment", cascade="all, delete-orphan")
+    # 任务的分数统计汇总
+    stats = relationship("AssignmentStats", back_populates="assignment", uselist=False, cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # 班级任务列表、我的任务列表的游标分页（按创建时间倒序）
+        Index('ix_assignments_class_created', 'class_id', 'created_at', 'id'),
+        Index('ix_assignments_teacher_created', 'teacher_id', 'created_at', 'id'),
+    )
 
     def __repr__(self):
         return f"<Assignment(id={self.id}, title='{self.title}', class_id={self.class_id})>"
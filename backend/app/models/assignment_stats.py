@@ -0,0 +1,44 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+# 分数直方图分段数（0-100 分，每 10 分一段，最后一段包含 100 分）
+HISTOGRAM_BUCKETS = 10
+
+
+class AssignmentStats(Base):
+    """任务分数统计汇总表模型（随提交和批改增量维护，读取统计时只需按主键查询）"""
+    __tablename__ = "assignment_stats"
+
+    assignment_id = Column(Integer, ForeignKey("assignments.id"), primary_key=True, comment="任务ID")
+    submission_count = Column(Integer, nullable=False, default=0, comment="提交数")
+    graded_count = Column(Integer, nullable=False, default=0, comment="已评分数")
+    score_sum = Column(Float, nullable=False, default=0, comment="分数总和")
+    score_sum_squares = Column(Float, nullable=False, default=0, comment="分数平方和")
+    min_score = Column(Float, comment="最低分")
+    max_score = Column(Float, comment="最高分")
+    bucket_0 = Column(Integer, nullable=False, default=0, comment="[0, 10) 分段人数")
+    bucket_1 = Column(Integer, nullable=False, default=0, comment="[10, 20) 分段人数")
+    bucket_2 = Column(Integer, nullable=False, default=0, comment="[20, 30) 分段人数")
+    bucket_3 = Column(Integer, nullable=False, default=0, comment="[30, 40) 分段人数")
+    bucket_4 = Column(Integer, nullable=False, default=0, comment="[40, 50) 分段人数")
+    bucket_5 = Column(Integer, nullable=False, default=0, comment="[50, 60) 分段人数")
+    bucket_6 = Column(Integer, nullable=False, default=0, comment="[60, 70) 分段人数")
+    bucket_7 = Column(Integer, nullable=False, default=0, comment="[70, 80) 分段人数")
+    bucket_8 = Column(Integer, nullable=False, default=0, comment="[80, 90) 分段人数")
+    bucket_9 = Column(Integer, nullable=False, default=0, comment="[90, 100] 分段人数")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), comment="更新时间")
+
+    # 关系
+    # 统计所属的任务
+    assignment = relationship("Assignment", back_populates="stats")
+
+    @staticmethod
+    def bucket_column(index: int):
+        """获取第 index 个直方图分段对应的列"""
+        return getattr(AssignmentStats, f"bucket_{index}")
+
+    def __repr__(self):
+        return f"<AssignmentStats(assignment_id={self.assignment_id}, submission_count={self.submission_count}, graded_count={self.graded_count})>"
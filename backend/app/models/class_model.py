@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -26,5 +26,10 @@ class Class(Base):
     # 班级的任务
     assignments = relationship("Assignment", back_populates="class_obj", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # 我创建的班级列表的游标分页（按创建时间倒序）
+        Index('ix_classes_teacher_created', 'teacher_id', 'created_at', 'id'),
+    )
+
     def __repr__(self):
         return f"<Class(id={self.id}, name='{self.name}', teacher_id={self.teacher_id})>"
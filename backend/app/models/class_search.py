@@ -0,0 +1,115 @@
+import logging
+from sqlalchemy import Column, Integer, MetaData, String, Table, event
+from app.db.database import Base
+
+logger = logging.getLogger(__name__)
+
+# 班级搜索索引：SQLite 使用 FTS5 全文索引表（trigram 分词，支持任意子串匹配和中文），由触发器随班级和
+# 教师姓名同步；PostgreSQL 使用 pg_trgm 三元组 GIN 索引，直接建在 classes 和 users 的列上。
+
+# FTS5 虚拟表（不属于 Base.metadata，由下面的 DDL 创建；这里的定义只用于构建查询）
+class_search_table = Table(
+    "classes_fts", MetaData(),
+    Column("rowid", Integer, primary_key=True),  # 与班级ID相同
+    Column("name", String),
+    Column("description", String),
+    Column("teacher_name", String),
+)
+
+# trigram 分词的最短匹配长度（更短的关键词无法使用全文索引）
+TRIGRAM_MIN_LENGTH = 3
+
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS classes_fts USING fts5(name, description, teacher_name, tokenize='trigram')",
+    """
+    CREATE TRIGGER IF NOT EXISTS classes_fts_insert AFTER INSERT ON classes BEGIN
+        INSERT INTO classes_fts (rowid, name, description, teacher_name)
+        VALUES (new.id, new.name, new.description, (SELECT name FROM users WHERE id = new.teacher_id));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS classes_fts_update AFTER UPDATE OF name, description, teacher_id ON classes BEGIN
+        UPDATE classes_fts SET name = new.name, description = new.description,
+            teacher_name = (SELECT name FROM users WHERE id = new.teacher_id)
+        WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS classes_fts_delete AFTER DELETE ON classes BEGIN
+        DELETE FROM classes_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS users_classes_fts_update AFTER UPDATE OF name ON users BEGIN
+        UPDATE classes_fts SET teacher_name = new.name
+        WHERE rowid IN (SELECT id FROM classes WHERE teacher_id = new.id);
+    END
+    """,
+    # 为已有的班级建立索引（重复执行时跳过已索引的班级）
+    """
+    INSERT INTO classes_fts (rowid, name, description, teacher_name)
+    SELECT classes.id, classes.name, classes.description, users.name
+    FROM classes LEFT JOIN users ON users.id = classes.teacher_id
+    WHERE classes.id NOT IN (SELECT rowid FROM classes_fts)
+    """,
+]
+
+SQLITE_DROP_SEARCH_DDL = [
+    "DROP TRIGGER IF EXISTS users_classes_fts_update",
+    "DROP TRIGGER IF EXISTS classes_fts_delete",
+    "DROP TRIGGER IF EXISTS classes_fts_update",
+    "DROP TRIGGER IF EXISTS classes_fts_insert",
+    "DROP TABLE IF EXISTS classes_fts",
+]
+
+# pg_trgm 从 PostgreSQL 13 起是受信任的扩展，数据库所有者即可创建
+POSTGRES_SEARCH_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_classes_name_trgm ON classes USING gin (name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_classes_description_trgm ON classes USING gin (description gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_users_name_trgm ON users USING gin (name gin_trgm_ops)",
+]
+
+POSTGRES_DROP_SEARCH_DDL = [
+    "DROP INDEX IF EXISTS ix_users_name_trgm",
+    "DROP INDEX IF EXISTS ix_classes_description_trgm",
+    "DROP INDEX IF EXISTS ix_classes_name_trgm",
+]
+
+
+def create_class_search_index(connection) -> None:
+    """创建班级搜索索引（迁移和 create_all 共用）
+
+    其他数据库以及没有安装 pg_trgm（contrib）的 PostgreSQL 不创建索引，搜索时退回到逐行模糊匹配。
+    """
+    statements = {"sqlite": SQLITE_SEARCH_DDL, "postgresql": POSTGRES_SEARCH_DDL}.get(connection.dialect.name, [])
+    if connection.dialect.name == "postgresql" and connection.exec_driver_sql(
+        "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+    ).first() is None:
+        logger.warning("PostgreSQL 没有可用的 pg_trgm 扩展，班级搜索不使用三元组索引")
+        return
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+
+def has_trigram_index(connection) -> bool:
+    """PostgreSQL 数据库中是否已安装 pg_trgm 扩展（搜索按词相似度排序需要该扩展的函数）"""
+    return connection.exec_driver_sql("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'").first() is not None
+
+
+def drop_class_search_index(connection) -> None:
+    """删除班级搜索索引"""
+    statements = {"sqlite": SQLITE_DROP_SEARCH_DDL, "postgresql": POSTGRES_DROP_SEARCH_DDL}.get(connection.dialect.name, [])
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_index(target, connection, **kw) -> None:
+    """不经过迁移直接建表（create_all）时同样创建搜索索引"""
+    create_class_search_index(connection)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_search_index(target, connection, **kw) -> None:
+    drop_class_search_index(connection)
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class ParseCache(Base):
+    """文档解析结果缓存表模型（按文件内容哈希和解析器版本缓存 parse_docx 的输出，超出容量时按最近使用时间淘汰）"""
+    __tablename__ = "parse_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    file_hash = Column(String(64), nullable=False, comment="文件的SHA-256")
+    parser_version = Column(String(32), nullable=False, comment="生成结果的解析器版本")
+    result = Column(Text, nullable=False, comment="解析结果（parse_docx 输出的 JSON）")
+    size = Column(Integer, nullable=False, comment="解析结果的字节数")
+    hit_count = Column(Integer, nullable=False, default=0, comment="命中次数")
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), comment="创建时间")
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now(), index=True, comment="最近使用时间（用于LRU淘汰）")
+
+    __table_args__ = (
+        UniqueConstraint('file_hash', 'parser_version', name='unique_parse_cache_entry'),
+    )
+
+    def __repr__(self):
+        return f"<ParseCache(file_hash='{self.file_hash}', parser_version='{self.parser_version}', size={self.size})>"
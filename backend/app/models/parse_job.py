@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+import enum
+from app.db.database import Base
+
+
+class ParseJobStatus(str, enum.Enum):
+    """解析任务状态枚举"""
+    PENDING = "pending"  # 等待解析
+    RUNNING = "running"  # 正在解析
+    DONE = "done"  # 解析完成
+    FAILED = "failed"  # 解析失败
+    CANCELLED = "cancelled"  # 提交已被新文件覆盖，任务作废
+
+
+class ParseJob(Base):
+    """文档解析任务表模型（持久化的任务队列，服务重启后可继续处理）"""
+    __tablename__ = "parse_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    submission_id = Column(Integer, ForeignKey("submissions.id"), nullable=False, index=True, comment="提交ID")
+    file_hash = Column(String(64), nullable=False, comment="待解析文件的SHA-256")
+    status = Column(Enum(ParseJobStatus), nullable=False, default=ParseJobStatus.PENDING, index=True, comment="任务状态")
+    attempts = Column(Integer, nullable=False, default=0, comment="已尝试次数")
+    error = Column(Text, comment="失败原因")
+    lease_expires_at = Column(DateTime(timezone=True), comment="租约到期时间（解析中的任务由所在进程定期续约，过期视为进程已退出）")
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), comment="创建时间")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), comment="更新时间")
+
+    # 关系
+    # 任务对应的提交
+    submission = relationship("Submission", back_populates="parse_jobs")
+
+    def __repr__(self):
+        return f"<ParseJob(id={self.id}, submission_id={self.submission_id}, status='{self.status}')>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -22,6 +22,8 @@ class StudentClass(Base):
     # 唯一约束：一个学生只能加入一个班级一次
     __table_args__ = (
         UniqueConstraint('student_id', 'class_id', name='unique_student_class'),
+        # 按班级查询学生（班级学生列表、学生人数）
+        Index('ix_student_classes_class_student', 'class_id', 'student_id'),
     )
 
     def __repr__(self):
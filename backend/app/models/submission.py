@@ -1,9 +1,17 @@
-from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, Float, UniqueConstraint, LargeBinary
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Float, UniqueConstraint, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+import enum
 from app.db.database import Base
 
 
+class ParseStatus(str, enum.Enum):
+    """提交文件解析状态枚举"""
+    PARSING = "parsing"  # 正在解析
+    PARSED = "parsed"  # 解析完成
+    FAILED = "failed"  # 解析失败
+
+
 class Submission(Base):
     """提交表模型"""
     __tablename__ = "submissions"
@@ -11,9 +19,12 @@ class Submission(Base):
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("users.id"), nullable=False, comment="学生ID")
     assignment_id = Column(Integer, ForeignKey("assignments.id"), nullable=False, comment="任务ID")
-    original_file = Column(LargeBinary, comment="原始文件内容")
+    file_hash = Column(String(64), index=True, comment="原始文件SHA-256（文件内容保存在文件存储中）")
+    file_size = Column(Integer, comment="原始文件大小（字节）")
     file_name = Column(Text, comment="原始文件名")
-    file_json = Column(Text, comment="文件JSON数据（教师查看用）")
+    paragraph_count = Column(Integer, comment="非空段落数（解析完成前为空）")
+    total_words_count = Column(Integer, comment="总字数（解析完成前为空）")
+    parse_status = Column(Enum(ParseStatus), nullable=False, default=ParseStatus.PARSING, comment="文件解析状态")
     report = Column(Text, comment="批改报告")
     score = Column(Float, comment="分数")
     submitted_at = Column(DateTime(timezone=True), server_default=func.now(), comment="提交时间")
@@ -25,10 +36,20 @@ class Submission(Base):
     student = relationship("User", back_populates="submissions")
     # 提交的任务
     assignment = relationship("Assignment", back_populates="submissions")
+    # 提交的解析任务
+    parse_jobs = relationship("ParseJob", back_populates="submission", cascade="all, delete-orphan")
+    # 解析出的文档段落
+    paragraphs = relationship("SubmissionParagraph", back_populates="submission", cascade="all, delete-orphan",
+                              order_by="SubmissionParagraph.position")
 
     # 唯一约束：一个学生对一个任务只能提交一次
     __table_args__ = (
         UniqueConstraint('student_id', 'assignment_id', name='unique_student_assignment'),
+        # 任务分数统计（按任务聚合分数）使用的覆盖索引
+        Index('ix_submissions_assignment_score', 'assignment_id', 'score'),
+        # 任务/学生提交列表的游标分页（按提交时间倒序）
+        Index('ix_submissions_assignment_submitted', 'assignment_id', 'submitted_at', 'id'),
+        Index('ix_submissions_student_submitted', 'student_id', 'submitted_at', 'id'),
     )
 
     @property
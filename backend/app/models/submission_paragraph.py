@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, UniqueConstraint, Index
+from sqlalchemy.orm import relationship
+from app.db.database import Base
+
+
+class SubmissionParagraph(Base):
+    """提交文档段落表模型（解析结果按段落保存，大纲、字数和段落区间可以分别查询）"""
+    __tablename__ = "submission_paragraphs"
+
+    id = Column(Integer, primary_key=True)
+    submission_id = Column(Integer, ForeignKey("submissions.id"), nullable=False, comment="提交ID")
+    position = Column(Integer, nullable=False, comment="段落在文档中的序号（包括空段落）")
+    text = Column(Text, nullable=False, comment="段落文本")
+    word_count = Column(Integer, nullable=False, comment="字数（不含空格）")
+    heading_level = Column(Integer, comment="标题级别（Title 为 0，非标题段落为空）")
+    style = Column(String(100), comment="标题样式名（非标题段落为空）")
+
+    # 关系
+    # 段落所属的提交
+    submission = relationship("Submission", back_populates="paragraphs")
+
+    __table_args__ = (
+        # 按提交读取段落区间
+        UniqueConstraint('submission_id', 'position', name='unique_submission_paragraph'),
+        # 只读取大纲（标题段落）时使用的部分索引
+        Index(
+            'ix_submission_paragraphs_outline', 'submission_id', 'position',
+            sqlite_where=heading_level.isnot(None), postgresql_where=heading_level.isnot(None)
+        ),
+    )
+
+    def __repr__(self):
+        return f"<SubmissionParagraph(submission_id={self.submission_id}, position={self.position}, word_count={self.word_count})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint, Enum
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint, Index, Enum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -30,6 +30,8 @@ class TeacherClass(Base):
     # 唯一约束：一个教师只能加入一个班级一次
     __table_args__ = (
         UniqueConstraint('teacher_id', 'class_id', name='unique_teacher_class'),
+        # 按班级查询教师（班级教师列表、删除班级）
+        Index('ix_teacher_classes_class_teacher', 'class_id', 'teacher_id'),
     )
 
     def __repr__(self):
@@ -1,14 +1,17 @@
-from fastapi import APIRouter, Depends, UploadFile, File, Form
+from fastapi import APIRouter, Depends, UploadFile, File, Form, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Annotated, List
 
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.models.user import User
 from app.schemas.submission_schema import (
     SubmissionGrade, 
-    SubmissionDetailResponse, SubmissionCreateResponse, SubmissionStatistics,
-    StudentSubmissionResponse, TeacherSubmissionResponse, PendingAssignmentResponse
+    SubmissionDetailResponse, SubmissionCreateResponse, SubmissionStatistics, SubmissionParseStatusResponse,
+    StudentSubmissionResponse, TeacherSubmissionResponse, PendingAssignmentResponse, SubmissionListFilter,
+    SubmissionDetailQuery, SubmissionGradeResponse, BulkImportResponse,
+    SubmissionBatchGrade, SubmissionBatchGradeResponse, ExportFormat
 )
+from app.schemas.pagination import PageParams
 from app.routers.auth import get_current_user
 from app.services.submission_service import SubmissionService
 
@@ -16,77 +19,113 @@ router = APIRouter(prefix="/submissions", tags=["提交管理"])
 
 
 @router.post("/", response_model=SubmissionCreateResponse, summary="学生上传文件提交")
-async def create_submission(assignment_id: int = Form(..., description="任务ID"),file: UploadFile = File(..., description="上传的docx文件"),current_user: User = Depends(get_current_user),db: Session = Depends(get_db)):
-    """学生上传文件提交文档（支持重复提交覆盖）"""
+def create_submission(assignment_id: int = Form(..., description="任务ID"),file: UploadFile = File(..., description="上传的docx文件"),current_user: User = Depends(get_current_user),db: Session = Depends(get_db)):
+    """学生上传文件提交文档（支持重复提交覆盖，文件在后台解析）"""
     return SubmissionService.create_submission_with_file(db, assignment_id, file, current_user)
 
 
+@router.post("/assignment/{assignment_id}/bulk-import", response_model=BulkImportResponse, summary="教师批量导入提交")
+def bulk_import_submissions(assignment_id: int, files: List[UploadFile] = File(..., description="docx文件（文件名为学生用户名）或包含这些文件的zip压缩包"), current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    """教师批量导入线下收集的提交：zip 中的文件可以是 学生用户名.docx 或 学生用户名/任意文件名.docx，返回每个文件的处理结果"""
+    return SubmissionService.bulk_import_submissions(db, assignment_id, files, current_user)
+
+
 @router.get("/my-submissions", response_model=List[StudentSubmissionResponse], summary="查看我的提交")
-async def get_my_submissions(current_user: User = Depends(get_current_user),db: Session = Depends(get_db)):
+def get_my_submissions(page: Annotated[PageParams, Query()], response: Response, current_user: User = Depends(get_current_user), db: Session = Depends(get_read_db)):
     """学生查看自己的提交列表"""
-    return SubmissionService.get_my_submissions(db, current_user)
+    return SubmissionService.get_my_submissions(db, current_user, page, response)
 
 @router.get("/my-submissions/class/{class_id}", response_model=List[StudentSubmissionResponse], summary="按班级查看我的提交")
-async def get_my_submissions_by_class(class_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def get_my_submissions_by_class(class_id: int, page: Annotated[PageParams, Query()], response: Response, current_user: User = Depends(get_current_user), db: Session = Depends(get_read_db)):
     """学生查看指定班级的提交列表"""
-    return SubmissionService.get_my_submissions_by_class(db, class_id, current_user)
+    return SubmissionService.get_my_submissions_by_class(db, class_id, current_user, page, response)
 
 
 @router.get("/my-submissions/assignment/{assignment_id}", response_model=List[StudentSubmissionResponse], summary="按任务查看我的提交")
-async def get_my_submissions_by_assignment(assignment_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def get_my_submissions_by_assignment(assignment_id: int, page: Annotated[PageParams, Query()], response: Response, current_user: User = Depends(get_current_user), db: Session = Depends(get_read_db)):
     """学生查看指定任务的提交列表"""
-    return SubmissionService.get_my_submissions_by_assignment(db, assignment_id, current_user)
+    return SubmissionService.get_my_submissions_by_assignment(db, assignment_id, current_user, page, response)
 
 
 @router.get("/my-submissions/pending", response_model=List[PendingAssignmentResponse], summary="查看待提交任务")
-async def get_pending_assignments(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def get_pending_assignments(page: Annotated[PageParams, Query()], response: Response, current_user: User = Depends(get_current_user), db: Session = Depends(get_read_db)):
     """学生查看未提交的任务列表"""
-    return SubmissionService.get_pending_assignments(db, current_user)
+    return SubmissionService.get_pending_assignments(db, current_user, page, response)
 
 
 @router.get("/assignment/{assignment_id}", response_model=List[TeacherSubmissionResponse], summary="查看任务提交")
-async def get_assignment_submissions(assignment_id: int,current_user: User = Depends(get_current_user),db: Session = Depends(get_db)):
+def get_assignment_submissions(assignment_id: int, filters: Annotated[SubmissionListFilter, Query()], response: Response, current_user: User = Depends(get_current_user), db: Session = Depends(get_read_db)):
     """教师查看指定任务的提交列表"""
-    return SubmissionService.get_assignment_submissions(db, assignment_id, current_user)
+    return SubmissionService.get_assignment_submissions(db, assignment_id, current_user, filters, response)
 
 
 @router.get("/class/{class_id}", response_model=List[TeacherSubmissionResponse], summary="查看班级提交")
-async def get_class_submissions(class_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def get_class_submissions(class_id: int, filters: Annotated[SubmissionListFilter, Query()], response: Response, current_user: User = Depends(get_current_user), db: Session = Depends(get_read_db)):
     """教师查看指定班级的所有提交"""
-    return SubmissionService.get_class_submissions(db, class_id, current_user)
+    return SubmissionService.get_class_submissions(db, class_id, current_user, filters, response)
 
 
 @router.get("/student/{student_id}", response_model=List[TeacherSubmissionResponse], summary="查看学生提交")
-async def get_student_submissions(student_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def get_student_submissions(student_id: int, filters: Annotated[SubmissionListFilter, Query()], response: Response, current_user: User = Depends(get_current_user), db: Session = Depends(get_read_db)):
     """教师查看指定学生的所有提交"""
-    return SubmissionService.get_student_submissions(db, student_id, current_user)
+    return SubmissionService.get_student_submissions(db, student_id, current_user, filters, response)
 
 
 @router.get("/assignment/{assignment_id}/ungraded", response_model=List[TeacherSubmissionResponse], summary="查看未批改提交")
-async def get_ungraded_submissions(assignment_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def get_ungraded_submissions(assignment_id: int, filters: Annotated[SubmissionListFilter, Query()], response: Response, current_user: User = Depends(get_current_user), db: Session = Depends(get_read_db)):
     """教师查看未批改的提交"""
-    return SubmissionService.get_ungraded_submissions(db, assignment_id, current_user)
+    return SubmissionService.get_ungraded_submissions(db, assignment_id, current_user, filters, response)
+
+
+@router.get("/assignment/{assignment_id}/export", summary="导出任务成绩表")
+def export_assignment_grades(assignment_id: int, export_format: ExportFormat = Query(ExportFormat.CSV, alias="format", description="导出格式: csv/xlsx"), current_user: User = Depends(get_current_user), db: Session = Depends(get_read_db)):
+    """教师导出任务成绩表（班级每个学生一行，包括未提交的学生），流式下载"""
+    return SubmissionService.export_assignment_grades(db, assignment_id, current_user, export_format)
+
+
+@router.get("/assignment/{assignment_id}/export/files", summary="打包下载任务原始文件")
+def export_assignment_files(assignment_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_read_db)):
+    """教师以 zip 压缩包下载任务的全部原始文件（学生用户名/原始文件名），流式下载"""
+    return SubmissionService.export_assignment_files(db, assignment_id, current_user)
+
+
+@router.get("/class/{class_id}/export", summary="导出班级成绩册")
+def export_class_grades(class_id: int, export_format: ExportFormat = Query(ExportFormat.CSV, alias="format", description="导出格式: csv/xlsx"), current_user: User = Depends(get_current_user), db: Session = Depends(get_read_db)):
+    """教师导出班级成绩册（每个学生一行，每个任务一列分数），流式下载"""
+    return SubmissionService.export_class_grades(db, class_id, current_user, export_format)
 
 
 @router.get("/{submission_id}", response_model=SubmissionDetailResponse, summary="查看提交详情")
-async def get_submission_detail(submission_id: int,current_user: User = Depends(get_current_user),db: Session = Depends(get_db)):
-    """查看提交详情（学生查看自己的，教师查看班级内的）"""
-    return SubmissionService.get_submission_detail(db, submission_id, current_user)
+def get_submission_detail(submission_id: int, params: Annotated[SubmissionDetailQuery, Query()], current_user: User = Depends(get_current_user), db: Session = Depends(get_read_db)):
+    """查看提交详情（学生查看自己的，教师查看班级内的）；include 指定返回的部分，offset/limit 指定段落区间"""
+    return SubmissionService.get_submission_detail(db, submission_id, current_user, params)
+
 
+@router.get("/{submission_id}/parse-status", response_model=SubmissionParseStatusResponse, summary="查看文件解析状态")
+def get_parse_status(submission_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_read_db)):
+    """查询提交文件的解析状态（上传后轮询，解析完成后查看详情）"""
+    return SubmissionService.get_parse_status(db, submission_id, current_user)
 
-@router.put("/{submission_id}/grade", response_model=SubmissionDetailResponse, summary="批改提交")
-async def grade_submission(submission_id: int,grade_data: SubmissionGrade,current_user: User = Depends(get_current_user),db: Session = Depends(get_db)):
+
+@router.put("/{submission_id}/grade", response_model=SubmissionGradeResponse, summary="批改提交")
+def grade_submission(submission_id: int,grade_data: SubmissionGrade,current_user: User = Depends(get_current_user),db: Session = Depends(get_db)):
     """教师批改提交"""
     return SubmissionService.grade_submission(db, submission_id, grade_data, current_user)
 
 
+@router.put("/grades", response_model=SubmissionBatchGradeResponse, summary="批量批改提交")
+def batch_grade_submissions(grade_data: SubmissionBatchGrade, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    """教师批量批改提交（例如导入评分表），逐条返回处理结果"""
+    return SubmissionService.batch_grade_submissions(db, grade_data, current_user)
+
+
 @router.get("/assignment/{assignment_id}/statistics", response_model=SubmissionStatistics, summary="查看提交统计")
-async def get_assignment_statistics(assignment_id: int,current_user: User = Depends(get_current_user),db: Session = Depends(get_db)):
+def get_assignment_statistics(assignment_id: int,current_user: User = Depends(get_current_user),db: Session = Depends(get_db)):
     """教师查看指定任务的提交统计"""
     return SubmissionService.get_assignment_statistics(db, assignment_id, current_user)
 
 
 @router.get("/{submission_id}/download", summary="下载原始文件")
-async def download_original_file(submission_id: int,current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    """教师下载学生提交的原始文件"""
-    return SubmissionService.download_original_file(db, submission_id, current_user)
+def download_original_file(submission_id: int, request: Request, current_user: User = Depends(get_current_user), db: Session = Depends(get_read_db)):
+    """教师下载学生提交的原始文件（支持ETag条件请求和Range断点续传）"""
+    return SubmissionService.download_original_file(db, submission_id, current_user, request)
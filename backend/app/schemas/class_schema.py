@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
+import enum
+from app.schemas.pagination import PageParams
 
 
 class ClassCreate(BaseModel):
@@ -51,9 +53,10 @@ class JoinClassRequest(BaseModel):
     class_id: int = Field(..., description="班级ID")
 
 
-class ClassSearch(BaseModel):
-    """搜索班级的请求模式"""
-    search_term: str = Field(..., min_length=1, max_length=100, description="搜索关键词（班级名称或班级代码）")
+class ClassSearch(PageParams):
+    """搜索班级的请求模式（结果按相关度排序，下一页游标在响应头 X-Next-Cursor 中返回）"""
+    search_term: str = Field(..., min_length=1, max_length=100, description="搜索关键词（班级名称、描述、主教师姓名或班级代码）")
+    limit: Optional[int] = Field(20, ge=1, le=100, description="每页最大记录数")
 
 
 class StudentClassResponse(BaseModel):
@@ -66,3 +69,33 @@ class StudentClassResponse(BaseModel):
     class Config:
         from_attributes = True
 
+
+class RosterSortField(str, enum.Enum):
+    """班级花名册的排序字段"""
+    NAME = "name"  # 学生用户名
+    JOINED_AT = "joined_at"  # 加入时间
+    SUBMISSION_COUNT = "submission_count"  # 提交数
+    GRADED_COUNT = "graded_count"  # 已评分数
+    AVERAGE_SCORE = "average_score"  # 平均分
+
+
+class SortOrder(str, enum.Enum):
+    """排序方向"""
+    ASC = "asc"  # 升序
+    DESC = "desc"  # 降序
+
+
+class ClassRosterQuery(PageParams):
+    """班级花名册的查询参数（游标分页，下一页游标在响应头 X-Next-Cursor 中返回；翻页时排序参数需保持不变）"""
+    sort_by: RosterSortField = Field(RosterSortField.NAME, description="排序字段: name/joined_at/submission_count/graded_count/average_score")
+    order: SortOrder = Field(SortOrder.ASC, description="排序方向: asc/desc（没有分数的学生平均分按 -1 排序）")
+
+
+class ClassRosterEntry(BaseModel):
+    """班级花名册中一个学生的提交汇总"""
+    student_id: int = Field(description="学生ID")
+    name: str = Field(description="学生用户名")
+    joined_at: datetime = Field(description="加入班级的时间")
+    submission_count: int = Field(description="在本班任务中的提交数")
+    graded_count: int = Field(description="已评分的提交数")
+    average_score: Optional[float] = Field(None, description="已评分提交的平均分（没有分数时为空）")
@@ -0,0 +1,8 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class PageParams(BaseModel):
+    """游标分页参数（不传 limit 时返回全部，兼容旧客户端）"""
+    cursor: Optional[str] = Field(None, description="上一页响应头 X-Next-Cursor 中返回的游标")
+    limit: Optional[int] = Field(None, ge=1, le=500, description="每页最大记录数")
@@ -1,6 +1,8 @@
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
-from datetime import datetime
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional, Dict, Any, List
+from datetime import datetime, timezone
+import enum
+from app.schemas.pagination import PageParams
 
 
 class SubmissionGrade(BaseModel):
@@ -9,6 +11,40 @@ class SubmissionGrade(BaseModel):
     report: str = Field(..., min_length=1, max_length=2000, description="批改报告")
 
 
+class SubmissionBatchGradeItem(SubmissionGrade):
+    """批量批改中的一条批改记录"""
+    submission_id: int = Field(..., description="提交ID")
+
+
+class SubmissionBatchGrade(BaseModel):
+    """批量批改提交的请求模式"""
+    items: List[SubmissionBatchGradeItem] = Field(..., min_length=1, max_length=1000, description="批改记录（最多1000条）")
+
+    @field_validator("items")
+    @classmethod
+    def check_unique_submissions(cls, items):
+        if len({item.submission_id for item in items}) != len(items):
+            raise ValueError("同一提交不能在一次请求中重复批改")
+        return items
+
+
+class SubmissionListFilter(PageParams):
+    """提交列表筛选和分页条件（教师端）"""
+    graded: Optional[bool] = Field(None, description="是否已评分")
+    min_score: Optional[float] = Field(None, ge=0, le=100, description="最低分数（包含）")
+    max_score: Optional[float] = Field(None, ge=0, le=100, description="最高分数（包含）")
+    student_name: Optional[str] = Field(None, min_length=1, max_length=50, description="学生姓名前缀")
+    submitted_after: Optional[datetime] = Field(None, description="只返回此时间之后的提交")
+
+    @field_validator("submitted_after")
+    @classmethod
+    def to_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        """带时区的时间统一转换为 UTC（数据库中按 UTC 保存）"""
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+
 class StudentSubmissionResponse(BaseModel):
     """学生提交响应模式"""
     id: int
@@ -56,6 +92,24 @@ class SubmissionBasicResponse(BaseModel):
         from_attributes = True
 
 
+class SubmissionDetailSection(str, enum.Enum):
+    """提交详情中可以按需加载的部分"""
+    METADATA = "metadata"  # 文档统计信息（总字数、段落数）
+    OUTLINE = "outline"  # 文档大纲（outline 和 outline_tree）
+    PARAGRAPHS = "paragraphs"  # 段落内容（可按 offset/limit 分段加载）
+    REPORT = "report"  # 批改报告
+
+
+class SubmissionDetailQuery(BaseModel):
+    """提交详情查询参数（默认加载全部内容）"""
+    include: List[SubmissionDetailSection] = Field(
+        default_factory=lambda: list(SubmissionDetailSection),
+        description="需要加载的部分：metadata/outline/paragraphs/report，可重复传入"
+    )
+    offset: int = Field(0, ge=0, description="段落起始位置（按非空段落计数）")
+    limit: Optional[int] = Field(None, ge=1, le=1000, description="最多返回的段落数（默认全部）")
+
+
 class SubmissionDetailResponse(BaseModel):
     """提交详情响应模式（用于查看详情）"""
     id: int
@@ -63,8 +117,9 @@ class SubmissionDetailResponse(BaseModel):
     assignment_title: str = Field(description="任务标题")
     class_id: int = Field(description="班级ID")
     class_name: str = Field(description="班级名称")
-    file_json: Optional[Dict[str, Any]] = Field(description="文件JSON数据")
-    report: Optional[str] = Field(description="批改报告")
+    file_json: Optional[Dict[str, Any]] = Field(description="文件JSON数据，只包含请求的部分（解析完成前或未请求文档内容时为空）")
+    parse_status: str = Field(description="文件解析状态: parsing/parsed/failed")
+    report: Optional[str] = Field(description="批改报告（未请求 report 时为空）")
     score: Optional[float] = Field(description="分数")
     submitted_at: datetime
     graded_at: Optional[datetime] = Field(description="批改时间")
@@ -74,17 +129,100 @@ class SubmissionDetailResponse(BaseModel):
         from_attributes = True
 
 
+class SubmissionGradeResponse(BaseModel):
+    """批改结果响应模式（只返回批改信息，不包含文档内容）"""
+    id: int
+    score: Optional[float] = Field(description="分数")
+    report: Optional[str] = Field(description="批改报告")
+    graded_at: Optional[datetime] = Field(description="批改时间")
+    is_graded: bool = Field(description="是否已批改")
+
+    class Config:
+        from_attributes = True
+
+
+class BatchGradeStatus(str, enum.Enum):
+    """批量批改中单条记录的处理结果"""
+    GRADED = "graded"  # 已批改
+    NOT_FOUND = "not_found"  # 提交不存在
+    FORBIDDEN = "forbidden"  # 不是提交所属班级的成员
+
+
+class SubmissionBatchGradeItemResult(BaseModel):
+    """批量批改中单条记录的处理结果模式"""
+    submission_id: int = Field(description="提交ID")
+    status: BatchGradeStatus = Field(description="处理结果: graded/not_found/forbidden")
+
+
+class SubmissionBatchGradeResponse(BaseModel):
+    """批量批改响应模式"""
+    graded: int = Field(description="批改成功的提交数")
+    failed: int = Field(description="未批改的记录数")
+    items: List[SubmissionBatchGradeItemResult] = Field(description="每条记录的处理结果（与请求顺序一致）")
+
+
 class SubmissionCreateResponse(BaseModel):
     """提交创建响应模式（用于创建提交后返回）"""
     id: int
     assignment_title: str = Field(description="任务标题")
     submitted_at: datetime
+    parse_status: str = Field(description="文件解析状态: parsing/parsed/failed")
+    cache_hit: bool = Field(False, description="是否命中解析结果缓存（命中时无需等待解析）")
     message: str = Field(description="提交成功消息")
     
     class Config:
         from_attributes = True
 
 
+class BulkImportStatus(str, enum.Enum):
+    """批量导入中单个文件的处理结果"""
+    CREATED = "created"  # 新建提交
+    UPDATED = "updated"  # 覆盖学生已有的提交
+    FAILED = "failed"  # 未导入
+
+
+class BulkImportItem(BaseModel):
+    """批量导入中单个文件的处理结果模式"""
+    file_name: str = Field(description="文件名（压缩包中的文件为 压缩包名/文件路径）")
+    student_name: Optional[str] = Field(None, description="文件对应的学生用户名")
+    status: BulkImportStatus = Field(description="处理结果: created/updated/failed")
+    submission_id: Optional[int] = Field(None, description="提交ID")
+    parse_status: Optional[str] = Field(None, description="文件解析状态: parsing/parsed/failed")
+    cache_hit: bool = Field(False, description="是否命中解析结果缓存")
+    message: str = Field(description="处理说明或失败原因")
+
+
+class BulkImportResponse(BaseModel):
+    """批量导入提交响应模式"""
+    assignment_id: int = Field(description="任务ID")
+    total: int = Field(description="文件总数")
+    created: int = Field(description="新建的提交数")
+    updated: int = Field(description="覆盖的提交数")
+    failed: int = Field(description="未导入的文件数")
+    items: List[BulkImportItem] = Field(description="每个文件的处理结果")
+
+
+class ExportFormat(str, enum.Enum):
+    """成绩表导出格式"""
+    CSV = "csv"  # CSV（UTF-8 BOM，Excel 可直接打开）
+    XLSX = "xlsx"  # Excel 工作簿
+
+
+class SubmissionParseStatusResponse(BaseModel):
+    """提交文件解析状态响应模式（用于轮询解析进度）"""
+    submission_id: int = Field(description="提交ID")
+    parse_status: str = Field(description="文件解析状态: parsing/parsed/failed")
+    error: Optional[str] = Field(None, description="解析失败原因")
+    updated_at: Optional[datetime] = Field(None, description="状态更新时间")
+
+
+
+class ScoreHistogramBucket(BaseModel):
+    """分数直方图分段模式"""
+    range_start: float = Field(description="分段下限（包含）")
+    range_end: float = Field(description="分段上限（不包含，最后一段包含）")
+    count: int = Field(description="该分段内的已批改提交数")
+
 
 class SubmissionStatistics(BaseModel):
     """提交统计模式"""
@@ -94,6 +232,12 @@ class SubmissionStatistics(BaseModel):
     average_score: Optional[float] = Field(description="平均分")
     highest_score: Optional[float] = Field(description="最高分")
     lowest_score: Optional[float] = Field(description="最低分")
+    std_deviation: Optional[float] = Field(default=None, description="分数标准差")
+    median_score: Optional[float] = Field(default=None, description="中位数")
+    percentile_25: Optional[float] = Field(default=None, description="25%分位数")
+    percentile_75: Optional[float] = Field(default=None, description="75%分位数")
+    percentile_90: Optional[float] = Field(default=None, description="90%分位数")
+    histogram: List[ScoreHistogramBucket] = Field(default_factory=list, description="分数分布直方图")
 
 
 
@@ -1,11 +1,15 @@
 from sqlalchemy.orm import Session
-from fastapi import HTTPException, status
+from fastapi import HTTPException, Response, status
 from typing import List
 
 from app.models.user import User
 from app.models.assignment import Assignment
+from app.models.assignment_stats import AssignmentStats
 from app.models.class_model import Class
 from app.schemas.assignment_schema import AssignmentCreate, AssignmentUpdate, AssignmentResponse
+from app.schemas.pagination import PageParams
+from app.utils.pagination import keyset_paginate
+from app.utils.assignment_query import assignment_list_query, to_assignment_response
 from app.utils.verify import verify_teacher_permission, verify_student_permission, verify_teacher_class_access, verify_student_class_access, verify_class_member_access
 
 
@@ -24,7 +28,8 @@ class AssignmentService:
             title=assignment_data.title,
             description=assignment_data.description,
             class_id=assignment_data.class_id,
-            teacher_id=current_user.id
+            teacher_id=current_user.id,
+            stats=AssignmentStats()  # 分数统计汇总随任务一起创建
         )
         try:
             db.add(new_assignment)
@@ -54,64 +59,24 @@ class AssignmentService:
             )
 
     @staticmethod
-    def get_class_assignments(db: Session, class_id: int, current_user: User) -> List[AssignmentResponse]:
+    def get_class_assignments(db: Session, class_id: int, current_user: User, page: PageParams, response: Response) -> List[AssignmentResponse]:
         """获取班级任务列表（班级内所有成员都可以查看）"""
         # 验证用户对班级的访问权限（班级内所有成员：主教师、助教、学生）
         verify_class_member_access(db, class_id, current_user)
-        # 获取班级的所有任务
-        assignments = db.query(Assignment).filter(Assignment.class_id == class_id).order_by(Assignment.created_at.desc()).all()
-        # 构建响应
-        result = []
-        for assignment in assignments:
-            # 获取创建任务的教师信息
-            teacher = db.query(User).filter(User.id == assignment.teacher_id).first()
-            teacher_name = teacher.name if teacher else "未知教师"
-            
-            # 获取班级信息
-            target_class = db.query(Class).filter(Class.id == assignment.class_id).first()
-            class_name = target_class.name if target_class else "未知班级"
-            
-            result.append(AssignmentResponse(
-                id=assignment.id,
-                title=assignment.title,
-                description=assignment.description,
-                class_id=assignment.class_id,
-                class_name=class_name,
-                teacher_id=assignment.teacher_id,
-                teacher_name=teacher_name,
-                created_at=assignment.created_at,
-                updated_at=assignment.updated_at
-            ))
-        
-        return result
+        # 获取班级的任务（按创建时间倒序分页）
+        query = assignment_list_query(db).filter(Assignment.class_id == class_id)
+        rows = keyset_paginate(db, query, Assignment.created_at, Assignment.id, page, response)
+        return [to_assignment_response(row) for row in rows]
 
     @staticmethod
-    def get_my_assignments(db: Session, current_user: User) -> List[AssignmentResponse]:
+    def get_my_assignments(db: Session, current_user: User, page: PageParams, response: Response) -> List[AssignmentResponse]:
         """获取我创建的任务列表（教师查看）"""
         # 验证教师权限
         verify_teacher_permission(current_user)
-        # 获取我创建的所有任务
-        assignments = db.query(Assignment).filter(Assignment.teacher_id == current_user.id).order_by(Assignment.created_at.desc()).all()
-        # 构建响应
-        result = []
-        for assignment in assignments:
-            # 获取班级信息
-            target_class = db.query(Class).filter(Class.id == assignment.class_id).first()
-            class_name = target_class.name if target_class else "未知班级"
-            
-            result.append(AssignmentResponse(
-                id=assignment.id,
-                title=assignment.title,
-                description=assignment.description,
-                class_id=assignment.class_id,
-                class_name=class_name,
-                teacher_id=assignment.teacher_id,
-                teacher_name=current_user.name,
-                created_at=assignment.created_at,
-                updated_at=assignment.updated_at
-            ))
-        
-        return result
+        # 获取我创建的任务（按创建时间倒序分页）
+        query = assignment_list_query(db).filter(Assignment.teacher_id == current_user.id)
+        rows = keyset_paginate(db, query, Assignment.created_at, Assignment.id, page, response)
+        return [to_assignment_response(row) for row in rows]
 
     @staticmethod
     def update_assignment(db: Session, assignment_id: int, assignment_data: AssignmentUpdate, current_user: User) -> AssignmentResponse:
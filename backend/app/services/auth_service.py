@@ -3,14 +3,15 @@ from fastapi import HTTPException, status
 from typing import Optional
 from jose import JWTError
 
-from app.models.user import User
+from app.models.user import User, UserRole
 from app.schemas.user import UserCreate, UserResponse
 from app.utils.auth import (
-    verify_password, 
-    get_password_hash, 
+    password_hasher,
+    password_needs_rehash,
     create_access_token,
     verify_token
 )
+from app.utils.user_cache import UserPrincipal, user_cache
 from app.core.config import settings
 from datetime import timedelta
 
@@ -24,13 +25,25 @@ class AuthService:
         user = db.query(User).filter(User.name == username).first()
         if not user:
             return None
-        if not verify_password(password, user.password_hash):
+        # bcrypt 计算在独立的有界线程池中执行，繁忙时返回 503
+        if not password_hasher.verify(password, user.password_hash):
             return None
+        # 成本因子调整后，登录成功时透明地按新成本因子重新计算哈希；
+        # 密码已经验证通过，执行器繁忙时跳过重新计算，下次登录再试
+        if password_needs_rehash(user.password_hash):
+            try:
+                user.password_hash = password_hasher.hash(password)
+                db.commit()
+            except HTTPException:
+                pass
         return user
 
     @staticmethod
-    def get_current_user_by_token(token: str, db: Session) -> User:
-        """通过token获取当前用户"""
+    def get_current_user_by_token(token: str, db: Session) -> UserPrincipal:
+        """通过token获取当前用户身份（优先读取缓存，命中时不访问数据库）"""
+        principal = user_cache.get(token)
+        if principal is not None:
+            return principal
         credentials_exception = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -43,10 +56,12 @@ class AuthService:
                 raise credentials_exception
         except (JWTError, ValueError):
             raise credentials_exception
-        user = db.query(User).filter(User.id == user_id).first()
+        user = db.query(User.id, User.name, User.role).filter(User.id == user_id).first()
         if user is None:
             raise credentials_exception
-        return user
+        principal = UserPrincipal(id=user.id, name=user.name, role=user.role)
+        user_cache.put(token, principal, payload.get("exp"))
+        return principal
 
     @staticmethod
     def register_user(db: Session, user_data: UserCreate) -> UserResponse:
@@ -60,7 +75,7 @@ class AuthService:
             )
         
         # 创建新用户
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = password_hasher.hash(user_data.password)
         db_user = User(
             name=user_data.name,
             password_hash=hashed_password,
@@ -96,8 +111,27 @@ class AuthService:
         }
 
     @staticmethod
-    def get_user_profile(user: User) -> UserResponse:
+    def get_auth_metrics(current_user: User) -> dict:
+        """获取认证相关的运行指标（仅教师可查看）"""
+        if current_user.role != UserRole.TEACHER:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="只有教师可以查看运行指标"
+            )
+        return {
+            "password_hasher": password_hasher.metrics(),
+            "user_cache": user_cache.metrics()
+        }
+
+    @staticmethod
+    def get_user_profile(db: Session, current_user: UserPrincipal) -> UserResponse:
         """获取用户信息"""
+        user = db.query(User).filter(User.id == current_user.id).first()
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="用户不存在"
+            )
         return user
 
     @staticmethod
@@ -116,10 +150,11 @@ class AuthService:
         }
 
     @staticmethod
-    def logout_user(user: User) -> dict:
+    def logout_user(user: User, token: str) -> dict:
         """用户登出"""
         # 这里可以添加 token 黑名单逻辑
-        # 目前只是返回成功消息，因为 JWT 是无状态的
+        # 目前只清除该 token 的身份缓存，因为 JWT 是无状态的
+        user_cache.invalidate_token(token)
         return {
             "message": "Successfully logged out",
             "user_id": user.id
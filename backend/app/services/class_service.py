@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
-from fastapi import HTTPException, status
+from sqlalchemy import Float, func, type_coerce
+from fastapi import HTTPException, Response, status
 from typing import List
 
 from app.models.user import User
@@ -8,10 +9,15 @@ from app.models.student_class import StudentClass
 from app.models.teacher_class import TeacherClass, TeacherRole
 from app.schemas.class_schema import (
     ClassCreate, ClassUpdate, ClassResponse, ClassWithStudents, 
-    ClassSearch, StudentClassResponse, JoinClassRequest
+    ClassSearch, StudentClassResponse, JoinClassRequest,
+    ClassRosterQuery, ClassRosterEntry, RosterSortField, SortOrder
 )
-from app.utils.verify import verify_teacher_permission, verify_student_permission
+from app.schemas.pagination import PageParams
+from app.utils.verify import verify_teacher_permission, verify_student_permission, verify_teacher_class_access
 from app.utils.generate import generate_class_code
+from app.utils.membership import get_memberships
+from app.utils.pagination import keyset_paginate
+from app.utils.class_query import class_list_query, class_search_query, class_roster_subquery, to_class_response
 
 class ClassService:
     """班级管理服务类"""
@@ -71,59 +77,29 @@ class ClassService:
             )
 
     @staticmethod
-    def search_classes(db: Session, search_data: ClassSearch, current_user: User) -> List[ClassResponse]:
-        """搜索班级"""
+    def search_classes(db: Session, search_data: ClassSearch, current_user: User, response: Response) -> List[ClassResponse]:
+        """搜索班级（班级代码精确匹配，或在班级名称、描述和主教师姓名中全文搜索），按相关度分页"""
         search_term = search_data.search_term.strip()
-        
-        # 搜索班级（支持班级名称和班级代码的模糊搜索）
-        classes = db.query(Class).filter(
-            (Class.name.ilike(f"%{search_term}%")) |
-            (Class.class_code.ilike(f"%{search_term}%"))
-        ).limit(20).all()  # 限制返回数量
-        # 构建响应
-        result = []
-        for cls in classes:
-            # 获取主教师信息
-            teacher = db.query(User).filter(User.id == cls.teacher_id).first()
-            teacher_name = teacher.name if teacher else "未知教师"
-            
-            # 获取学生数量
-            student_count = db.query(StudentClass).filter(StudentClass.class_id == cls.id).count()
-            
-            # 确定用户是否已加入这个班级
-            my_role = "none"
-            if current_user.role == "student":
-                student_relation = db.query(StudentClass).filter(
-                    StudentClass.student_id == current_user.id,
-                    StudentClass.class_id == cls.id
-                ).first()
-                if student_relation:
-                    my_role = "student"
-            elif current_user.role == "teacher":
-                if cls.teacher_id == current_user.id:
-                    my_role = "main_teacher"
-                else:
-                    teacher_relation = db.query(TeacherClass).filter(
-                        TeacherClass.teacher_id == current_user.id,
-                        TeacherClass.class_id == cls.id
-                    ).first()
-                    if teacher_relation:
-                        my_role = "assistant_teacher"
-            
-            result.append(ClassResponse(
-                id=cls.id,
-                name=cls.name,
-                class_code=cls.class_code,
-                description=cls.description,
-                teacher_id=cls.teacher_id,
-                teacher_name=teacher_name,
-                created_at=cls.created_at,
-                updated_at=cls.updated_at,
-                student_count=student_count,
-                my_role=my_role
-            ))
-        
-        return result
+        if not search_term:
+            return []
+        # 当前用户所在班级及角色（一次查询）
+        memberships = get_memberships(db, current_user)
+        
+        def to_response(row) -> ClassResponse:
+            # 用户没有加入的班级角色为 none
+            role = memberships.get(row.id)
+            return to_class_response(row, role.value if role else "none")
+        
+        # 班级代码精确匹配时直接返回该班级（使用唯一索引）
+        if not search_data.cursor:
+            exact = class_list_query(db).filter(Class.class_code == search_term.upper()).first()
+            if exact:
+                return [to_response(exact)]
+        
+        # 全文搜索，按 (相关度, 班级ID) 游标分页
+        query, rank = class_search_query(db, search_term)
+        rows = keyset_paginate(db, query, rank, Class.id, search_data, response)
+        return [to_response(row) for row in rows]
 
     @staticmethod
     def join_class_as_student(db: Session, 
@@ -226,133 +202,45 @@ class ClassService:
             )
 
     @staticmethod
-    def get_my_classes(db: Session, current_user: User) -> List[ClassResponse]:
+    def get_my_classes(db: Session, current_user: User, page: PageParams, response: Response) -> List[ClassResponse]:
         """查看当前用户的班级列表"""
-        if current_user.role == "teacher":
-            # 教师查看自己创建的班级（作为主教师）
-            created_classes = db.query(Class).filter(Class.teacher_id == current_user.id).all()
-            
-            # 教师查看自己加入的班级（作为助教）
-            joined_classes = db.query(Class).join(TeacherClass).filter(
-                TeacherClass.teacher_id == current_user.id
-            ).all()
-            
-            # 合并并去重（避免主教师重复显示自己创建的班级）
-            all_classes = created_classes + joined_classes
-            unique_classes = []
-            seen_ids = set()
-            for cls in all_classes:
-                if cls.id not in seen_ids:
-                    unique_classes.append(cls)
-                    seen_ids.add(cls.id)
-            
-            classes = unique_classes
-        elif current_user.role == "student":
-            # 学生查看自己加入的班级
-            classes = db.query(Class).join(StudentClass).filter(StudentClass.student_id == current_user.id).all()
-        else:
+        if current_user.role not in ("teacher", "student"):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="无效的用户角色"
             )
         
-        # 构建完整的响应数据
-        result = []
-        for cls in classes:
-            # 获取主教师信息
-            teacher = db.query(User).filter(User.id == cls.teacher_id).first()
-            teacher_name = teacher.name if teacher else "未知教师"
-            
-            # 获取学生数量
-            student_count = db.query(StudentClass).filter(StudentClass.class_id == cls.id).count()
-            
-            # 确定用户在这个班级的角色
-            my_role = "student" if current_user.role == "student" else "main_teacher"
-            if current_user.role == "teacher" and cls.teacher_id != current_user.id:
-                # 检查是否是助教
-                teacher_relation = db.query(TeacherClass).filter(
-                    TeacherClass.teacher_id == current_user.id,
-                    TeacherClass.class_id == cls.id
-                ).first()
-                if teacher_relation:
-                    my_role = "assistant_teacher"
-            
-            result.append(ClassResponse(
-                id=cls.id,
-                name=cls.name,
-                class_code=cls.class_code,
-                description=cls.description,
-                teacher_id=cls.teacher_id,
-                teacher_name=teacher_name,
-                created_at=cls.created_at,
-                updated_at=cls.updated_at,
-                student_count=student_count,
-                my_role=my_role
-            ))
+        # 当前用户所在班级及角色（一次查询）
+        # 教师：自己创建的班级（主教师）和自己加入的班级（助教）；学生：自己加入的班级
+        memberships = get_memberships(db, current_user)
+        query = class_list_query(db).filter(Class.id.in_(list(memberships)))
+        rows = keyset_paginate(db, query, Class.created_at, Class.id, page, response)
         
-        return result
+        return [to_class_response(row, memberships[row.id].value) for row in rows]
 
     @staticmethod
-    def get_my_created_classes(db: Session, current_user: User) -> List[ClassResponse]:
+    def get_my_created_classes(db: Session, current_user: User, page: PageParams, response: Response) -> List[ClassResponse]:
         """查看教师创建的班级（仅主教师）"""
         verify_teacher_permission(current_user)
         
         # 教师查看自己创建的班级（作为主教师）
-        classes = db.query(Class).filter(Class.teacher_id == current_user.id).all()
+        query = class_list_query(db).filter(Class.teacher_id == current_user.id)
+        rows = keyset_paginate(db, query, Class.created_at, Class.id, page, response)
         
-        # 构建完整的响应数据
-        result = []
-        for cls in classes:
-            # 获取学生数量
-            student_count = db.query(StudentClass).filter(StudentClass.class_id == cls.id).count()
-            
-            result.append(ClassResponse(
-                id=cls.id,
-                name=cls.name,
-                class_code=cls.class_code,
-                description=cls.description,
-                teacher_id=cls.teacher_id,
-                teacher_name=current_user.name,
-                created_at=cls.created_at,
-                updated_at=cls.updated_at,
-                student_count=student_count,
-                my_role="main_teacher"
-            ))
-        
-        return result
+        return [to_class_response(row, "main_teacher") for row in rows]
 
     @staticmethod
-    def get_my_joined_classes(db: Session, current_user: User) -> List[ClassResponse]:
+    def get_my_joined_classes(db: Session, current_user: User, page: PageParams, response: Response) -> List[ClassResponse]:
         """查看教师加入的班级（作为助教）"""
         verify_teacher_permission(current_user)
         
         # 教师查看自己加入的班级（作为助教）
-        classes = db.query(Class).join(TeacherClass).filter(TeacherClass.teacher_id == current_user.id).all()
-        
-        # 构建完整的响应数据
-        result = []
-        for cls in classes:
-            # 获取主教师信息
-            teacher = db.query(User).filter(User.id == cls.teacher_id).first()
-            teacher_name = teacher.name if teacher else "未知教师"
-            
-            # 获取学生数量
-            student_count = db.query(StudentClass).filter(StudentClass.class_id == cls.id).count()
-            
-            result.append(ClassResponse(
-                id=cls.id,
-                name=cls.name,
-                class_code=cls.class_code,
-                description=cls.description,
-                teacher_id=cls.teacher_id,
-                teacher_name=teacher_name,
-                created_at=cls.created_at,
-                updated_at=cls.updated_at,
-                student_count=student_count,
-                my_role="assistant_teacher"
-            ))
+        query = class_list_query(db).join(
+            TeacherClass, TeacherClass.class_id == Class.id
+        ).filter(TeacherClass.teacher_id == current_user.id)
+        rows = keyset_paginate(db, query, Class.created_at, Class.id, page, response)
         
-        return result
+        return [to_class_response(row, "assistant_teacher") for row in rows]
 
 
     @staticmethod
@@ -375,20 +263,16 @@ class ClassService:
                 detail="您只能查看自己创建的班级"
             )
         
-        # 获取班级学生信息
-        student_relations = db.query(StudentClass).filter(
+        # 获取班级学生信息（一次联合查询）
+        rows = db.query(
+            User.id, User.name, StudentClass.joined_at
+        ).select_from(StudentClass).join(
+            User, User.id == StudentClass.student_id
+        ).filter(
             StudentClass.class_id == class_id
-        ).all()
-        
-        students = []
-        for relation in student_relations:
-            student = db.query(User).filter(User.id == relation.student_id).first()
-            if student:
-                students.append({
-                    "id": student.id,
-                    "name": student.name,
-                    "joined_at": relation.joined_at
-                })
+        ).order_by(StudentClass.id).all()
+        
+        students = [{"id": row.id, "name": row.name, "joined_at": row.joined_at} for row in rows]
         
         return ClassWithStudents(
             id=target_class.id,
@@ -400,6 +284,41 @@ class ClassService:
             students=students
         )
 
+    @staticmethod
+    def get_class_roster(db: Session, class_id: int, current_user: User, params: ClassRosterQuery, response: Response) -> List[ClassRosterEntry]:
+        """查看班级花名册：每个学生的加入时间、提交数、已评分数和平均分（主教师和助教可访问），支持排序和分页"""
+        # 验证教师权限
+        verify_teacher_permission(current_user)
+        
+        # 只有主教师和助教可以查看（花名册包含所有学生的成绩汇总；班级不存在时返回404）
+        verify_teacher_class_access(db, class_id, current_user, detail="只有班级的主教师和助教可以查看花名册")
+        
+        roster = class_roster_subquery(class_id)
+        sort_columns = {
+            RosterSortField.NAME: roster.c.name,
+            RosterSortField.JOINED_AT: roster.c.joined_at,
+            RosterSortField.SUBMISSION_COUNT: roster.c.submission_count,
+            RosterSortField.GRADED_COUNT: roster.c.graded_count,
+            # 没有分数的学生平均分为空，按 -1 排序（游标比较不能包含空值）
+            RosterSortField.AVERAGE_SCORE: type_coerce(func.coalesce(roster.c.average_score, -1.0), Float),
+        }
+        rows = keyset_paginate(
+            db, db.query(roster), sort_columns[params.sort_by], roster.c.student_id, params, response,
+            descending=params.order == SortOrder.DESC
+        )
+        
+        return [
+            ClassRosterEntry(
+                student_id=row.student_id,
+                name=row.name,
+                joined_at=row.joined_at,
+                submission_count=row.submission_count,
+                graded_count=row.graded_count,
+                average_score=round(row.average_score, 2) if row.average_score is not None else None
+            )
+            for row in rows
+        ]
+
     @staticmethod
     def update_class(db: Session, class_id: int, class_data: ClassUpdate, current_user: User) -> ClassResponse:
         """更新班级信息（仅创建该班级的教师可操作）"""
@@ -450,23 +369,9 @@ class ClassService:
             db.commit()
             db.refresh(target_class)
             
-            # 构建完整响应
-            teacher = db.query(User).filter(User.id == target_class.teacher_id).first()
-            teacher_name = teacher.name if teacher else "未知教师"
-            student_count = db.query(StudentClass).filter(StudentClass.class_id == target_class.id).count()
-            
-            return ClassResponse(
-                id=target_class.id,
-                name=target_class.name,
-                class_code=target_class.class_code,
-                description=target_class.description,
-                teacher_id=target_class.teacher_id,
-                teacher_name=teacher_name,
-                created_at=target_class.created_at,
-                updated_at=target_class.updated_at,
-                student_count=student_count,
-                my_role="main_teacher"
-            )
+            # 构建完整响应（主教师姓名和学生数量一次查出）
+            row = class_list_query(db).filter(Class.id == target_class.id).one()
+            return to_class_response(row, "main_teacher")
         except Exception as e:
             db.rollback()
             raise HTTPException(
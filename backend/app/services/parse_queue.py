@@ -0,0 +1,314 @@
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import and_, or_
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.parse_job import ParseJob, ParseJobStatus
+from app.models.submission import ParseStatus
+from app.utils.blob_store import get_blob_store
+from app.utils.parser_utils import parse_docx
+from app.utils.parsed_document import save_parsed_document
+from app.utils.parse_cache import get_cached_result, store_parse_result
+
+logger = logging.getLogger(__name__)
+
+
+def parse_blob(file_hash: str) -> dict:
+    """在解析进程中读取文件存储中的文档并解析"""
+    with get_blob_store().open(file_hash) as file_obj:
+        return parse_docx(file_obj)
+
+
+def _lease_deadline(lease_seconds: int) -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=lease_seconds)
+
+
+def _held(claims: Dict[int, int]):
+    """SQL 条件：任务仍由本进程持有，即仍在解析中且尝试次数与领取时相同
+
+    领取时 attempts 加一，因此租约过期后被其他进程重新领取的任务 attempts 不同，本进程的写入不会生效。
+    """
+    return and_(
+        ParseJob.status == ParseJobStatus.RUNNING,
+        or_(*[and_(ParseJob.id == job_id, ParseJob.attempts == attempt) for job_id, attempt in claims.items()])
+    )
+
+
+class ParseQueue:
+    """文档解析队列：任务持久化在 parse_jobs 表中，由有界的进程池并行解析
+
+    多个服务进程共用同一张任务表：领取任务时写入租约，解析期间定期续约；
+    只有租约过期（所在进程已退出）的任务才会被重新排队，不会打断其他进程正在解析的任务。
+    """
+
+    def __init__(self, max_workers: int, max_attempts: int, lease_seconds: int):
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._workers = []
+        self._heartbeat: Optional[asyncio.Task] = None
+        # 本进程已领取、正在处理的任务：任务ID -> 领取时的尝试次数（需要续约）
+        self._active: Dict[int, int] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None
+
+    async def start(self) -> None:
+        """启动解析进程池和消费协程，并恢复上次未完成的任务"""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_workers)]
+        self._heartbeat = asyncio.create_task(self._renew_leases())
+        for job_id in await asyncio.to_thread(self._recover_jobs, True):
+            self._queue.put_nowait(job_id)
+
+    async def stop(self) -> None:
+        """停止解析队列（未完成的任务保留在数据库中，下次启动时继续）"""
+        if not self.running:
+            return
+        # 中断的任务立即交还，不必等待租约过期（取消消费协程时任务会从 _active 中移除，先记录下来）
+        interrupted = dict(self._active)
+        for task in [*self._workers, self._heartbeat]:
+            task.cancel()
+        await asyncio.gather(*self._workers, self._heartbeat, return_exceptions=True)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        await asyncio.to_thread(self._release_jobs, interrupted)
+        self._loop = self._queue = self._pool = self._heartbeat = None
+        self._workers = []
+        self._active.clear()
+
+    def enqueue(self, job_id: int) -> None:
+        """提交解析任务（线程安全，可在请求线程池中调用）；队列未启动时任务留在数据库中等待恢复"""
+        if not self.running:
+            return
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, job_id)
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run_job(job_id)
+            except Exception:
+                logger.exception("解析任务 %s 处理异常", job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _renew_leases(self) -> None:
+        """定期为本进程正在处理的任务续约，并重新排队租约已过期的任务"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 4)
+            try:
+                await asyncio.to_thread(self._extend_leases, dict(self._active))
+                for job_id in await asyncio.to_thread(self._recover_jobs, False):
+                    self._queue.put_nowait(job_id)
+            except Exception:
+                logger.exception("解析任务续约失败")
+
+    async def _run_job(self, job_id: int) -> None:
+        claim = await asyncio.to_thread(self._claim_job, job_id, self.lease_seconds)
+        if claim is None:
+            return
+        file_hash, attempt = claim
+        self._active[job_id] = attempt
+        try:
+            await self._parse_job(job_id, attempt, file_hash)
+        finally:
+            self._active.pop(job_id, None)
+
+    async def _parse_job(self, job_id: int, attempt: int, file_hash: str) -> None:
+        # 同一文件可能已由其他任务解析过（例如多名学生同时上传同一份文件）
+        result = await asyncio.to_thread(self._load_cached_result, file_hash)
+        if result is not None:
+            await asyncio.to_thread(self._complete_job, job_id, attempt, result, False)
+            return
+        pool = self._pool
+        try:
+            result = await self._loop.run_in_executor(pool, parse_blob, file_hash)
+        except BrokenProcessPool:
+            # 解析进程异常退出（例如内存耗尽），重建进程池后按重试次数决定是否重新排队；
+            # 同一个进程池上的所有任务都会失败，只有第一个发现的任务重建（都在事件循环线程中执行，无需加锁）
+            if self._pool is pool:
+                logger.error("解析进程池异常，正在重建")
+                pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            if await asyncio.to_thread(self._fail_job, job_id, attempt, "解析进程异常退出", True):
+                self._queue.put_nowait(job_id)
+        except Exception as e:
+            await asyncio.to_thread(self._fail_job, job_id, attempt, f"文件解析失败: {str(e)}", False)
+        else:
+            await asyncio.to_thread(self._complete_job, job_id, attempt, result, True)
+
+    @staticmethod
+    def _recover_jobs(include_pending: bool) -> list:
+        """把租约已过期的解析中任务（所在进程已退出）重置为等待状态，返回需要排队的任务ID
+
+        include_pending 为 True 时（启动时）同时返回所有等待中的任务。
+        """
+        lease_expired = and_(
+            ParseJob.status == ParseJobStatus.RUNNING,
+            or_(ParseJob.lease_expires_at.is_(None), ParseJob.lease_expires_at < datetime.now(timezone.utc))
+        )
+        db = SessionLocal()
+        try:
+            expired = [row.id for row in db.query(ParseJob.id).filter(lease_expired)]
+            if expired:
+                # 条件更新：查询之后被续约或已完成的任务保持不变
+                db.query(ParseJob).filter(ParseJob.id.in_(expired), lease_expired).update({
+                    ParseJob.status: ParseJobStatus.PENDING,
+                    ParseJob.lease_expires_at: None
+                }, synchronize_session=False)
+                db.commit()
+                logger.warning("重新排队 %d 个租约过期的解析任务", len(expired))
+            if not include_pending:
+                return expired
+            rows = db.query(ParseJob.id).filter(
+                ParseJob.status == ParseJobStatus.PENDING
+            ).order_by(ParseJob.id).all()
+            return [row.id for row in rows]
+        finally:
+            db.close()
+
+    def _extend_leases(self, claims: Dict[int, int]) -> None:
+        """为正在处理的任务续约（已被其他进程重新领取的任务不续约）"""
+        if not claims:
+            return
+        db = SessionLocal()
+        try:
+            db.query(ParseJob).filter(_held(claims)).update({ParseJob.lease_expires_at: _lease_deadline(self.lease_seconds)}, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _release_jobs(claims: Dict[int, int]) -> None:
+        """把本进程中断的任务交还为等待状态"""
+        if not claims:
+            return
+        db = SessionLocal()
+        try:
+            db.query(ParseJob).filter(_held(claims)).update({
+                ParseJob.status: ParseJobStatus.PENDING,
+                ParseJob.lease_expires_at: None
+            }, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _claim_job(job_id: int, lease_seconds: int) -> Optional[Tuple[str, int]]:
+        """领取等待中的任务并写入租约（条件更新保证多个进程不会重复领取），返回 (待解析文件哈希, 本次尝试次数)"""
+        db = SessionLocal()
+        try:
+            claimed = db.query(ParseJob).filter(
+                ParseJob.id == job_id,
+                ParseJob.status == ParseJobStatus.PENDING
+            ).update({
+                ParseJob.status: ParseJobStatus.RUNNING,
+                ParseJob.attempts: ParseJob.attempts + 1,
+                ParseJob.lease_expires_at: _lease_deadline(lease_seconds)
+            }, synchronize_session=False)
+            db.commit()
+            if not claimed:
+                return None
+            job = db.query(ParseJob).filter(ParseJob.id == job_id).first()
+            if not ParseQueue._is_current(job):
+                job.status = ParseJobStatus.CANCELLED
+                job.lease_expires_at = None
+                db.commit()
+                return None
+            return job.file_hash, job.attempts
+        finally:
+            db.close()
+
+    @staticmethod
+    def _load_cached_result(file_hash: str) -> Optional[dict]:
+        """读取解析结果缓存"""
+        db = SessionLocal()
+        try:
+            result = get_cached_result(db, file_hash)
+            db.commit()
+            return result
+        finally:
+            db.close()
+
+    @staticmethod
+    def _complete_job(job_id: int, attempt: int, result: dict, cache_result: bool) -> None:
+        """保存解析结果；新解析的结果同时写入缓存
+
+        任务状态用条件更新写入：租约过期后任务已被重新排队或由其他进程领取时不匹配任何行，丢弃本次结果。
+        """
+        db = SessionLocal()
+        try:
+            job = db.query(ParseJob).filter(ParseJob.id == job_id).first()
+            if job is None:
+                return  # 提交已被删除
+            is_current = ParseQueue._is_current(job)
+            finished = db.query(ParseJob).filter(ParseJob.id == job_id, _held({job_id: attempt})).update({
+                ParseJob.status: ParseJobStatus.DONE if is_current else ParseJobStatus.CANCELLED,
+                ParseJob.error: None,
+                ParseJob.lease_expires_at: None
+            }, synchronize_session=False)
+            if not finished:
+                logger.warning("解析任务 %s 已不由本进程持有，丢弃解析结果", job_id)
+                db.rollback()
+                return
+            if cache_result:
+                store_parse_result(db, job.file_hash, result)
+            if is_current:
+                save_parsed_document(db, job.submission, result)
+                job.submission.parse_status = ParseStatus.PARSED
+            db.commit()
+        finally:
+            db.close()
+
+    def _fail_job(self, job_id: int, attempt: int, error: str, retry: bool) -> bool:
+        """记录解析失败；可重试且未超过最大次数时重置为等待状态并返回True
+
+        与 _complete_job 相同，只在任务仍由本进程持有时写入（不会把已完成的任务改回等待状态）。
+        """
+        db = SessionLocal()
+        try:
+            job = db.query(ParseJob).filter(ParseJob.id == job_id).first()
+            if job is None:
+                return False  # 提交已被删除
+            requeue = retry and attempt < self.max_attempts
+            failed = db.query(ParseJob).filter(ParseJob.id == job_id, _held({job_id: attempt})).update({
+                ParseJob.status: ParseJobStatus.PENDING if requeue else ParseJobStatus.FAILED,
+                ParseJob.error: error,
+                ParseJob.lease_expires_at: None
+            }, synchronize_session=False)
+            if not failed:
+                logger.warning("解析任务 %s 已不由本进程持有，忽略失败结果", job_id)
+                db.rollback()
+                return False
+            if not requeue and ParseQueue._is_current(job):
+                job.submission.parse_status = ParseStatus.FAILED
+            db.commit()
+            return requeue
+        finally:
+            db.close()
+
+    @staticmethod
+    def _is_current(job: ParseJob) -> bool:
+        """任务对应的文件是否仍是提交的当前文件（重复提交后旧任务作废）"""
+        return job.submission is not None and job.submission.file_hash == job.file_hash
+
+
+# 全局解析队列实例
+parse_queue = ParseQueue(
+    max_workers=settings.PARSE_WORKERS,
+    max_attempts=settings.PARSE_MAX_ATTEMPTS,
+    lease_seconds=settings.PARSE_LEASE_SECONDS
+)
@@ -1,61 +1,72 @@
 from sqlalchemy.orm import Session
-from fastapi import HTTPException, status, UploadFile, Response
+from fastapi import HTTPException, status, UploadFile, Request, Response
 from typing import List
-from sqlalchemy import func
-from io import BytesIO
-import json
+from sqlalchemy import and_, bindparam, exists, func, select, update
+from itertools import groupby
+import posixpath
+from app.core.config import settings
+from app.db.database import stream_query
 from app.models.student_class import StudentClass
 from app.models.user import User
 from app.models.class_model import Class
 from app.models.assignment import Assignment
-from app.models.submission import Submission
+from app.models.submission import Submission, ParseStatus
+from app.models.parse_job import ParseJob
 from app.schemas.submission_schema import (
     SubmissionGrade, 
-    SubmissionDetailResponse, SubmissionCreateResponse, SubmissionStatistics,
-    StudentSubmissionResponse, TeacherSubmissionResponse, PendingAssignmentResponse
+    SubmissionDetailResponse, SubmissionCreateResponse, SubmissionStatistics, SubmissionParseStatusResponse,
+    StudentSubmissionResponse, TeacherSubmissionResponse, PendingAssignmentResponse, SubmissionListFilter,
+    SubmissionDetailQuery, SubmissionDetailSection, SubmissionGradeResponse,
+    BulkImportItem, BulkImportResponse, BulkImportStatus,
+    SubmissionBatchGrade, SubmissionBatchGradeResponse, SubmissionBatchGradeItemResult, BatchGradeStatus,
+    ExportFormat
 )
+from app.schemas.pagination import PageParams
 from app.utils.verify import verify_student_permission, verify_teacher_permission, verify_class_member_access
-from app.utils.parser_utils import parse_docx
+from app.utils.score_statistics import load_assignment_statistics, record_submission_created, record_score_change, rebuild_assignment_stats
+from app.utils.membership import ClassMemberRole, get_class_role, get_memberships
+from app.utils.blob_store import get_blob_store
+from app.utils.download import build_blob_response
+from app.utils.export import export_table_response, export_zip_response
+from app.utils.parsed_document import load_outline, load_paragraphs
+from app.utils.submission_upload import store_docx, attach_submission_file, iter_uploaded_documents
+from app.utils.outline_utils import build_outline_tree
+from app.services.parse_queue import parse_queue
+from app.utils.submission_query import (
+    submission_list_query, apply_submission_filters, to_student_submission_response, to_teacher_submission_response
+)
+from app.utils.pagination import keyset_paginate
+
+# 导出成绩表时解析状态的显示文本
+PARSE_STATUS_LABELS = {
+    ParseStatus.PARSING: "解析中",
+    ParseStatus.PARSED: "已解析",
+    ParseStatus.FAILED: "解析失败",
+}
+
+
+def _export_path_part(name: str) -> str:
+    """压缩包内的路径片段：替换目录分隔符，避免生成子目录或跳出压缩包根目录"""
+    name = name.replace("/", "_").replace("\\", "_").strip()
+    return name if name not in ("", ".", "..") else "_"
 
 
 class SubmissionService:
     """提交管理服务类"""
 
     @staticmethod
-    def get_my_submissions(db: Session, current_user: User) -> List[StudentSubmissionResponse]:
+    def get_my_submissions(db: Session, current_user: User, page: PageParams, response: Response) -> List[StudentSubmissionResponse]:
         """学生查看自己的提交列表"""
         # 验证学生权限
         verify_student_permission(current_user)
         
-        # 获取学生的所有提交
-        submissions = db.query(Submission).filter(
+        # 获取学生的所有提交（联合查询任务和班级信息）
+        query = submission_list_query(db).filter(
             Submission.student_id == current_user.id
-        ).order_by(Submission.submitted_at.desc()).all()
+        )
+        rows = keyset_paginate(db, query, Submission.submitted_at, Submission.id, page, response)
         
-        # 构建响应
-        result = []
-        for submission in submissions:
-            # 获取任务信息
-            assignment = db.query(Assignment).filter(Assignment.id == submission.assignment_id).first()
-            assignment_title = assignment.title if assignment else "未知任务"
-            
-            # 获取班级信息
-            class_obj = db.query(Class).filter(Class.id == assignment.class_id).first() if assignment else None
-            class_id = class_obj.id if class_obj else 0
-            class_name = class_obj.name if class_obj else "未知班级"
-            
-            result.append(StudentSubmissionResponse(
-                id=submission.id,
-                assignment_title=assignment_title,
-                assignment_id=submission.assignment_id,
-                class_id=class_id,
-                class_name=class_name,
-                score=submission.score,
-                submitted_at=submission.submitted_at,
-                is_graded=submission.is_graded
-            ))
-        
-        return result
+        return [to_student_submission_response(row) for row in rows]
 
     @staticmethod
     def create_submission_with_file(db: Session, assignment_id: int, file: UploadFile, current_user: User) -> SubmissionCreateResponse:
@@ -81,72 +92,176 @@ class SubmissionService:
         # 验证学生是否在任务所属的班级中
         verify_class_member_access(db, assignment.class_id, current_user)
         
-        # 读取并解析文件
-        try:
-            content = file.file.read()
-            file_obj = BytesIO(content)
-            file_json_dict = parse_docx(file_obj)
-            file_json = json.dumps(file_json_dict, ensure_ascii=False)
-        except Exception as e:
+        # 保存原始文件到文件存储（按内容哈希去重），解析交给后台解析队列
+        stored = store_docx(file.file)
+        if stored is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"文件解析失败: {str(e)}"
+                detail="文件解析失败: 不是有效的docx文件"
             )
+        file_hash, file_size = stored
         
-        # 检查是否已经提交过（重复提交覆盖）
+        # 检查是否已经提交过（重复提交覆盖，保留批改信息）
         existing_submission = db.query(Submission).filter(
             Submission.student_id == current_user.id,
             Submission.assignment_id == assignment_id
         ).first()
         
-        if existing_submission:
-            # 更新现有提交（更新原始文件和解析数据，保留批改信息）
-            existing_submission.original_file = content
-            existing_submission.file_name = file.filename
-            existing_submission.file_json = file_json
-            
-            try:
-                db.commit()
-                db.refresh(existing_submission)
-                submission = existing_submission
-            except Exception as e:
-                db.rollback()
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"更新提交失败: {str(e)}"
-                )
-        else:
-            # 创建新提交
-            new_submission = Submission(
-                student_id=current_user.id,
-                assignment_id=assignment_id,
-                original_file=content,
-                file_name=file.filename,
-                file_json=file_json
+        try:
+            # 内容相同的文件解析过时直接使用缓存的解析结果，不再排队解析
+            submission, parse_job, cache_hit = attach_submission_file(
+                db, existing_submission, current_user.id, assignment_id, file_hash, file_size, file.filename
             )
-            
-            try:
-                db.add(new_submission)
-                db.commit()
-                db.refresh(new_submission)
-                submission = new_submission
-            except Exception as e:
-                db.rollback()
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"创建提交失败: {str(e)}"
-                )
+            if not existing_submission:
+                record_submission_created(db, assignment_id)
+            db.commit()
+            db.refresh(submission)
+        except Exception as e:
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"更新提交失败: {str(e)}" if existing_submission else f"创建提交失败: {str(e)}"
+            )
+        
+        # 提交解析任务（命中缓存时已经解析完成）
+        if parse_job is not None:
+            parse_queue.enqueue(parse_job.id)
+            message = "提交成功，正在解析文件" if not existing_submission else "提交已更新，正在解析文件"
+        else:
+            message = "提交成功，文件已解析" if not existing_submission else "提交已更新，文件已解析"
         
         # 构建响应
         return SubmissionCreateResponse(
             id=submission.id,
             assignment_title=assignment.title,
             submitted_at=submission.submitted_at,
-            message="提交成功" if not existing_submission else "提交已更新"
+            parse_status=submission.parse_status,
+            cache_hit=cache_hit,
+            message=message
+        )
+
+    @staticmethod
+    def bulk_import_submissions(db: Session, assignment_id: int, files: List[UploadFile], current_user: User) -> BulkImportResponse:
+        """教师批量导入提交：docx 文件名（或 zip 中的文件名、目录名）为学生用户名，逐个文件返回处理结果"""
+        # 验证教师权限
+        verify_teacher_permission(current_user)
+        
+        # 查找任务
+        assignment = db.query(Assignment).filter(Assignment.id == assignment_id).first()
+        if not assignment:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="任务不存在"
+            )
+        
+        # 验证教师对班级的访问权限
+        verify_class_member_access(db, assignment.class_id, current_user)
+        
+        # 列出所有文档（zip 只读取目录），此时还不读取文件内容
+        documents = list(iter_uploaded_documents(files))
+        if len(documents) > settings.BULK_IMPORT_MAX_FILES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"一次最多导入 {settings.BULK_IMPORT_MAX_FILES} 个文件"
+            )
+        
+        # 一次查询按用户名匹配班级中的学生
+        names = {document.student_name for document in documents if document.student_name and not document.error}
+        students = {}
+        if names:
+            rows = db.query(User.id, User.name).join(
+                StudentClass, StudentClass.student_id == User.id
+            ).filter(
+                StudentClass.class_id == assignment.class_id,
+                User.name.in_(names)
+            ).all()
+            students = {row.name: row.id for row in rows}
+        
+        items = []
+        pending = []
+        seen_students = set()
+        for document in documents:
+            item = BulkImportItem(file_name=document.file_name, student_name=document.student_name,
+                                  status=BulkImportStatus.FAILED, message=document.error or "")
+            items.append(item)
+            if document.error:
+                continue
+            student_id = students.get(document.student_name)
+            if student_id is None:
+                item.message = "班级中没有该用户名的学生"
+            elif student_id in seen_students:
+                item.message = "同一学生有多个文件，只导入第一个"
+            else:
+                seen_students.add(student_id)
+                pending.append((item, document, student_id))
+        
+        # 分批导入：先流式保存本批文件，再在一个事务中写入本批提交，提交后把解析任务加入队列并行解析
+        batch_size = settings.BULK_IMPORT_BATCH_SIZE
+        for start in range(0, len(pending), batch_size):
+            batch = []
+            for item, document, student_id in pending[start:start + batch_size]:
+                with document.open_file() as file_obj:
+                    stored = store_docx(file_obj)
+                if stored is None:
+                    item.message = "不是有效的docx文件"
+                else:
+                    batch.append((item, document, student_id, stored))
+            if not batch:
+                continue
+            
+            existing = {
+                submission.student_id: submission
+                for submission in db.query(Submission).filter(
+                    Submission.assignment_id == assignment_id,
+                    Submission.student_id.in_([student_id for _, _, student_id, _ in batch])
+                )
+            }
+            try:
+                attached = []
+                parse_jobs = []
+                for item, document, student_id, (file_hash, file_size) in batch:
+                    submission, parse_job, cache_hit = attach_submission_file(
+                        db, existing.get(student_id), student_id, assignment_id,
+                        file_hash, file_size, posixpath.basename(document.file_name)
+                    )
+                    if parse_job is not None:
+                        parse_jobs.append(parse_job)
+                    attached.append((item, submission, student_id in existing, cache_hit))
+                created = sum(1 for _, _, updated, _ in attached if not updated)
+                if created:
+                    record_submission_created(db, assignment_id, created)
+                # 提交事务会使所有对象过期，先 flush 取得ID并记下结果，避免提交后逐个重新加载
+                db.flush()
+                results = [(item, submission.id, submission.parse_status, updated, cache_hit)
+                           for item, submission, updated, cache_hit in attached]
+                parse_job_ids = [parse_job.id for parse_job in parse_jobs]
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                for item, *_ in batch:
+                    item.message = f"导入失败: {str(e)}"
+                continue
+            
+            for item, submission_id, parse_status, updated, cache_hit in results:
+                item.status = BulkImportStatus.UPDATED if updated else BulkImportStatus.CREATED
+                item.submission_id = submission_id
+                item.parse_status = parse_status
+                item.cache_hit = cache_hit
+                item.message = "文件已解析" if cache_hit else "正在解析文件"
+            for parse_job_id in parse_job_ids:
+                parse_queue.enqueue(parse_job_id)
+        
+        return BulkImportResponse(
+            assignment_id=assignment_id,
+            total=len(items),
+            created=sum(1 for item in items if item.status == BulkImportStatus.CREATED),
+            updated=sum(1 for item in items if item.status == BulkImportStatus.UPDATED),
+            failed=sum(1 for item in items if item.status == BulkImportStatus.FAILED),
+            items=items
         )
 
     @staticmethod
-    def get_assignment_submissions(db: Session, assignment_id: int, current_user: User) -> List[TeacherSubmissionResponse]:
+    def get_assignment_submissions(db: Session, assignment_id: int, current_user: User, filters: SubmissionListFilter, response: Response) -> List[TeacherSubmissionResponse]:
         """教师查看指定任务的提交列表"""
         # 验证教师权限
         verify_teacher_permission(current_user)
@@ -162,52 +277,38 @@ class SubmissionService:
         # 验证教师对班级的访问权限
         verify_class_member_access(db, assignment.class_id, current_user)
         
-        # 获取任务的所有提交
-        submissions = db.query(Submission).filter(
+        # 获取任务的所有提交（联合查询学生和班级信息）
+        query = apply_submission_filters(submission_list_query(db), filters).filter(
             Submission.assignment_id == assignment_id
-        ).order_by(Submission.submitted_at.desc()).all()
-        
-        # 获取班级信息
-        class_obj = db.query(Class).filter(Class.id == assignment.class_id).first()
-        class_id = class_obj.id if class_obj else 0
-        class_name = class_obj.name if class_obj else "未知班级"
+        )
+        rows = keyset_paginate(db, query, Submission.submitted_at, Submission.id, filters, response)
         
-        # 构建响应
-        result = []
-        for submission in submissions:
-            # 获取学生信息
-            student = db.query(User).filter(User.id == submission.student_id).first()
-            student_name = student.name if student else "未知学生"
-            
-            result.append(TeacherSubmissionResponse(
-                id=submission.id,
-                student_id=submission.student_id,
-                student_name=student_name,
-                assignment_title=assignment.title,
-                assignment_id=submission.assignment_id,
-                class_id=class_id,
-                class_name=class_name,
-                score=submission.score,
-                submitted_at=submission.submitted_at,
-                is_graded=submission.is_graded
-            ))
-        
-        return result
+        return [to_teacher_submission_response(row) for row in rows]
 
     @staticmethod
-    def get_submission_detail(db: Session, submission_id: int, current_user: User) -> SubmissionDetailResponse:
-        """获取提交详情"""
-        # 查找提交
-        submission = db.query(Submission).filter(Submission.id == submission_id).first()
-        if not submission:
+    def get_submission_detail(db: Session, submission_id: int, current_user: User, params: SubmissionDetailQuery) -> SubmissionDetailResponse:
+        """获取提交详情（文档内容按 include 和段落区间按需加载）"""
+        # 查找提交及任务、班级、学生名称（一次查询）
+        row = db.query(
+            Submission,
+            Assignment.title.label("assignment_title"),
+            Assignment.class_id,
+            Class.name.label("class_name"),
+            User.name.label("student_name")
+        ).outerjoin(
+            Assignment, Assignment.id == Submission.assignment_id
+        ).outerjoin(
+            Class, Class.id == Assignment.class_id
+        ).outerjoin(
+            User, User.id == Submission.student_id
+        ).filter(Submission.id == submission_id).first()
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="提交不存在"
             )
-        
-        # 获取任务信息
-        assignment = db.query(Assignment).filter(Assignment.id == submission.assignment_id).first()
-        if not assignment:
+        submission = row.Submission
+        if row.class_id is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="任务不存在"
@@ -221,40 +322,38 @@ class SubmissionService:
                     detail="您只能查看自己的提交"
                 )
         elif current_user.role == "teacher":
-            verify_class_member_access(db, assignment.class_id, current_user)
+            verify_class_member_access(db, row.class_id, current_user)
         else:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="无效的用户角色"
             )
         
-        # 获取学生信息
-        student = db.query(User).filter(User.id == submission.student_id).first()
-        student_name = student.name if student else "未知学生"
-        
-        # 获取班级信息
-        from app.models.class_model import Class
-        class_obj = db.query(Class).filter(Class.id == assignment.class_id).first()
-        class_id = class_obj.id if class_obj else 0
-        class_name = class_obj.name if class_obj else "未知班级"
-        
-        # 解析 file_json 字符串为字典
+        # 只加载请求的部分
+        sections = set(params.include)
         file_json_data = None
-        if submission.file_json:
-            try:
-                file_json_data = json.loads(submission.file_json)
-            except json.JSONDecodeError:
-                file_json_data = None
+        if submission.paragraph_count is not None and sections - {SubmissionDetailSection.REPORT}:
+            file_json_data = {}
+            if SubmissionDetailSection.METADATA in sections:
+                file_json_data["total_words_count"] = submission.total_words_count
+                file_json_data["paragraph_count"] = submission.paragraph_count
+            if SubmissionDetailSection.PARAGRAPHS in sections:
+                file_json_data["paragraphs"] = load_paragraphs(db, submission.id, params.offset, params.limit)
+            if SubmissionDetailSection.OUTLINE in sections:
+                outline = load_outline(db, submission.id)
+                file_json_data["outline"] = outline
+                file_json_data["outline_tree"] = build_outline_tree(outline)
         
         # 构建响应
         return SubmissionDetailResponse(
             id=submission.id,
-            student_name=student_name,
-            assignment_title=assignment.title,
-            class_id=class_id,
-            class_name=class_name,
+            student_name=row.student_name or "未知学生",
+            assignment_title=row.assignment_title,
+            class_id=row.class_id,
+            class_name=row.class_name or "未知班级",
             file_json=file_json_data,
-            report=submission.report,
+            parse_status=submission.parse_status,
+            report=submission.report if SubmissionDetailSection.REPORT in sections else None,
             score=submission.score,
             submitted_at=submission.submitted_at,
             graded_at=submission.graded_at,
@@ -262,12 +361,58 @@ class SubmissionService:
         )
 
     @staticmethod
-    def grade_submission(db: Session, submission_id: int, grade_data: SubmissionGrade, current_user: User) -> SubmissionDetailResponse:
+    def get_parse_status(db: Session, submission_id: int, current_user: User) -> SubmissionParseStatusResponse:
+        """查询提交文件的解析状态"""
+        # 查找提交
+        submission = db.query(
+            Submission.id, Submission.student_id, Submission.assignment_id, Submission.parse_status
+        ).filter(Submission.id == submission_id).first()
+        if not submission:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="提交不存在"
+            )
+        
+        # 验证权限：学生只能查看自己的提交，教师可以查看班级内的所有提交
+        if current_user.role == "student":
+            if submission.student_id != current_user.id:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="您只能查看自己的提交"
+                )
+        elif current_user.role == "teacher":
+            assignment = db.query(Assignment).filter(Assignment.id == submission.assignment_id).first()
+            if not assignment:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="任务不存在"
+                )
+            verify_class_member_access(db, assignment.class_id, current_user)
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="无效的用户角色"
+            )
+        
+        # 最近一次解析任务
+        parse_job = db.query(ParseJob.error, ParseJob.updated_at).filter(
+            ParseJob.submission_id == submission_id
+        ).order_by(ParseJob.id.desc()).first()
+        
+        return SubmissionParseStatusResponse(
+            submission_id=submission.id,
+            parse_status=submission.parse_status,
+            error=parse_job.error if parse_job and submission.parse_status == ParseStatus.FAILED else None,
+            updated_at=parse_job.updated_at if parse_job else None
+        )
+
+    @staticmethod
+    def grade_submission(db: Session, submission_id: int, grade_data: SubmissionGrade, current_user: User) -> SubmissionGradeResponse:
         """教师批改提交"""
         # 验证教师权限
         verify_teacher_permission(current_user)
-        # 查找提交
-        submission = db.query(Submission).filter(Submission.id == submission_id).first()
+        # 查找提交（锁定该行直到事务结束，并发批改同一提交时依次读取旧分数，统计不会重复计入）
+        submission = db.query(Submission).filter(Submission.id == submission_id).with_for_update().first()
         if not submission:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -285,14 +430,30 @@ class SubmissionService:
         # 验证教师对班级的访问权限
         verify_class_member_access(db, assignment.class_id, current_user)
         
-        # 更新提交的分数和报告
-        submission.score = grade_data.score
-        submission.report = grade_data.report
-        submission.graded_at = func.now()
-        
+        # 更新提交的分数和报告：只在分数仍是读到的旧分数时更新（SQLite 不支持行锁，
+        # 读取后被其他请求改过分数时不会更新任何行）
+        old_score = submission.score
         try:
+            updated = db.query(Submission).filter(
+                Submission.id == submission.id,
+                Submission.score.is_not_distinct_from(old_score)
+            ).update({
+                Submission.score: grade_data.score,
+                Submission.report: grade_data.report,
+                Submission.graded_at: func.now()
+            }, synchronize_session=False)
+            if not updated:
+                db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="该提交正在被其他请求批改，请刷新后重试"
+                )
+            # 在同一事务中增量更新任务统计
+            record_score_change(db, assignment.id, old_score, grade_data.score)
             db.commit()
             db.refresh(submission)
+        except HTTPException:
+            raise
         except Exception as e:
             db.rollback()
             raise HTTPException(
@@ -300,37 +461,71 @@ class SubmissionService:
                 detail=f"批改提交失败: {str(e)}"
             )
         
-        # 获取学生信息
-        student = db.query(User).filter(User.id == submission.student_id).first()
-        student_name = student.name if student else "未知学生"
-        
-        class_obj = db.query(Class).filter(Class.id == assignment.class_id).first()
-        class_id = class_obj.id if class_obj else 0
-        class_name = class_obj.name if class_obj else "未知班级"
-        
-        # 解析 file_json 字符串为字典
-        file_json_data = None
-        if submission.file_json:
-            try:
-                file_json_data = json.loads(submission.file_json)
-            except json.JSONDecodeError:
-                file_json_data = None
-        
-        # 构建响应
-        return SubmissionDetailResponse(
+        # 只返回批改信息，不重新加载文档内容
+        return SubmissionGradeResponse(
             id=submission.id,
-            student_name=student_name,
-            assignment_title=assignment.title,
-            class_id=class_id,
-            class_name=class_name,
-            file_json=file_json_data,
-            report=submission.report,
             score=submission.score,
-            submitted_at=submission.submitted_at,
+            report=submission.report,
             graded_at=submission.graded_at,
             is_graded=submission.is_graded
         )
 
+    @staticmethod
+    def batch_grade_submissions(db: Session, grade_data: SubmissionBatchGrade, current_user: User) -> SubmissionBatchGradeResponse:
+        """教师批量批改提交：一次查询校验全部提交的权限，在一个事务中批量更新"""
+        # 验证教师权限
+        verify_teacher_permission(current_user)
+        
+        # 一次查询所有提交所属的任务和班级，权限使用同一份成员关系判断
+        submission_ids = [item.submission_id for item in grade_data.items]
+        rows = db.query(Submission.id, Submission.assignment_id, Assignment.class_id).join(
+            Assignment, Assignment.id == Submission.assignment_id
+        ).filter(Submission.id.in_(submission_ids)).all()
+        submissions = {row.id: row for row in rows}
+        memberships = get_memberships(db, current_user)
+        
+        results = []
+        updates = []
+        for item in grade_data.items:
+            row = submissions.get(item.submission_id)
+            if row is None:
+                item_status = BatchGradeStatus.NOT_FOUND
+            elif row.class_id not in memberships:
+                item_status = BatchGradeStatus.FORBIDDEN
+            else:
+                item_status = BatchGradeStatus.GRADED
+                updates.append({"b_id": item.submission_id, "b_score": item.score, "b_report": item.report})
+            results.append(SubmissionBatchGradeItemResult(submission_id=item.submission_id, status=item_status))
+        
+        if updates:
+            table = Submission.__table__
+            statement = update(table).where(table.c.id == bindparam("b_id")).values(
+                score=bindparam("b_score"),
+                report=bindparam("b_report"),
+                graded_at=func.now()
+            )
+            try:
+                # 与 grade_submission 相同，先按ID顺序锁定要批改的提交直到事务结束，并发批改同一提交时依次执行
+                db.query(Submission.id).filter(
+                    Submission.id.in_([entry["b_id"] for entry in updates])
+                ).order_by(Submission.id).with_for_update().all()
+                # 一条 UPDATE 语句批量执行（executemany），统计按涉及的任务重新计算
+                db.execute(statement, updates)
+                rebuild_assignment_stats(db, {submissions[entry["b_id"]].assignment_id for entry in updates})
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"批量批改失败: {str(e)}"
+                )
+        
+        return SubmissionBatchGradeResponse(
+            graded=len(updates),
+            failed=len(results) - len(updates),
+            items=results
+        )
+
     @staticmethod
     def get_assignment_statistics(db: Session, assignment_id: int, current_user: User) -> SubmissionStatistics:
         """获取任务提交统计"""
@@ -348,41 +543,19 @@ class SubmissionService:
         # 验证教师对班级的访问权限
         verify_class_member_access(db, assignment.class_id, current_user)
         
-        # 获取统计信息
-        total_submissions = db.query(Submission).filter(Submission.assignment_id == assignment_id).count()
-        graded_submissions = db.query(Submission).filter(
-            Submission.assignment_id == assignment_id,
-            Submission.score.isnot(None)
-        ).count()
-        ungraded_submissions = total_submissions - graded_submissions
-        
-        # 计算分数统计
-        score_stats = db.query(
-            func.avg(Submission.score).label('avg_score'),
-            func.max(Submission.score).label('max_score'),
-            func.min(Submission.score).label('min_score')
-        ).filter(
-            Submission.assignment_id == assignment_id,
-            Submission.score.isnot(None)
-        ).first()
-        
-        return SubmissionStatistics(
-            total_submissions=total_submissions,
-            graded_submissions=graded_submissions,
-            ungraded_submissions=ungraded_submissions,
-            average_score=float(score_stats.avg_score) if score_stats.avg_score else None,
-            highest_score=float(score_stats.max_score) if score_stats.max_score else None,
-            lowest_score=float(score_stats.min_score) if score_stats.min_score else None
-        )
+        # 统计信息随提交和批改增量维护，这里只按主键读取汇总
+        return load_assignment_statistics(db, assignment_id)
 
     @staticmethod
-    def download_original_file(db: Session, submission_id: int, current_user: User) -> Response:
-        """教师下载学生提交的原始文件"""
+    def download_original_file(db: Session, submission_id: int, current_user: User, request: Request) -> Response:
+        """教师下载学生提交的原始文件（支持ETag条件请求和Range断点续传）"""
         # 验证教师权限
         verify_teacher_permission(current_user)
         
-        # 查找提交
-        submission = db.query(Submission).filter(Submission.id == submission_id).first()
+        # 查找提交（只查询下载需要的字段）
+        submission = db.query(
+            Submission.id, Submission.assignment_id, Submission.file_hash, Submission.file_name
+        ).filter(Submission.id == submission_id).first()
         if not submission:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -400,67 +573,179 @@ class SubmissionService:
         # 验证教师对班级的访问权限
         verify_class_member_access(db, assignment.class_id, current_user)
         
-        if not submission.original_file:
+        blob_store = get_blob_store()
+        if not submission.file_hash or not blob_store.exists(submission.file_hash):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="原始文件不存在"
             )
         
-        # 返回文件下载响应
-        return Response(
-            content=submission.original_file,
-            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            headers={
-                "Content-Disposition": f"attachment; filename={submission.file_name or 'submission.docx'}"
-            }
+        # 从文件存储中流式返回文件
+        return build_blob_response(
+            request,
+            blob_store,
+            submission.file_hash,
+            submission.file_name or "submission.docx",
+            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
         )
 
+
+    @staticmethod
+    def export_assignment_grades(db: Session, assignment_id: int, current_user: User, export_format: ExportFormat) -> Response:
+        """教师导出任务成绩表：班级的每个学生一行（未提交的学生只有用户名），边查询边输出"""
+        # 验证教师权限
+        verify_teacher_permission(current_user)
+        
+        assignment = db.query(Assignment.id, Assignment.title, Assignment.class_id).filter(
+            Assignment.id == assignment_id
+        ).first()
+        if not assignment:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="任务不存在"
+            )
+        
+        # 验证教师对班级的访问权限
+        verify_class_member_access(db, assignment.class_id, current_user)
+        
+        # 班级学生左连接该任务的提交；使用服务端游标分批读取，不会一次加载全部行
+        query = db.query(
+            User.name, Submission.submitted_at, Submission.file_name, Submission.parse_status,
+            Submission.total_words_count, Submission.score, Submission.graded_at, Submission.report
+        ).select_from(StudentClass).join(
+            User, User.id == StudentClass.student_id
+        ).outerjoin(
+            Submission, and_(Submission.student_id == StudentClass.student_id, Submission.assignment_id == assignment_id)
+        ).filter(
+            StudentClass.class_id == assignment.class_id
+        ).order_by(User.name, User.id)
+        
+        def rows():
+            for name, submitted_at, file_name, parse_status, words, score, graded_at, report in stream_query(query):
+                yield [name, submitted_at, file_name, PARSE_STATUS_LABELS.get(parse_status), words, score, graded_at, report]
+        
+        return export_table_response(
+            export_format,
+            file_stem=f"{assignment.title}_成绩",
+            title=assignment.title,
+            header=["学生用户名", "提交时间", "文件名", "解析状态", "字数", "分数", "批改时间", "批改报告"],
+            rows=rows()
+        )
+
+    @staticmethod
+    def export_class_grades(db: Session, class_id: int, current_user: User, export_format: ExportFormat) -> Response:
+        """教师导出班级成绩册：每个学生一行，每个任务一列分数（按任务创建时间排列）"""
+        # 验证教师权限
+        verify_teacher_permission(current_user)
+        
+        # 验证教师对班级的访问权限（班级不存在时返回404）
+        verify_class_member_access(db, class_id, current_user)
+        class_name = db.query(Class.name).filter(Class.id == class_id).scalar()
+        
+        assignments = db.query(Assignment.id, Assignment.title).filter(
+            Assignment.class_id == class_id
+        ).order_by(Assignment.created_at, Assignment.id).all()
+        columns = {assignment.id: index for index, assignment in enumerate(assignments)}
+        
+        # 班级学生左连接本班任务的提交，按学生排序后相邻的行属于同一学生
+        query = db.query(
+            User.id, User.name, Submission.assignment_id, Submission.score
+        ).select_from(StudentClass).join(
+            User, User.id == StudentClass.student_id
+        ).outerjoin(
+            Submission, and_(
+                Submission.student_id == StudentClass.student_id,
+                Submission.assignment_id.in_(select(Assignment.id).where(Assignment.class_id == class_id))
+            )
+        ).filter(
+            StudentClass.class_id == class_id
+        ).order_by(User.name, User.id)
+        
+        def rows():
+            for (_, name), student_rows in groupby(stream_query(query), key=lambda row: (row.id, row.name)):
+                scores = [None] * len(assignments)
+                submitted = 0
+                for row in student_rows:
+                    if row.assignment_id is None:
+                        continue
+                    submitted += 1
+                    scores[columns[row.assignment_id]] = row.score
+                graded = [score for score in scores if score is not None]
+                average = round(sum(graded) / len(graded), 2) if graded else None
+                yield [name, *scores, submitted, len(graded), average]
+        
+        return export_table_response(
+            export_format,
+            file_stem=f"{class_name}_成绩册",
+            title=class_name,
+            header=["学生用户名", *[assignment.title for assignment in assignments], "已提交", "已批改", "平均分"],
+            rows=rows()
+        )
+
+    @staticmethod
+    def export_assignment_files(db: Session, assignment_id: int, current_user: User) -> Response:
+        """教师打包下载任务的全部原始文件：边读取边生成 zip，不在内存或磁盘中暂存压缩包
+
+        压缩包内的路径为 学生用户名/原始文件名，与批量导入的格式一致，可以直接重新导入。
+        """
+        # 验证教师权限
+        verify_teacher_permission(current_user)
+        
+        assignment = db.query(Assignment.id, Assignment.title, Assignment.class_id).filter(
+            Assignment.id == assignment_id
+        ).first()
+        if not assignment:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="任务不存在"
+            )
+        
+        # 验证教师对班级的访问权限
+        verify_class_member_access(db, assignment.class_id, current_user)
+        
+        query = db.query(
+            User.name, Submission.file_name, Submission.file_hash, Submission.file_size
+        ).join(
+            User, User.id == Submission.student_id
+        ).filter(
+            Submission.assignment_id == assignment_id,
+            Submission.file_hash.isnot(None)
+        ).order_by(User.name, User.id)
+        blob_store = get_blob_store()
+        
+        def entries():
+            for name, file_name, file_hash, file_size in stream_query(query):
+                # 文件存储中缺失的文件跳过（响应已经开始，无法再返回错误）
+                if not blob_store.exists(file_hash):
+                    continue
+                path = f"{_export_path_part(name)}/{_export_path_part(file_name or 'submission.docx')}"
+                yield path, file_hash, file_size or blob_store.size(file_hash)
+        
+        return export_zip_response(blob_store, f"{assignment.title}_原始文件.zip", entries())
     
     @staticmethod
-    def get_my_submissions_by_class(db: Session, class_id: int, current_user: User) -> List[StudentSubmissionResponse]:
+    def get_my_submissions_by_class(db: Session, class_id: int, current_user: User, page: PageParams, response: Response) -> List[StudentSubmissionResponse]:
         """学生查看指定班级的提交列表"""
         verify_student_permission(current_user)
         
         # 验证学生是否在该班级中
-        student_class = db.query(StudentClass).filter(
-            StudentClass.student_id == current_user.id,
-            StudentClass.class_id == class_id
-        ).first()
-        if not student_class:
+        if get_class_role(db, class_id, current_user) != ClassMemberRole.STUDENT:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="您不是该班级的学生"
             )
         
         # 获取该班级的提交
-        submissions = db.query(Submission).join(Assignment).filter(
+        query = submission_list_query(db).filter(
             Submission.student_id == current_user.id,
             Assignment.class_id == class_id
-        ).order_by(Submission.submitted_at.desc()).all()
+        )
+        rows = keyset_paginate(db, query, Submission.submitted_at, Submission.id, page, response)
         
-        result = []
-        for submission in submissions:
-            assignment = db.query(Assignment).filter(Assignment.id == submission.assignment_id).first()
-            assignment_title = assignment.title if assignment else "未知任务"
-            
-            class_obj = db.query(Class).filter(Class.id == class_id).first()
-            class_name = class_obj.name if class_obj else "未知班级"
-            
-            result.append(StudentSubmissionResponse(
-                id=submission.id,
-                assignment_title=assignment_title,
-                assignment_id=submission.assignment_id,
-                class_id=class_id,
-                class_name=class_name,
-                score=submission.score,
-                submitted_at=submission.submitted_at,
-                is_graded=submission.is_graded
-            ))
-        
-        return result
+        return [to_student_submission_response(row) for row in rows]
 
     @staticmethod
-    def get_my_submissions_by_assignment(db: Session, assignment_id: int, current_user: User) -> List[StudentSubmissionResponse]:
+    def get_my_submissions_by_assignment(db: Session, assignment_id: int, current_user: User, page: PageParams, response: Response) -> List[StudentSubmissionResponse]:
         """学生查看指定任务的提交列表"""
         verify_student_permission(current_user)
         
@@ -476,77 +761,60 @@ class SubmissionService:
         verify_class_member_access(db, assignment.class_id, current_user)
         
         # 获取该任务的提交
-        submissions = db.query(Submission).filter(
+        query = submission_list_query(db).filter(
             Submission.student_id == current_user.id,
             Submission.assignment_id == assignment_id
-        ).order_by(Submission.submitted_at.desc()).all()
+        )
+        rows = keyset_paginate(db, query, Submission.submitted_at, Submission.id, page, response)
         
-        result = []
-        for submission in submissions:
-            class_obj = db.query(Class).filter(Class.id == assignment.class_id).first()
-            class_name = class_obj.name if class_obj else "未知班级"
-            
-            result.append(StudentSubmissionResponse(
-                id=submission.id,
-                assignment_title=assignment.title,
-                assignment_id=submission.assignment_id,
-                class_id=assignment.class_id,
-                class_name=class_name,
-                score=submission.score,
-                submitted_at=submission.submitted_at,
-                is_graded=submission.is_graded
-            ))
-        
-        return result
+        return [to_student_submission_response(row) for row in rows]
 
     @staticmethod
-    def get_pending_assignments(db: Session, current_user: User) -> List[PendingAssignmentResponse]:
-        """学生查看未提交的任务列表"""
+    def get_pending_assignments(db: Session, current_user: User, page: PageParams, response: Response) -> List[PendingAssignmentResponse]:
+        """学生查看未提交的任务列表（支持分页）"""
         verify_student_permission(current_user)
         
-        # 获取学生加入的所有班级
-        student_classes = db.query(StudentClass).filter(StudentClass.student_id == current_user.id).all()
-        class_ids = [sc.class_id for sc in student_classes]
-        
-        if not class_ids:
-            return []
-        
-        # 获取这些班级的所有任务
-        all_assignments = db.query(Assignment).filter(Assignment.class_id.in_(class_ids)).all()
-        
-        # 获取学生已提交的任务ID
-        submitted_assignment_ids = db.query(Submission.assignment_id).filter(
+        # 学生所在班级中尚未提交的任务（NOT EXISTS 反连接，班级和教师名称一并联合查询）
+        submitted = exists().where(
+            Submission.assignment_id == Assignment.id,
             Submission.student_id == current_user.id
-        ).all()
-        submitted_ids = [sa[0] for sa in submitted_assignment_ids]
-        
-        # 筛选未提交的任务
-        pending_assignments = [a for a in all_assignments if a.id not in submitted_ids]
-        
-        result = []
-        for assignment in pending_assignments:
-            class_obj = db.query(Class).filter(Class.id == assignment.class_id).first()
-            class_name = class_obj.name if class_obj else "未知班级"
-            
-            # 获取教师信息
-            teacher = db.query(User).filter(User.id == assignment.teacher_id).first()
-            teacher_name = teacher.name if teacher else "未知教师"
-            
-            result.append(PendingAssignmentResponse(
-                id=assignment.id,
-                title=assignment.title,
-                description=assignment.description,
-                class_id=assignment.class_id,
-                class_name=class_name,
-                teacher_name=teacher_name,
-                created_at=assignment.created_at,
+        )
+        query = db.query(
+            Assignment.id,
+            Assignment.title,
+            Assignment.description,
+            Assignment.class_id,
+            Class.name.label("class_name"),
+            User.name.label("teacher_name"),
+            Assignment.created_at
+        ).join(
+            StudentClass,
+            (StudentClass.class_id == Assignment.class_id) & (StudentClass.student_id == current_user.id)
+        ).outerjoin(
+            Class, Class.id == Assignment.class_id
+        ).outerjoin(
+            User, User.id == Assignment.teacher_id
+        ).filter(
+            ~submitted
+        )
+        rows = keyset_paginate(db, query, Assignment.created_at, Assignment.id, page, response)
+        
+        return [
+            PendingAssignmentResponse(
+                id=row.id,
+                title=row.title,
+                description=row.description,
+                class_id=row.class_id,
+                class_name=row.class_name or "未知班级",
+                teacher_name=row.teacher_name or "未知教师",
+                created_at=row.created_at,
                 deadline=None  # 目前模型中没有截止时间字段
-            ))
-        
-        return result
+            )
+            for row in rows
+        ]
     
     @staticmethod
-    def get_class_submissions(db: Session, class_id: int, current_user: User) -> List[TeacherSubmissionResponse]:
+    def get_class_submissions(db: Session, class_id: int, current_user: User, filters: SubmissionListFilter, response: Response) -> List[TeacherSubmissionResponse]:
         """教师查看指定班级的所有提交"""
         verify_teacher_permission(current_user)
         
@@ -554,71 +822,30 @@ class SubmissionService:
         verify_class_member_access(db, class_id, current_user)
         
         # 获取该班级的所有提交
-        submissions = db.query(Submission).join(Assignment).filter(
+        query = apply_submission_filters(submission_list_query(db), filters).filter(
             Assignment.class_id == class_id
-        ).order_by(Submission.submitted_at.desc()).all()
+        )
+        rows = keyset_paginate(db, query, Submission.submitted_at, Submission.id, filters, response)
         
-        result = []
-        for submission in submissions:
-            assignment = db.query(Assignment).filter(Assignment.id == submission.assignment_id).first()
-            student = db.query(User).filter(User.id == submission.student_id).first()
-            class_obj = db.query(Class).filter(Class.id == class_id).first()
-            
-            result.append(TeacherSubmissionResponse(
-                id=submission.id,
-                student_id=submission.student_id,
-                student_name=student.name if student else "未知学生",
-                assignment_title=assignment.title if assignment else "未知任务",
-                assignment_id=submission.assignment_id,
-                class_id=class_id,
-                class_name=class_obj.name if class_obj else "未知班级",
-                score=submission.score,
-                submitted_at=submission.submitted_at,
-                is_graded=submission.is_graded
-            ))
-        
-        return result
+        return [to_teacher_submission_response(row) for row in rows]
 
     @staticmethod
-    def get_student_submissions(db: Session, student_id: int, current_user: User) -> List[TeacherSubmissionResponse]:
+    def get_student_submissions(db: Session, student_id: int, current_user: User, filters: SubmissionListFilter, response: Response) -> List[TeacherSubmissionResponse]:
         """教师查看指定学生的所有提交"""
         verify_teacher_permission(current_user)
         
-        # 获取学生的所有提交
-        submissions = db.query(Submission).filter(Submission.student_id == student_id).all()
+        # 教师可访问的班级：自己创建的班级和作为助教加入的班级（跳过没有权限的提交）
+        accessible_class_ids = list(get_memberships(db, current_user))
+        query = apply_submission_filters(submission_list_query(db), filters).filter(
+            Submission.student_id == student_id,
+            Assignment.class_id.in_(accessible_class_ids)
+        )
+        rows = keyset_paginate(db, query, Submission.submitted_at, Submission.id, filters, response)
         
-        result = []
-        for submission in submissions:
-            assignment = db.query(Assignment).filter(Assignment.id == submission.assignment_id).first()
-            if not assignment:
-                continue
-                
-            # 验证教师对班级的访问权限
-            try:
-                verify_class_member_access(db, assignment.class_id, current_user)
-            except HTTPException:
-                continue  # 跳过没有权限的提交
-            
-            student = db.query(User).filter(User.id == submission.student_id).first()
-            class_obj = db.query(Class).filter(Class.id == assignment.class_id).first()
-            
-            result.append(TeacherSubmissionResponse(
-                id=submission.id,
-                student_id=submission.student_id,
-                student_name=student.name if student else "未知学生",
-                assignment_title=assignment.title,
-                assignment_id=submission.assignment_id,
-                class_id=assignment.class_id,
-                class_name=class_obj.name if class_obj else "未知班级",
-                score=submission.score,
-                submitted_at=submission.submitted_at,
-                is_graded=submission.is_graded
-            ))
-        
-        return result
+        return [to_teacher_submission_response(row) for row in rows]
 
     @staticmethod
-    def get_ungraded_submissions(db: Session, assignment_id: int, current_user: User) -> List[TeacherSubmissionResponse]:
+    def get_ungraded_submissions(db: Session, assignment_id: int, current_user: User, filters: SubmissionListFilter, response: Response) -> List[TeacherSubmissionResponse]:
         """教师查看未批改的提交"""
         verify_teacher_permission(current_user)
         
@@ -634,28 +861,11 @@ class SubmissionService:
         verify_class_member_access(db, assignment.class_id, current_user)
         
         # 获取未批改的提交
-        submissions = db.query(Submission).filter(
+        query = apply_submission_filters(submission_list_query(db), filters).filter(
             Submission.assignment_id == assignment_id,
             Submission.score.is_(None)
-        ).order_by(Submission.submitted_at.desc()).all()
+        )
+        rows = keyset_paginate(db, query, Submission.submitted_at, Submission.id, filters, response)
         
-        result = []
-        for submission in submissions:
-            student = db.query(User).filter(User.id == submission.student_id).first()
-            class_obj = db.query(Class).filter(Class.id == assignment.class_id).first()
-            
-            result.append(TeacherSubmissionResponse(
-                id=submission.id,
-                student_id=submission.student_id,
-                student_name=student.name if student else "未知学生",
-                assignment_title=assignment.title,
-                assignment_id=submission.assignment_id,
-                class_id=assignment.class_id,
-                class_name=class_obj.name if class_obj else "未知班级",
-                score=submission.score,
-                submitted_at=submission.submitted_at,
-                is_graded=submission.is_graded
-            ))
-        
-        return result
+        return [to_teacher_submission_response(row) for row in rows]
 
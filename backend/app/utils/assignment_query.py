@@ -0,0 +1,39 @@
+from sqlalchemy.orm import Session, Query
+from app.models.user import User
+from app.models.class_model import Class
+from app.models.assignment import Assignment
+from app.schemas.assignment_schema import AssignmentResponse
+
+
+def assignment_list_query(db: Session) -> Query:
+    """构建任务列表的联合查询（班级名称和教师名称一次查出）"""
+    return db.query(
+        Assignment.id,
+        Assignment.title,
+        Assignment.description,
+        Assignment.class_id,
+        Class.name.label("class_name"),
+        Assignment.teacher_id,
+        User.name.label("teacher_name"),
+        Assignment.created_at,
+        Assignment.updated_at
+    ).outerjoin(
+        Class, Class.id == Assignment.class_id
+    ).outerjoin(
+        User, User.id == Assignment.teacher_id
+    )
+
+
+def to_assignment_response(row) -> AssignmentResponse:
+    """将查询行转换为任务响应"""
+    return AssignmentResponse(
+        id=row.id,
+        title=row.title,
+        description=row.description,
+        class_id=row.class_id,
+        class_name=row.class_name or "未知班级",
+        teacher_id=row.teacher_id,
+        teacher_name=row.teacher_name or "未知教师",
+        created_at=row.created_at,
+        updated_at=row.updated_at
+    )
@@ -1,3 +1,7 @@
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from jose import JWTError, jwt
@@ -5,8 +9,14 @@ from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from app.core.config import settings
 
-# 密码加密上下文
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 密码加密上下文（成本因子不等于 BCRYPT_ROUNDS 的旧哈希会在登录时自动重新计算）
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -19,6 +29,96 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """判断密码哈希是否需要按当前成本因子重新计算"""
+    return pwd_context.needs_update(hashed_password)
+
+
+class PasswordHasher:
+    """密码哈希执行器：bcrypt 计算在独立的有界线程池中执行，排队过多时直接拒绝（503）
+
+    调用方（同步接口的线程）会阻塞等待结果，因此同时进入的请求数还受 max_blocked 限制，
+    登录高峰时只占用一小部分接口线程，其他接口不受影响。
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, max_blocked: int):
+        # 同时允许的请求数 = 正在计算的 + 排队等待的，且不超过允许阻塞的接口线程数
+        self.max_slots = max(min(max_workers + max_queue, max_blocked), 1)
+        self.max_workers = min(max_workers, self.max_slots)
+        self.max_queue = self.max_slots - self.max_workers
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hasher")
+        self._slots = threading.BoundedSemaphore(self.max_slots)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        # 单次计算耗时的滑动平均（秒），用于估算 Retry-After
+        self._avg_seconds = 0.25
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """验证密码"""
+        return self._run(verify_password, plain_password, hashed_password)
+
+    def hash(self, password: str) -> str:
+        """生成密码哈希"""
+        return self._run(get_password_hash, password)
+
+    def metrics(self) -> dict:
+        """执行器运行指标"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queue_depth": self._in_flight - self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_ms": round(self._avg_seconds * 1000, 1)
+            }
+
+    def _run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+                # 按当前排队长度和平均耗时估算需要等待的秒数
+                retry_after = math.ceil(self._in_flight / self.max_workers * self._avg_seconds)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="当前登录人数过多，请稍后重试",
+                headers={"Retry-After": str(max(retry_after, 1))}
+            )
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return self._executor.submit(self._timed, func, *args).result()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    def _timed(self, func, *args):
+        with self._lock:
+            self._running += 1
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._avg_seconds = self._avg_seconds * 0.9 + elapsed * 0.1
+
+
+# 全局密码哈希执行器
+password_hasher = PasswordHasher(
+    max_workers=settings.HASH_WORKERS,
+    max_queue=settings.HASH_QUEUE_LIMIT,
+    max_blocked=settings.HASH_MAX_BLOCKED_THREADS
+)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """创建访问令牌"""
     to_encode = data.copy()
@@ -0,0 +1,132 @@
+import hashlib
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from io import BytesIO
+from typing import BinaryIO, Iterator, Tuple
+from app.core.config import settings
+
+# 流式读写的块大小
+CHUNK_SIZE = 64 * 1024
+
+
+class BlobStore(ABC):
+    """按内容（SHA-256）寻址的文件存储接口"""
+
+    @abstractmethod
+    def put(self, fileobj: BinaryIO) -> Tuple[str, int]:
+        """流式写入文件，返回 (sha256, 字节数)；内容相同的文件只保存一份"""
+
+    @abstractmethod
+    def open(self, digest: str) -> BinaryIO:
+        """以二进制只读方式打开文件"""
+
+    @abstractmethod
+    def exists(self, digest: str) -> bool:
+        """判断文件是否存在"""
+
+    @abstractmethod
+    def size(self, digest: str) -> int:
+        """获取文件大小（字节）"""
+
+    @abstractmethod
+    def delete(self, digest: str) -> None:
+        """删除文件（不存在时忽略）"""
+
+    def put_bytes(self, data: bytes) -> Tuple[str, int]:
+        """写入内存中的字节数据"""
+        return self.put(BytesIO(data))
+
+    def iter_chunks(self, digest: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """分块读取文件内容"""
+        with self.open(digest) as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def iter_range(self, digest: str, start: int, end: int, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """分块读取文件中 [start, end] 闭区间的内容"""
+        with self.open(digest) as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = f.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+
+class LocalBlobStore(BlobStore):
+    """本地文件系统存储：<root>/ab/cd/abcd... """
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.tmp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+    def _path(self, digest: str) -> str:
+        if len(digest) != 64 or any(c not in "0123456789abcdef" for c in digest):
+            raise ValueError(f"无效的文件摘要: {digest}")
+        return os.path.join(self.root, digest[:2], digest[2:4], digest)
+
+    def put(self, fileobj: BinaryIO) -> Tuple[str, int]:
+        hasher = hashlib.sha256()
+        size = 0
+        # 先写入临时文件并同时计算摘要，完成后原子地移动到目标位置
+        fd, tmp_path = tempfile.mkstemp(dir=self.tmp_dir)
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                while True:
+                    chunk = fileobj.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    hasher.update(chunk)
+                    size += len(chunk)
+                    tmp.write(chunk)
+            digest = hasher.hexdigest()
+            target = self._path(digest)
+            if os.path.exists(target):
+                # 相同内容已存在，直接去重
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(tmp_path, target)
+            return digest, size
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def open(self, digest: str) -> BinaryIO:
+        return open(self._path(digest), "rb")
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self._path(digest))
+
+    def size(self, digest: str) -> int:
+        return os.path.getsize(self._path(digest))
+
+    def delete(self, digest: str) -> None:
+        try:
+            os.remove(self._path(digest))
+        except FileNotFoundError:
+            pass
+
+
+# 可用的存储后端
+BLOB_STORE_BACKENDS = {
+    "local": LocalBlobStore,
+}
+
+
+@lru_cache()
+def get_blob_store() -> BlobStore:
+    """根据配置获取全局文件存储实例"""
+    backend = BLOB_STORE_BACKENDS.get(settings.BLOB_STORE_BACKEND)
+    if backend is None:
+        raise ValueError(f"不支持的文件存储后端: {settings.BLOB_STORE_BACKEND}")
+    return backend(settings.BLOB_STORAGE_DIR)
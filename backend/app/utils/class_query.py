@@ -0,0 +1,144 @@
+import weakref
+from typing import Tuple
+from sqlalchemy import Float, and_, case, func, literal_column, or_, select, type_coerce, union
+from sqlalchemy.orm import Session, Query
+from app.models.user import User
+from app.models.class_model import Class
+from app.models.student_class import StudentClass
+from app.models.assignment import Assignment
+from app.models.submission import Submission
+from app.models.class_search import class_search_table, has_trigram_index, TRIGRAM_MIN_LENGTH
+from app.schemas.class_schema import ClassResponse
+
+# 各数据库引擎是否安装了 pg_trgm（首次搜索时查询一次；安装扩展后需要重启服务）
+_trigram_support = weakref.WeakKeyDictionary()
+
+
+def class_list_query(db: Session) -> Query:
+    """构建班级列表的联合查询：班级、主教师姓名和学生数量一次查出
+
+    学生数量是关联子查询，只对返回的行（分页后）按 student_classes 的 (class_id, student_id) 索引计数，
+    列表的查询次数与班级数量无关。
+    """
+    student_count = select(func.count()).select_from(StudentClass).where(
+        StudentClass.class_id == Class.id
+    ).correlate(Class).scalar_subquery()
+    return db.query(
+        Class.id,
+        Class.name,
+        Class.class_code,
+        Class.description,
+        Class.teacher_id,
+        User.name.label("teacher_name"),
+        Class.created_at,
+        Class.updated_at,
+        student_count.label("student_count")
+    ).select_from(Class).outerjoin(
+        User, User.id == Class.teacher_id
+    )
+
+
+def class_search_query(db: Session, search_term: str) -> Tuple[Query, object]:
+    """构建班级搜索查询（在班级名称、描述和主教师姓名中查找子串），返回 (查询, 相关度表达式)
+
+    SQLite 使用 FTS5 全文索引并按 bm25 排序；PostgreSQL 使用 pg_trgm 索引并按词相似度排序。
+    关键词短于 3 个字符、或 PostgreSQL 没有安装 pg_trgm 时，只能逐行匹配，按匹配的位置排序。
+    """
+    query = class_list_query(db)
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "sqlite":
+        fts = class_search_table
+        query = query.join(fts, fts.c.rowid == Class.id)
+        if len(search_term) >= TRIGRAM_MIN_LENGTH:
+            # 整个关键词作为一个短语匹配（与原来的 LIKE '%关键词%' 语义一致）
+            phrase = '"' + search_term.replace('"', '""') + '"'
+            query = query.filter(literal_column(fts.name).op("MATCH")(phrase))
+            # bm25 越小越相关；名称、教师姓名的权重高于描述
+            rank = -func.bm25(literal_column(fts.name), 10.0, 1.0, 5.0)
+            return query, type_coerce(rank, Float)
+        return _substring_search(query, search_term, fts.c.name, fts.c.description, fts.c.teacher_name)
+
+    if dialect == "postgresql" and _has_trigram_index(db):
+        # 三个条件分别使用各自的三元组索引，再合并班级ID
+        matched = union(
+            select(Class.id).where(Class.name.icontains(search_term, autoescape=True)),
+            select(Class.id).where(Class.description.icontains(search_term, autoescape=True)),
+            select(Class.id).join(User, User.id == Class.teacher_id).where(User.name.icontains(search_term, autoescape=True)),
+        )
+        query = query.filter(Class.id.in_(matched))
+        rank = (
+            3 * func.word_similarity(search_term, Class.name)
+            + 2 * func.word_similarity(search_term, func.coalesce(User.name, ""))
+            + func.word_similarity(search_term, func.coalesce(Class.description, ""))
+        )
+        return query, type_coerce(rank, Float)
+
+    return _substring_search(query, search_term, Class.name, Class.description, User.name)
+
+
+def _has_trigram_index(db: Session) -> bool:
+    engine = db.get_bind()
+    if engine not in _trigram_support:
+        _trigram_support[engine] = has_trigram_index(db.connection())
+    return _trigram_support[engine]
+
+
+def _substring_search(query: Query, search_term: str, name, description, teacher_name) -> Tuple[Query, object]:
+    """逐行子串匹配：名称以关键词开头的最相关，其次是名称、教师姓名、描述中包含关键词"""
+    query = query.filter(or_(
+        name.icontains(search_term, autoescape=True),
+        description.icontains(search_term, autoescape=True),
+        teacher_name.icontains(search_term, autoescape=True),
+    ))
+    rank = case(
+        (name.istartswith(search_term, autoescape=True), 4),
+        (name.icontains(search_term, autoescape=True), 3),
+        (teacher_name.icontains(search_term, autoescape=True), 2),
+        else_=1
+    )
+    return query, type_coerce(rank, Float)
+
+
+def class_roster_subquery(class_id: int):
+    """班级花名册的聚合子查询：每个学生一行，包括加入时间和本班任务的提交数、已评分数、平均分
+
+    学生左连接本班任务的提交（按 (student_id, assignment_id) 唯一索引查找），一次查询完成汇总；
+    作为子查询使用，排序和游标条件可以直接作用在聚合结果上。
+    """
+    class_assignments = select(Assignment.id).where(Assignment.class_id == class_id)
+    return select(
+        User.id.label("student_id"),
+        User.name.label("name"),
+        StudentClass.joined_at.label("joined_at"),
+        func.count(Submission.id).label("submission_count"),
+        func.count(Submission.score).label("graded_count"),
+        func.avg(Submission.score).label("average_score"),
+    ).select_from(StudentClass).join(
+        User, User.id == StudentClass.student_id
+    ).outerjoin(
+        Submission, and_(
+            Submission.student_id == StudentClass.student_id,
+            Submission.assignment_id.in_(class_assignments)
+        )
+    ).where(
+        StudentClass.class_id == class_id
+    ).group_by(
+        User.id, User.name, StudentClass.joined_at
+    ).subquery("roster")
+
+
+def to_class_response(row, my_role: str) -> ClassResponse:
+    """将查询行转换为班级响应"""
+    return ClassResponse(
+        id=row.id,
+        name=row.name,
+        class_code=row.class_code,
+        description=row.description,
+        teacher_id=row.teacher_id,
+        teacher_name=row.teacher_name or "未知教师",
+        created_at=row.created_at,
+        updated_at=row.updated_at,
+        student_count=row.student_count,
+        my_role=my_role
+    )
@@ -0,0 +1,79 @@
+from typing import Optional, Tuple
+from urllib.parse import quote
+from fastapi import Request, Response, status
+from fastapi.responses import StreamingResponse
+from app.utils.blob_store import BlobStore
+
+
+def parse_range_header(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """解析单个字节范围（bytes=start-end / bytes=start- / bytes=-suffix），返回闭区间；无法满足时返回None"""
+    unit, _, ranges = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        raise ValueError("只支持单个字节范围")
+    start_str, sep, end_str = ranges.strip().partition("-")
+    if not sep:
+        raise ValueError("无效的Range请求头")
+    start_str, end_str = start_str.strip(), end_str.strip()
+    if not start_str:
+        # 后缀范围：最后N个字节
+        suffix = int(end_str)
+        if suffix <= 0 or size == 0:
+            return None
+        return max(size - suffix, 0), size - 1
+    start = int(start_str)
+    end = int(end_str) if end_str else size - 1
+    if start < 0 or start > end or start >= size:
+        return None
+    return start, min(end, size - 1)
+
+
+def etag_matches(header_value: str, etag: str) -> bool:
+    """判断 If-None-Match / If-Range 请求头是否匹配当前ETag（忽略弱校验前缀）"""
+    candidates = [value.strip() for value in header_value.split(",")]
+    return "*" in candidates or any(value.removeprefix("W/") == etag for value in candidates)
+
+
+def build_blob_response(request: Request, blob_store: BlobStore, file_hash: str,
+                        file_name: str, media_type: str) -> Response:
+    """构建支持 ETag 条件请求和 Range 断点续传的流式下载响应"""
+    etag = f'"{file_hash}"'
+    size = blob_store.size(file_hash)
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        # 需要登录才能下载，只允许浏览器私有缓存，每次使用前重新验证
+        "Cache-Control": "private, no-cache",
+        "Content-Disposition": f"attachment; filename*=UTF-8''{quote(file_name)}"
+    }
+
+    # 内容未变化时直接返回304
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or etag_matches(if_range, etag)):
+        try:
+            byte_range = parse_range_header(range_header, size)
+        except ValueError:
+            # 不支持的Range格式按普通请求处理，返回完整内容
+            pass
+        else:
+            if byte_range is None:
+                return Response(
+                    status_code=status.HTTP_416_RANGE_NOT_SATISFIABLE,
+                    headers={**headers, "Content-Range": f"bytes */{size}"}
+                )
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            headers["Content-Length"] = str(end - start + 1)
+            return StreamingResponse(
+                blob_store.iter_range(file_hash, start, end),
+                status_code=status.HTTP_206_PARTIAL_CONTENT,
+                media_type=media_type,
+                headers=headers
+            )
+
+    headers["Content-Length"] = str(size)
+    return StreamingResponse(blob_store.iter_chunks(file_hash), media_type=media_type, headers=headers)
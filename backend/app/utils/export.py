@@ -0,0 +1,172 @@
+import csv
+import enum
+import io
+import tempfile
+import zipfile
+from datetime import datetime
+from typing import Iterable, Iterator, List, Tuple
+from urllib.parse import quote
+from fastapi.responses import StreamingResponse
+from app.schemas.submission_schema import ExportFormat
+from app.utils.blob_store import BlobStore, CHUNK_SIZE
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+    ExportFormat.XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# 每次输出的 CSV 行数（避免逐行产生很小的响应块）
+CSV_ROWS_PER_CHUNK = 500
+
+# 以这些字符开头的文本会被 Excel 当作公式执行（CSV 和 XLSX 都需要防护）
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _cell(value):
+    """导出单元格的值：枚举取值，时间转换为字符串，None 为空"""
+    if value is None:
+        return ""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return value
+
+
+def _is_formula_like(value) -> bool:
+    """是否为会被 Excel 当作公式的文本"""
+    return isinstance(value, str) and value.startswith(FORMULA_PREFIXES)
+
+
+def _csv_cell(value):
+    """CSV 单元格：用户输入的文本加 ' 前缀，避免打开时被当作公式"""
+    value = _cell(value)
+    if _is_formula_like(value):
+        return "'" + value
+    return value
+
+
+def iter_csv(header: List[str], rows: Iterable[Iterable]) -> Iterator[bytes]:
+    """逐批生成 CSV 内容（带 UTF-8 BOM，Excel 可以直接打开中文）"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("﻿")
+    writer.writerow(header)
+    for index, row in enumerate(rows, start=1):
+        writer.writerow([_csv_cell(value) for value in row])
+        if index % CSV_ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode("utf-8")
+
+
+def iter_xlsx(title: str, header: List[str], rows: Iterable[Iterable]) -> Iterator[bytes]:
+    """生成 XLSX 内容：使用 openpyxl 的只写模式逐行写入临时文件，完成后分块输出
+
+    xlsx 是 zip 格式，只能在全部行写完后生成，因此先写入磁盘上的临时文件，内存占用与行数无关。
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+
+    workbook = Workbook(write_only=True)
+    # 工作表名称最长 31 个字符，且不能包含 []:*?/\
+    sheet = workbook.create_sheet(title="".join(c for c in title if c not in "[]:*?/\\")[:31] or "Sheet1")
+    sheet.append(header)
+
+    def xlsx_cell(value):
+        value = _cell(value)
+        if _is_formula_like(value):
+            # 明确写为文本单元格（openpyxl 会把 = 开头的文本写成公式），并设置引号前缀样式：
+            # 与 CSV 的 ' 前缀作用相同，但不改变单元格的值，在 Excel 中编辑后仍按文本处理
+            cell = WriteOnlyCell(sheet, value)
+            cell.data_type = "s"
+            cell.quotePrefix = True
+            return cell
+        return value
+
+    for row in rows:
+        sheet.append([xlsx_cell(value) for value in row])
+    with tempfile.TemporaryFile() as output:
+        workbook.save(output)
+        output.seek(0)
+        while True:
+            chunk = output.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+def export_table_response(export_format: ExportFormat, file_stem: str, title: str,
+                          header: List[str], rows: Iterable[Iterable]) -> StreamingResponse:
+    """构建成绩表的流式下载响应（rows 为逐行产生数据的迭代器）"""
+    if export_format == ExportFormat.XLSX:
+        content = iter_xlsx(title, header, rows)
+    else:
+        content = iter_csv(header, rows)
+    return StreamingResponse(
+        content,
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers=_attachment_headers(f"{file_stem}.{export_format.value}")
+    )
+
+
+class _ZipStream:
+    """只追加写入的输出缓冲区：zipfile 写入后由生成器取出已写入的内容"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip(blob_store: BlobStore, entries: Iterable[Tuple[str, str, int]]) -> Iterator[bytes]:
+    """边读取边生成 zip 压缩包：entries 为 (压缩包内路径, 文件哈希, 文件大小)
+
+    docx 本身已经压缩，因此以存储方式写入；输出不可 seek，文件大小和 CRC 写在每个文件之后的数据描述符中，
+    每次只在内存中保留一个读取块。
+    """
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        for path, file_hash, file_size in entries:
+            info = zipfile.ZipInfo(path, date_time=datetime.now().timetuple()[:6])
+            info.file_size = file_size or 0
+            # 已知文件大小时 zipfile 会自动决定是否使用 zip64
+            with archive.open(info, mode="w") as target:
+                for chunk in blob_store.iter_chunks(file_hash):
+                    target.write(chunk)
+                    yield stream.drain()
+            yield stream.drain()
+    yield stream.drain()
+
+
+def export_zip_response(blob_store: BlobStore, file_name: str, entries: Iterable[Tuple[str, str, int]]) -> StreamingResponse:
+    """构建 zip 压缩包的流式下载响应（长度未知，使用分块传输）"""
+    return StreamingResponse(
+        iter_zip(blob_store, entries),
+        media_type="application/zip",
+        headers=_attachment_headers(file_name)
+    )
+
+
+def _attachment_headers(file_name: str) -> dict:
+    return {
+        "Content-Disposition": f"attachment; filename*=UTF-8''{quote(file_name)}",
+        # 导出内容包含成绩，不允许共享缓存
+        "Cache-Control": "private, no-store",
+    }
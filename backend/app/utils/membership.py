@@ -0,0 +1,138 @@
+import enum
+import threading
+import time
+from typing import Dict, Optional
+from sqlalchemy import event, literal, select, union_all
+from sqlalchemy.orm import Session, object_session
+from app.core.config import settings
+from app.models.class_model import Class
+from app.models.teacher_class import TeacherClass
+from app.models.student_class import StudentClass
+
+
+class ClassMemberRole(str, enum.Enum):
+    """用户在班级中的角色（与班级响应中的 my_role 取值一致）"""
+    MAIN_TEACHER = "main_teacher"  # 主教师
+    ASSISTANT_TEACHER = "assistant_teacher"  # 助教
+    STUDENT = "student"  # 学生
+
+
+# 同一班级有多个关系时按优先级取最高的角色
+_ROLE_PRIORITY = {
+    ClassMemberRole.STUDENT: 0,
+    ClassMemberRole.ASSISTANT_TEACHER: 1,
+    ClassMemberRole.MAIN_TEACHER: 2,
+}
+
+# 请求内缓存在 Session.info 中的键
+_SESSION_KEY = "class_memberships"
+
+
+class MembershipCache:
+    """跨请求的班级成员关系缓存（短 TTL，ttl <= 0 时不缓存）"""
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # 用户ID -> (班级ID -> 角色, 过期时间)
+        self._entries = {}
+
+    def get(self, user_id: int) -> Optional[Dict[int, ClassMemberRole]]:
+        if self.ttl <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            return entry[0]
+
+    def put(self, user_id: int, memberships: Dict[int, ClassMemberRole]) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (memberships, time.monotonic() + self.ttl)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def invalidate_class(self, class_id: int) -> None:
+        with self._lock:
+            for user_id in [uid for uid, (memberships, _) in self._entries.items() if class_id in memberships]:
+                del self._entries[user_id]
+
+
+# 全局班级成员关系缓存（默认关闭，多进程部署时各进程独立缓存）
+membership_cache = MembershipCache(ttl=settings.MEMBERSHIP_CACHE_TTL)
+
+
+def load_memberships(db: Session, user_id: int) -> Dict[int, ClassMemberRole]:
+    """一次查询加载用户所在的全部班级及角色"""
+    query = union_all(
+        select(Class.id.label("class_id"), literal(ClassMemberRole.MAIN_TEACHER.value).label("role"))
+        .where(Class.teacher_id == user_id),
+        select(TeacherClass.class_id, literal(ClassMemberRole.ASSISTANT_TEACHER.value))
+        .where(TeacherClass.teacher_id == user_id),
+        select(StudentClass.class_id, literal(ClassMemberRole.STUDENT.value))
+        .where(StudentClass.student_id == user_id),
+    )
+    memberships = {}
+    for class_id, role in db.execute(query):
+        role = ClassMemberRole(role)
+        current = memberships.get(class_id)
+        if current is None or _ROLE_PRIORITY[role] > _ROLE_PRIORITY[current]:
+            memberships[class_id] = role
+    return memberships
+
+
+def get_memberships(db: Session, current_user) -> Dict[int, ClassMemberRole]:
+    """获取当前用户的 班级ID -> 角色 映射（同一请求内只查询一次）"""
+    session_cache = db.info.setdefault(_SESSION_KEY, {})
+    memberships = session_cache.get(current_user.id)
+    if memberships is None:
+        memberships = membership_cache.get(current_user.id)
+        if memberships is None:
+            memberships = load_memberships(db, current_user.id)
+            membership_cache.put(current_user.id, memberships)
+        session_cache[current_user.id] = memberships
+    return memberships
+
+
+def get_class_role(db: Session, class_id: int, current_user) -> Optional[ClassMemberRole]:
+    """获取当前用户在班级中的角色，不是成员时返回 None"""
+    return get_memberships(db, current_user).get(class_id)
+
+
+def invalidate_memberships(db: Session = None, user_id: int = None, class_id: int = None) -> None:
+    """成员关系变化后清除缓存（请求内缓存和跨请求缓存）"""
+    if db is not None:
+        db.info.pop(_SESSION_KEY, None)
+    if user_id is not None:
+        membership_cache.invalidate_user(user_id)
+    if class_id is not None:
+        membership_cache.invalidate_class(class_id)
+
+
+@event.listens_for(Class, "after_insert")
+@event.listens_for(Class, "after_update")
+@event.listens_for(Class, "after_delete")
+def _invalidate_class(mapper, connection, target: Class) -> None:
+    """班级创建、转让或删除后清除相关缓存"""
+    invalidate_memberships(object_session(target), user_id=target.teacher_id, class_id=target.id)
+
+
+@event.listens_for(TeacherClass, "after_insert")
+@event.listens_for(TeacherClass, "after_delete")
+def _invalidate_teacher_class(mapper, connection, target: TeacherClass) -> None:
+    """教师加入或退出班级后清除缓存"""
+    invalidate_memberships(object_session(target), user_id=target.teacher_id)
+
+
+@event.listens_for(StudentClass, "after_insert")
+@event.listens_for(StudentClass, "after_delete")
+def _invalidate_student_class(mapper, connection, target: StudentClass) -> None:
+    """学生加入或退出班级后清除缓存"""
+    invalidate_memberships(object_session(target), user_id=target.student_id)
@@ -0,0 +1,96 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Tuple
+from fastapi import HTTPException, Response, status
+from sqlalchemy import DateTime, String, tuple_, type_coerce
+from sqlalchemy.orm import Query, Session
+from app.schemas.pagination import PageParams
+
+# 下一页游标所在的响应头（没有下一页时不返回）
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    """把排序键 (排序列的值, id) 编码为不透明的游标字符串"""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+    """解析游标字符串"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(row_id, int) or not isinstance(sort_value, (str, int, float)):
+            raise ValueError
+        return sort_value, row_id
+    except (ValueError, TypeError, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="无效的分页游标"
+        )
+
+
+def _sort_key(db: Session, column):
+    """排序列在游标比较中使用的表达式
+
+    SQLite 中时间以文本保存（服务端默认值没有微秒，而绑定参数总带微秒），直接用 datetime 比较会把
+    同一时刻判断为不相等，因此在 SQLite 上按原始文本读取和比较；其他数据库直接比较时间值。
+    其他类型（例如搜索的相关度）直接比较。
+    """
+    if isinstance(column.type, DateTime) and db.get_bind().dialect.name == "sqlite":
+        return type_coerce(column, String)
+    return column
+
+
+def _cursor_sort_value(sort_key, sort_value: Any) -> Any:
+    """把游标中的排序值转换为排序列的类型（时间和文本保存为字符串，数值保存为数字），类型不符时视为无效游标"""
+    try:
+        if isinstance(sort_key.type, (DateTime, String)) != isinstance(sort_value, str):
+            raise ValueError
+        if isinstance(sort_key.type, DateTime):
+            return datetime.fromisoformat(sort_value)
+        return sort_value
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="无效的分页游标"
+        )
+
+
+def keyset_paginate(db: Session, query: Query, sort_column, id_column, page: PageParams, response: Response,
+                    descending: bool = True) -> List[Any]:
+    """按 (sort_column, id) 对查询做游标分页（默认倒序，descending=False 时正序）
+
+    传入的查询不能带 order_by；有下一页时在响应头 X-Next-Cursor 中返回下一页游标。
+    返回的行与原查询一致（查询单个实体时返回实体，查询多列时返回行）。
+    """
+    single_entity = len(query.column_descriptions) == 1
+    sort_key = _sort_key(db, sort_column)
+    query = query.add_columns(
+        sort_key.label("cursor_sort_key"), id_column.label("cursor_id")
+    )
+    if descending:
+        query = query.order_by(sort_key.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_key.asc(), id_column.asc())
+
+    if page.cursor:
+        sort_value, row_id = decode_cursor(page.cursor)
+        sort_value = _cursor_sort_value(sort_key, sort_value)
+        if descending:
+            query = query.filter(tuple_(sort_key, id_column) < tuple_(sort_value, row_id))
+        else:
+            query = query.filter(tuple_(sort_key, id_column) > tuple_(sort_value, row_id))
+    if page.limit is not None:
+        query = query.limit(page.limit + 1)
+
+    rows = query.all()
+    if page.limit is not None and len(rows) > page.limit:
+        rows = rows[:page.limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.cursor_sort_key, last.cursor_id)
+    return [row[0] for row in rows] if single_entity else rows
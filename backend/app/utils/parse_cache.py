@@ -0,0 +1,61 @@
+import json
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.parse_cache import ParseCache
+from app.utils.parser_utils import PARSER_VERSION
+
+
+def get_cached_result(db: Session, file_hash: str) -> Optional[dict]:
+    """查找文件的解析结果缓存（只使用当前解析器版本的结果），命中时更新最近使用时间（不提交事务）"""
+    if settings.PARSE_CACHE_MAX_BYTES <= 0:
+        return None
+    entry = db.query(ParseCache).filter(
+        ParseCache.file_hash == file_hash,
+        ParseCache.parser_version == PARSER_VERSION
+    ).first()
+    if entry is None:
+        return None
+    entry.hit_count = ParseCache.hit_count + 1
+    # 使用应用时间（精确到微秒），同一秒内的多次使用也能区分先后
+    entry.last_used_at = datetime.now(timezone.utc)
+    return json.loads(entry.result)
+
+
+def store_parse_result(db: Session, file_hash: str, result: dict) -> None:
+    """缓存文件的解析结果，超出容量时淘汰最久未使用的结果（不提交事务）"""
+    if settings.PARSE_CACHE_MAX_BYTES <= 0:
+        return
+    content = json.dumps(result, ensure_ascii=False, separators=(",", ":"))
+    size = len(content.encode("utf-8"))
+    if size > settings.PARSE_CACHE_MAX_BYTES:
+        return
+    try:
+        with db.begin_nested():
+            db.add(ParseCache(file_hash=file_hash, parser_version=PARSER_VERSION, result=content, size=size,
+                              last_used_at=datetime.now(timezone.utc)))
+    except IntegrityError:
+        return  # 同一文件的其他任务已经缓存了结果
+    evict_parse_cache(db)
+
+
+def evict_parse_cache(db: Session) -> int:
+    """按最近使用时间淘汰缓存（旧版本解析器的结果不会再命中，最先被淘汰），返回淘汰的条数（不提交事务）"""
+    total = db.query(func.coalesce(func.sum(ParseCache.size), 0)).scalar()
+    excess = total - settings.PARSE_CACHE_MAX_BYTES
+    if excess <= 0:
+        return 0
+    expired = []
+    rows = db.query(ParseCache.id, ParseCache.size).order_by(
+        ParseCache.last_used_at, ParseCache.id
+    ).all()
+    for row in rows:
+        if excess <= 0:
+            break
+        expired.append(row.id)
+        excess -= row.size
+    db.query(ParseCache).filter(ParseCache.id.in_(expired)).delete(synchronize_session=False)
+    return len(expired)
@@ -0,0 +1,65 @@
+from typing import List, Optional
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.models.submission import Submission
+from app.models.submission_paragraph import SubmissionParagraph
+
+
+def save_parsed_document(db: Session, submission: Submission, result: dict) -> None:
+    """保存 parse_docx 的解析结果：段落写入段落表，字数统计写入提交（不提交事务）"""
+    clear_parsed_document(db, submission)
+    headings = {item["id"]: item for item in result["outline"]}
+    rows = []
+    for paragraph in result["paragraphs"]:
+        heading = headings.get(paragraph["id"])
+        rows.append({
+            "submission_id": submission.id,
+            "position": paragraph["id"],
+            "text": paragraph["text"],
+            "word_count": paragraph["word_count"],
+            "heading_level": heading["level"] if heading else None,
+            "style": heading["style"] if heading else None,
+        })
+    if rows:
+        db.execute(insert(SubmissionParagraph), rows)
+    submission.paragraph_count = result["paragraph_count"]
+    submission.total_words_count = result["total_words_count"]
+
+
+def clear_parsed_document(db: Session, submission: Submission) -> None:
+    """删除提交已有的解析结果（重新提交文件时调用，不提交事务）"""
+    db.query(SubmissionParagraph).filter(
+        SubmissionParagraph.submission_id == submission.id
+    ).delete(synchronize_session=False)
+    submission.paragraph_count = None
+    submission.total_words_count = None
+
+
+def load_outline(db: Session, submission_id: int) -> List[dict]:
+    """读取文档大纲（只读取标题段落）"""
+    rows = db.query(
+        SubmissionParagraph.position, SubmissionParagraph.text,
+        SubmissionParagraph.heading_level, SubmissionParagraph.style
+    ).filter(
+        SubmissionParagraph.submission_id == submission_id,
+        SubmissionParagraph.heading_level.isnot(None)
+    ).order_by(SubmissionParagraph.position).all()
+    return [
+        {"id": row.position, "text": row.text, "level": row.heading_level, "style": row.style}
+        for row in rows
+    ]
+
+
+def load_paragraphs(db: Session, submission_id: int, offset: int = 0, limit: Optional[int] = None) -> List[dict]:
+    """按顺序读取文档段落，offset/limit 为非空段落的区间"""
+    query = db.query(
+        SubmissionParagraph.position, SubmissionParagraph.text, SubmissionParagraph.word_count
+    ).filter(
+        SubmissionParagraph.submission_id == submission_id
+    ).order_by(SubmissionParagraph.position).offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
+    return [
+        {"id": row.position, "text": row.text, "word_count": row.word_count}
+        for row in query.all()
+    ]
@@ -1,48 +1,233 @@
+import logging
+import posixpath
+import zipfile
 from docx import Document
+from lxml import etree
+from app.core.config import settings
 from app.utils.outline_utils import build_outline_tree
 
+logger = logging.getLogger(__name__)
+
+# WordprocessingML 命名空间和流式解析用到的标签
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+W_BODY = f"{W}body"
+W_P = f"{W}p"
+W_PPR = f"{W}pPr"
+W_PSTYLE = f"{W}pStyle"
+W_R = f"{W}r"
+W_HYPERLINK = f"{W}hyperlink"
+W_T = f"{W}t"
+W_BR = f"{W}br"
+W_STYLE = f"{W}style"
+W_NAME = f"{W}name"
+W_VAL = f"{W}val"
+W_TYPE = f"{W}type"
+W_STYLE_ID = f"{W}styleId"
+W_DEFAULT = f"{W}default"
+
+# run 中除 w:t 以外转换为文本的元素（与 python-docx 的 Run.text 一致；w:br 单独处理）
+RUN_TEXT_ELEMENTS = {
+    f"{W}tab": "\t",
+    f"{W}ptab": "\t",
+    f"{W}cr": "\n",
+    f"{W}noBreakHyphen": "-",
+}
+
+# styles.xml 中的内部样式名与界面样式名的对应（与 python-docx 的 BabelFish 一致）
+UI_STYLE_NAMES = {
+    "caption": "Caption",
+    "footer": "Footer",
+    "header": "Header",
+    **{f"heading {level}": f"Heading {level}" for level in range(1, 10)},
+}
+
+RELS = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+REL_OFFICE_DOCUMENT = "/officeDocument"
+REL_STYLES = "/styles"
+
+# 解析结果格式版本：解析规则或输出格式变化时递增，旧版本的解析结果缓存随之失效
+PARSER_VERSION = "1"
+
+PARSER_STREAM = "stream"
+PARSER_PYTHON_DOCX = "python-docx"
+
+
 def parse_docx(file):
-    """解析docx文件，提取文本内容和结构信息"""
-    docx = Document(file)
-    results = {
+    """解析docx文件，提取文本内容和结构信息
+
+    默认使用流式解析（DOCX_PARSER=stream），文档结构不支持流式解析时回退到 python-docx；
+    两种方式的输出完全相同。
+    """
+    if settings.DOCX_PARSER == PARSER_STREAM:
+        try:
+            return parse_docx_stream(file)
+        except (KeyError, ValueError, etree.XMLSyntaxError) as e:
+            logger.warning("流式解析docx失败，回退到 python-docx: %s", e)
+            if hasattr(file, "seek"):
+                file.seek(0)
+    return parse_docx_python_docx(file)
+
+
+def new_parse_result() -> dict:
+    return {
         "total_words_count": 0,
         "paragraph_count": 0,
         "paragraphs": [],
         "outline": []
     }
-    
+
+
+def append_paragraph(results: dict, id: int, text: str, style_name) -> None:
+    """把一个非空段落（已去掉两端空白）加入解析结果，标题段落同时加入大纲"""
+    word_count = len(text.replace(" ", ""))  # 去掉空格后的字符数
+
+    results["paragraphs"].append({
+        "id": id,
+        "text": text,
+        "word_count": word_count
+    })
+    results["total_words_count"] += word_count
+    results["paragraph_count"] += 1
+
+    if style_name and (style_name.startswith("Heading") or style_name == "Title"):
+        # 提取标题级别
+        level = 0
+        if style_name == "Title":
+            level = 0
+        elif style_name.startswith("Heading"):
+            try:
+                level = int(style_name.split()[-1])
+            except:
+                level = 1
+
+        results["outline"].append({
+            "id": id,
+            "text": text,
+            "level": level,
+            "style": style_name
+        })
+
+
+def parse_docx_python_docx(file):
+    """使用 python-docx 解析docx文件（构建完整的文档对象模型）"""
+    docx = Document(file)
+    results = new_parse_result()
+
     for id, para in enumerate(docx.paragraphs):
         text = para.text.strip()  # 去掉段落两端的空白字符
         if not text:
             continue
-        word_count = len(text.replace(" ", ""))  # 去掉空格后的字符数
-        
-        results["paragraphs"].append({
-            "id": id,
-            "text": text,
-            "word_count": word_count
-        })
-        results["total_words_count"] += word_count
-        results["paragraph_count"] += 1
-        
-        if para.style.name.startswith("Heading") or para.style.name == "Title":
-            # 提取标题级别
-            level = 0
-            if para.style.name == "Title":
-                level = 0
-            elif para.style.name.startswith("Heading"):
-                try:
-                    level = int(para.style.name.split()[-1])
-                except:
-                    level = 1
-            
-            results["outline"].append({
-                "id": id,
-                "text": text,
-                "level": level,
-                "style": para.style.name
-            })
-    
+        append_paragraph(results, id, text, para.style.name)
+
+    # 转换outline为树状结构
+    results["outline_tree"] = build_outline_tree(results["outline"])
+    return results
+
+
+def parse_docx_stream(file):
+    """流式解析docx文件
+
+    直接从压缩包中用 iterparse 逐段读取 word/document.xml，处理完的段落和表格立即释放，
+    内存占用与文档长度无关；样式 ID 只在读取 styles.xml 时解析一次。
+    文档缺少样式部件等无法按 python-docx 规则确定样式时抛出 ValueError。
+    """
+    results = new_parse_result()
+    with zipfile.ZipFile(file) as package:
+        document_path = _find_part(package, "", REL_OFFICE_DOCUMENT)
+        if document_path is None:
+            raise ValueError("docx中没有主文档部件")
+        styles_path = _find_part(package, document_path, REL_STYLES)
+        if styles_path is None:
+            raise ValueError("docx中没有样式部件")
+        style_names, default_style = _load_paragraph_styles(package, styles_path)
+
+        with package.open(document_path) as stream:
+            id = 0
+            for _, element in etree.iterparse(stream, events=("end",), tag=W_P, resolve_entities=False):
+                body = element.getparent()
+                # 只处理正文中的段落（与 python-docx 的 Document.paragraphs 一致，不包括表格中的段落）
+                if body is None or body.tag != W_BODY:
+                    continue
+                text, style_id = _paragraph_text_and_style(element)
+                text = text.strip()
+                if text:
+                    style_name = style_names.get(style_id, default_style) if style_id else default_style
+                    append_paragraph(results, id, text, style_name)
+                id += 1
+                # 释放已处理的段落以及之前的表格等元素
+                element.clear(keep_tail=True)
+                while element.getprevious() is not None:
+                    del body[0]
+
     # 转换outline为树状结构
     results["outline_tree"] = build_outline_tree(results["outline"])
     return results
+
+
+def _find_part(package: zipfile.ZipFile, source_path: str, relationship_type: str):
+    """按关系类型查找部件在压缩包中的路径（source_path 为空表示包级关系）"""
+    directory, name = posixpath.split(source_path)
+    rels_path = posixpath.join(directory, "_rels", f"{name}.rels")
+    try:
+        rels = etree.fromstring(package.read(rels_path))
+    except KeyError:
+        return None
+    for rel in rels.iter(RELS):
+        if rel.get("TargetMode") == "External" or not rel.get("Type", "").endswith(relationship_type):
+            continue
+        target = rel.get("Target")
+        path = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join(directory, target))
+        return path
+    return None
+
+
+def _load_paragraph_styles(package: zipfile.ZipFile, styles_path: str):
+    """读取段落样式：返回 (样式ID -> 界面样式名, 默认段落样式名)"""
+    styles = etree.fromstring(package.read(styles_path))
+    first_by_id = {}
+    default_style = None
+    for style in styles.iterchildren(W_STYLE):
+        name_element = style.find(W_NAME)
+        name = name_element.get(W_VAL) if name_element is not None else None
+        name = UI_STYLE_NAMES.get(name, name)
+        is_paragraph = style.get(W_TYPE) == "paragraph"
+        # 同一 ID 以第一个样式为准；默认样式以最后一个为准
+        first_by_id.setdefault(style.get(W_STYLE_ID), (is_paragraph, name))
+        if is_paragraph and style.get(W_DEFAULT) in ("1", "true", "on"):
+            default_style = name
+    style_names = {style_id: name for style_id, (is_paragraph, name) in first_by_id.items() if is_paragraph}
+    return style_names, default_style
+
+
+def _paragraph_text_and_style(paragraph):
+    """提取段落文本（与 python-docx 的 Paragraph.text 一致）和段落样式ID"""
+    parts = []
+    for child in paragraph:
+        if child.tag == W_R:
+            _append_run_text(parts, child)
+        elif child.tag == W_HYPERLINK:
+            for run in child.iterchildren(W_R):
+                _append_run_text(parts, run)
+
+    style_id = None
+    properties = paragraph.find(W_PPR)
+    if properties is not None:
+        style = properties.find(W_PSTYLE)
+        if style is not None:
+            style_id = style.get(W_VAL)
+    return "".join(parts), style_id
+
+
+def _append_run_text(parts: list, run) -> None:
+    for child in run:
+        tag = child.tag
+        if tag == W_T:
+            parts.append(child.text or "")
+        elif tag == W_BR:
+            # 换行符转换为 \n，分页符和分栏符忽略
+            if child.get(W_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        else:
+            text = RUN_TEXT_ELEMENTS.get(tag)
+            if text:
+                parts.append(text)
@@ -0,0 +1,199 @@
+import math
+from typing import Iterable, Optional
+from sqlalchemy import case, func, insert, select
+from sqlalchemy.orm import Session
+from app.models.assignment import Assignment
+from app.models.assignment_stats import AssignmentStats, HISTOGRAM_BUCKETS
+from app.models.submission import Submission
+from app.schemas.submission_schema import SubmissionStatistics, ScoreHistogramBucket
+
+# 分数范围（0-100 分）
+SCORE_MIN = 0
+SCORE_MAX = 100
+BUCKET_WIDTH = (SCORE_MAX - SCORE_MIN) / HISTOGRAM_BUCKETS
+
+# 需要计算的分位数：名称 -> 分位点
+QUANTILES = {
+    "percentile_25": 0.25,
+    "median_score": 0.5,
+    "percentile_75": 0.75,
+    "percentile_90": 0.9,
+}
+
+
+def _bucket_bounds(index: int):
+    return SCORE_MIN + index * BUCKET_WIDTH, SCORE_MIN + (index + 1) * BUCKET_WIDTH
+
+
+def _bucket_index(score: float) -> int:
+    """分数所在的直方图分段（最后一段包含满分）"""
+    index = int((score - SCORE_MIN) // BUCKET_WIDTH)
+    return min(max(index, 0), HISTOGRAM_BUCKETS - 1)
+
+
+def _in_bucket(score, index: int):
+    """SQL 条件：分数落在第 index 段（与 _bucket_index 的划分一致）"""
+    lower, upper = _bucket_bounds(index)
+    if index == HISTOGRAM_BUCKETS - 1:
+        return score >= lower
+    if index == 0:
+        return score < upper
+    return (score >= lower) & (score < upper)
+
+
+def rebuild_assignment_stats(db: Session, assignment_ids: Optional[Iterable[int]] = None) -> int:
+    """根据提交表重新计算任务统计（修复增量维护产生的偏差），返回重建的任务数；不提交事务"""
+    score = Submission.score
+    columns = [
+        Assignment.id.label("assignment_id"),
+        func.count(Submission.id).label("submission_count"),
+        func.count(score).label("graded_count"),
+        func.coalesce(func.sum(score), 0).label("score_sum"),
+        func.coalesce(func.sum(score * score), 0).label("score_sum_squares"),
+        func.min(score).label("min_score"),
+        func.max(score).label("max_score"),
+    ]
+    for i in range(HISTOGRAM_BUCKETS):
+        columns.append(func.count(case((_in_bucket(score, i), 1))).label(f"bucket_{i}"))
+    query = select(*columns).outerjoin(
+        Submission, Submission.assignment_id == Assignment.id
+    ).group_by(Assignment.id)
+
+    delete_query = db.query(AssignmentStats)
+    if assignment_ids is not None:
+        assignment_ids = list(assignment_ids)
+        query = query.where(Assignment.id.in_(assignment_ids))
+        delete_query = delete_query.filter(AssignmentStats.assignment_id.in_(assignment_ids))
+
+    db.flush()
+    # 先按任务ID顺序锁定要重建的统计行：重新计算期间其他请求的增量更新等待本事务结束，不会被覆盖
+    delete_query.order_by(AssignmentStats.assignment_id).with_entities(AssignmentStats.assignment_id).with_for_update().all()
+    rows = [dict(row._mapping) for row in db.execute(query)]
+    delete_query.delete(synchronize_session=False)
+    if rows:
+        db.execute(insert(AssignmentStats), rows)
+    return len(rows)
+
+
+def record_submission_created(db: Session, assignment_id: int, count: int = 1) -> None:
+    """新提交：提交数增加 count（与提交在同一事务中）"""
+    updated = db.query(AssignmentStats).filter(
+        AssignmentStats.assignment_id == assignment_id
+    ).update({
+        AssignmentStats.submission_count: AssignmentStats.submission_count + count
+    }, synchronize_session=False)
+    if not updated:
+        rebuild_assignment_stats(db, [assignment_id])
+
+
+def record_score_change(db: Session, assignment_id: int, old_score: Optional[float], new_score: float) -> None:
+    """评分变化：在数据库中原子地增量更新统计（与提交的修改在同一事务中）"""
+    if old_score == new_score:
+        return
+    # 最值被改掉时需要从提交表重新计算（走 assignment_id, score 索引），因此先写入提交的新分数
+    db.flush()
+    stats = AssignmentStats
+    graded_scores = select(Submission.score).where(
+        Submission.assignment_id == assignment_id, Submission.score.isnot(None)
+    )
+
+    values = {
+        stats.score_sum: stats.score_sum + new_score - (old_score or 0),
+        stats.score_sum_squares: stats.score_sum_squares + new_score * new_score - (old_score or 0) ** 2,
+    }
+    new_index = _bucket_index(new_score)
+    new_bucket = stats.bucket_column(new_index)
+    if old_score is None:
+        values[stats.graded_count] = stats.graded_count + 1
+        values[new_bucket] = new_bucket + 1
+        min_score = case((stats.min_score.is_(None) | (stats.min_score > new_score), new_score), else_=stats.min_score)
+        max_score = case((stats.max_score.is_(None) | (stats.max_score < new_score), new_score), else_=stats.max_score)
+    else:
+        old_index = _bucket_index(old_score)
+        if old_index != new_index:
+            old_bucket = stats.bucket_column(old_index)
+            values[old_bucket] = old_bucket - 1
+            values[new_bucket] = new_bucket + 1
+        min_score = case(
+            (stats.min_score > new_score, new_score),
+            (stats.min_score == old_score, graded_scores.with_only_columns(func.min(Submission.score)).scalar_subquery()),
+            else_=stats.min_score
+        )
+        max_score = case(
+            (stats.max_score < new_score, new_score),
+            (stats.max_score == old_score, graded_scores.with_only_columns(func.max(Submission.score)).scalar_subquery()),
+            else_=stats.max_score
+        )
+    values[stats.min_score] = min_score
+    values[stats.max_score] = max_score
+
+    updated = db.query(stats).filter(stats.assignment_id == assignment_id).update(values, synchronize_session=False)
+    if not updated:
+        rebuild_assignment_stats(db, [assignment_id])
+
+
+def _quantile_positions(graded: int, q: float):
+    """分位数在已排序分数中的位置 (n - 1) * q：返回相邻的两个下标和插值比例"""
+    position = (graded - 1) * q
+    lower = int(position)
+    return lower, min(lower + 1, graded - 1), position - lower
+
+
+def _load_exact_quantiles(db: Session, assignment_id: int, graded: int) -> dict:
+    """按 (assignment_id, score) 索引有序读取分位点上的分数，计算精确分位数（线性插值）
+
+    每个位置是一个 ORDER BY score LIMIT 1 OFFSET k 标量子查询，只沿索引走 k 步，不读取提交行；
+    所有位置合并为一条查询。
+    """
+    positions = sorted({index for q in QUANTILES.values() for index in _quantile_positions(graded, q)[:2]})
+    ordered_scores = select(Submission.score).where(
+        Submission.assignment_id == assignment_id, Submission.score.isnot(None)
+    ).order_by(Submission.score).limit(1)
+    row = db.execute(select(*[
+        ordered_scores.offset(index).scalar_subquery().label(f"score_{index}") for index in positions
+    ])).one()
+
+    quantiles = {}
+    for name, q in QUANTILES.items():
+        lower, upper, fraction = _quantile_positions(graded, q)
+        low, high = getattr(row, f"score_{lower}"), getattr(row, f"score_{upper}")
+        if low is None or high is None:
+            # 统计汇总与提交表暂时不一致（如并发批改尚未提交）时不返回分位数
+            return {}
+        quantiles[name] = float(low) + (float(high) - float(low)) * fraction
+    return quantiles
+
+
+def load_assignment_statistics(db: Session, assignment_id: int) -> SubmissionStatistics:
+    """按主键读取任务统计汇总（缺失时先重建），分位数按索引精确计算"""
+    stats = db.get(AssignmentStats, assignment_id)
+    if stats is None:
+        rebuild_assignment_stats(db, [assignment_id])
+        db.commit()
+        stats = db.get(AssignmentStats, assignment_id)
+
+    graded = stats.graded_count
+    histogram = []
+    for i in range(HISTOGRAM_BUCKETS):
+        lower, upper = _bucket_bounds(i)
+        histogram.append(ScoreHistogramBucket(range_start=lower, range_end=upper, count=getattr(stats, f"bucket_{i}")))
+
+    result = SubmissionStatistics(
+        total_submissions=stats.submission_count,
+        graded_submissions=graded,
+        ungraded_submissions=stats.submission_count - graded,
+        average_score=None,
+        highest_score=None,
+        lowest_score=None,
+        histogram=histogram
+    )
+    if graded:
+        mean = stats.score_sum / graded
+        result.average_score = mean
+        result.highest_score = stats.max_score
+        result.lowest_score = stats.min_score
+        # 总体标准差：sqrt(E[x^2] - E[x]^2)，浮点误差可能导致极小的负数
+        result.std_deviation = math.sqrt(max(stats.score_sum_squares / graded - mean * mean, 0.0))
+        for name, value in _load_exact_quantiles(db, assignment_id, graded).items():
+            setattr(result, name, value)
+    return result
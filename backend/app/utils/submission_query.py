@@ -0,0 +1,74 @@
+from sqlalchemy.orm import Session, Query
+from app.models.user import User
+from app.models.class_model import Class
+from app.models.assignment import Assignment
+from app.models.submission import Submission
+from app.schemas.submission_schema import StudentSubmissionResponse, TeacherSubmissionResponse, SubmissionListFilter
+
+
+def submission_list_query(db: Session) -> Query:
+    """构建提交列表的联合查询（只选取列表响应需要的列，不加载原始文件和解析数据）"""
+    return db.query(
+        Submission.id,
+        Submission.student_id,
+        User.name.label("student_name"),
+        Submission.assignment_id,
+        Assignment.title.label("assignment_title"),
+        Assignment.class_id,
+        Class.name.label("class_name"),
+        Submission.score,
+        Submission.report.isnot(None).label("has_report"),
+        Submission.submitted_at
+    ).join(
+        Assignment, Assignment.id == Submission.assignment_id
+    ).outerjoin(
+        Class, Class.id == Assignment.class_id
+    ).outerjoin(
+        User, User.id == Submission.student_id
+    )
+
+
+def apply_submission_filters(query: Query, filters: SubmissionListFilter) -> Query:
+    """在提交列表查询上应用筛选条件"""
+    if filters.graded is not None:
+        query = query.filter(Submission.score.isnot(None) if filters.graded else Submission.score.is_(None))
+    if filters.min_score is not None:
+        query = query.filter(Submission.score >= filters.min_score)
+    if filters.max_score is not None:
+        query = query.filter(Submission.score <= filters.max_score)
+    if filters.student_name:
+        # 前缀匹配写成范围条件，可以使用用户名索引
+        query = query.filter(User.name >= filters.student_name, User.name < filters.student_name + "\U0010ffff")
+    if filters.submitted_after is not None:
+        query = query.filter(Submission.submitted_at > filters.submitted_after)
+    return query
+
+
+def to_student_submission_response(row) -> StudentSubmissionResponse:
+    """将查询行转换为学生提交响应"""
+    return StudentSubmissionResponse(
+        id=row.id,
+        assignment_title=row.assignment_title or "未知任务",
+        assignment_id=row.assignment_id,
+        class_id=row.class_id or 0,
+        class_name=row.class_name or "未知班级",
+        score=row.score,
+        submitted_at=row.submitted_at,
+        is_graded=row.score is not None and bool(row.has_report)
+    )
+
+
+def to_teacher_submission_response(row) -> TeacherSubmissionResponse:
+    """将查询行转换为教师提交响应"""
+    return TeacherSubmissionResponse(
+        id=row.id,
+        student_id=row.student_id,
+        student_name=row.student_name or "未知学生",
+        assignment_title=row.assignment_title or "未知任务",
+        assignment_id=row.assignment_id,
+        class_id=row.class_id or 0,
+        class_name=row.class_name or "未知班级",
+        score=row.score,
+        submitted_at=row.submitted_at,
+        is_graded=row.score is not None and bool(row.has_report)
+    )
@@ -0,0 +1,119 @@
+import posixpath
+import zipfile
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Iterator, List, Optional, Tuple
+from fastapi import UploadFile
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.parse_job import ParseJob
+from app.models.submission import Submission, ParseStatus
+from app.utils.blob_store import get_blob_store
+from app.utils.parse_cache import get_cached_result
+from app.utils.parsed_document import save_parsed_document, clear_parsed_document
+
+# zip 中文件名使用 UTF-8 编码的标志位（未设置时 Windows 压缩工具通常使用 GBK）
+ZIP_UTF8_FLAG = 0x800
+
+
+def store_docx(fileobj: BinaryIO) -> Optional[Tuple[str, int]]:
+    """流式保存docx文件到文件存储，返回 (sha256, 字节数)；不是有效的docx文件时返回 None"""
+    blob_store = get_blob_store()
+    file_hash, file_size = blob_store.put(fileobj)
+    with blob_store.open(file_hash) as file_obj:
+        is_valid_docx = zipfile.is_zipfile(file_obj)
+    if not is_valid_docx:
+        # 无效的内容不会被任何提交引用，直接删除
+        blob_store.delete(file_hash)
+        return None
+    return file_hash, file_size
+
+
+def attach_submission_file(db: Session, submission: Optional[Submission], student_id: int, assignment_id: int,
+                           file_hash: str, file_size: int, file_name: str) -> Tuple[Submission, Optional[ParseJob], bool]:
+    """把已保存的文件关联到学生的提交（没有提交时新建，已有提交时覆盖文件并保留批改信息），不提交事务
+
+    内容相同的文件解析过时直接使用缓存的解析结果；否则创建解析任务，由调用方在事务提交后加入解析队列。
+    新建提交时由调用方更新任务统计。返回 (提交, 解析任务或 None, 是否命中缓存)
+    """
+    cached_result = get_cached_result(db, file_hash)
+    if submission is None:
+        submission = Submission(student_id=student_id, assignment_id=assignment_id)
+        db.add(submission)
+    submission.file_hash = file_hash
+    submission.file_size = file_size
+    submission.file_name = file_name
+
+    if cached_result is not None:
+        db.flush()
+        save_parsed_document(db, submission, cached_result)
+        submission.parse_status = ParseStatus.PARSED
+        return submission, None, True
+
+    if submission.id is not None:
+        clear_parsed_document(db, submission)
+    submission.parse_status = ParseStatus.PARSING
+    parse_job = ParseJob(submission=submission, file_hash=file_hash)
+    db.add(parse_job)
+    return submission, parse_job, False
+
+
+@dataclass
+class UploadedDocument:
+    """批量导入中的一个文档：显示名称、对应的学生用户名和打开文件内容的函数"""
+    file_name: str
+    student_name: Optional[str]
+    open_file: Optional[Callable[[], BinaryIO]] = None
+    error: Optional[str] = None
+
+
+def _zip_entry_name(info: zipfile.ZipInfo) -> str:
+    """zip 中的文件名（没有 UTF-8 标志时按 GBK 重新解码）"""
+    if info.flag_bits & ZIP_UTF8_FLAG:
+        return info.filename
+    try:
+        return info.filename.encode("cp437").decode("gbk")
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        return info.filename
+
+
+def _student_name_from_path(path: str) -> str:
+    """从文件路径得到学生用户名：学生名.docx 或 学生名/任意文件名.docx"""
+    parts = [part for part in path.split("/") if part]
+    if len(parts) > 1:
+        return parts[-2].strip()
+    return posixpath.splitext(parts[-1])[0].strip()
+
+
+def _is_ignored_entry(path: str) -> bool:
+    """压缩工具和 Word 生成的附属文件（__MACOSX、隐藏文件、~$ 临时文件）"""
+    return any(part == "__MACOSX" or part.startswith((".", "~$")) for part in path.split("/"))
+
+
+def iter_uploaded_documents(files: List[UploadFile]) -> Iterator[UploadedDocument]:
+    """展开上传的文件：docx 文件直接使用，zip 压缩包逐个列出其中的 docx 文件（只读取目录，不解压）"""
+    for upload in files:
+        file_name = upload.filename or ""
+        if file_name.lower().endswith(".docx"):
+            yield UploadedDocument(file_name, _student_name_from_path(file_name), open_file=lambda upload=upload: upload.file)
+            continue
+        if not file_name.lower().endswith(".zip"):
+            yield UploadedDocument(file_name, None, error="只支持docx文件或zip压缩包")
+            continue
+        try:
+            archive = zipfile.ZipFile(upload.file)
+        except zipfile.BadZipFile:
+            yield UploadedDocument(file_name, None, error="不是有效的zip压缩包")
+            continue
+        for info in archive.infolist():
+            path = _zip_entry_name(info)
+            if info.is_dir() or _is_ignored_entry(path):
+                continue
+            display_name = f"{file_name}/{path}"
+            if not path.lower().endswith(".docx"):
+                yield UploadedDocument(display_name, None, error="只支持docx文件")
+            elif info.file_size > settings.BULK_IMPORT_MAX_FILE_SIZE:
+                yield UploadedDocument(display_name, _student_name_from_path(path), error="文件过大")
+            else:
+                # 解压时流式读取，不会把整个文件读入内存
+                yield UploadedDocument(display_name, _student_name_from_path(path),
+                                       open_file=lambda archive=archive, info=info: archive.open(info))
@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from sqlalchemy import event
+from app.core.config import settings
+from app.models.user import User, UserRole
+
+
+@dataclass(frozen=True)
+class UserPrincipal:
+    """已认证用户的轻量身份信息（请求处理中代替 User 对象使用，只包含 id、用户名和角色）"""
+    id: int
+    name: str
+    role: UserRole
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserPrincipal":
+        return cls(id=user.id, name=user.name, role=user.role)
+
+
+class UserPrincipalCache:
+    """token -> 用户身份的进程内缓存（TTL + LRU），用户信息变更时按用户ID失效
+
+    失效只作用于当前进程：多进程部署时其他进程的缓存要等 TTL 到期才会更新，TTL 即跨进程的最长延迟。
+    """
+
+    def __init__(self, max_size: int, ttl: int):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # token -> (用户身份, 过期时间)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        # 用户ID -> 该用户已缓存的 token 集合
+        self._tokens_by_user = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, token: str):
+        """获取缓存的用户身份，未命中或已过期时返回 None"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry[1] <= now:
+                if entry is not None:
+                    self._remove(token)
+                self._misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, token: str, principal: UserPrincipal, token_exp: float = None) -> None:
+        """缓存用户身份；过期时间不超过 token 本身的过期时间"""
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+        expires_at = time.time() + self.ttl
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+            self._entries[token] = (principal, expires_at)
+            self._tokens_by_user.setdefault(principal.id, set()).add(token)
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._evictions += 1
+
+    def invalidate_token(self, token: str) -> None:
+        """使单个 token 的缓存失效"""
+        with self._lock:
+            if token in self._entries:
+                self._remove(token)
+                self._invalidations += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        """使某个用户所有 token 的缓存失效（用户信息修改或删除时调用）"""
+        with self._lock:
+            for token in list(self._tokens_by_user.get(user_id, ())):
+                self._remove(token)
+                self._invalidations += 1
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_user.clear()
+
+    def metrics(self) -> dict:
+        """缓存运行指标"""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / total, 4) if total else 0.0,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations
+            }
+
+    def _remove(self, token: str) -> None:
+        principal, _ = self._entries.pop(token)
+        tokens = self._tokens_by_user.get(principal.id)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_by_user[principal.id]
+
+
+# 全局认证用户缓存（多进程部署时各进程独立缓存）
+user_cache = UserPrincipalCache(max_size=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user_cache(mapper, connection, target: User) -> None:
+    """用户被修改（用户名、角色、密码等）或删除后，使本进程缓存的身份失效"""
+    user_cache.invalidate_user(target.id)
@@ -1,8 +1,7 @@
 from fastapi import HTTPException, status
 from app.models.user import User
 from app.models.class_model import Class
-from app.models.teacher_class import TeacherClass
-from app.models.student_class import StudentClass
+from app.utils.membership import ClassMemberRole, get_class_role
 from sqlalchemy.orm import Session
 
 def verify_teacher_permission(current_user: User):
@@ -22,41 +21,33 @@ def verify_student_permission(current_user: User):
             detail="只有学生可以执行此操作"
         )
 
-def verify_teacher_class_access(db: Session, class_id: int, current_user: User) -> None:
-    """验证教师对班级的访问权限（主教师或助教）"""
-    # 检查班级是否存在
-    target_class = db.query(Class).filter(Class.id == class_id).first()
-    if not target_class:
+def _verify_class_exists(db: Session, class_id: int) -> None:
+    """检查班级是否存在（只在权限校验失败时调用）"""
+    if not db.query(Class.id).filter(Class.id == class_id).first():
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="班级不存在"
         )
-        
-    # 检查是否是主教师
-    if target_class.teacher_id == current_user.id:
-        return  # 主教师有权限
-        
-    # 检查是否是助教
-    teacher_relation = db.query(TeacherClass).filter(
-        TeacherClass.teacher_id == current_user.id,
-        TeacherClass.class_id == class_id
-    ).first()
-        
-    if not teacher_relation:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="您没有权限在此班级创建任务"
-        )
+
+def verify_teacher_class_access(db: Session, class_id: int, current_user: User,
+                                detail: str = "您没有权限在此班级创建任务") -> None:
+    """验证教师对班级的访问权限（主教师或助教），detail 为没有权限时的提示"""
+    # 主教师和助教有权限
+    role = get_class_role(db, class_id, current_user)
+    if role in (ClassMemberRole.MAIN_TEACHER, ClassMemberRole.ASSISTANT_TEACHER):
+        return
+    
+    # 检查班级是否存在
+    _verify_class_exists(db, class_id)
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail=detail
+    )
 
 def verify_student_class_access(db: Session, class_id: int, current_user: User) -> None:
     """验证学生对班级的访问权限（已加入班级）"""
     # 检查学生是否已加入该班级
-    student_relation = db.query(StudentClass).filter(
-        StudentClass.student_id == current_user.id,
-        StudentClass.class_id == class_id
-    ).first()
-        
-    if not student_relation:
+    if get_class_role(db, class_id, current_user) != ClassMemberRole.STUDENT:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="您需要先加入该班级才能查看任务"
@@ -64,36 +55,15 @@ def verify_student_class_access(db: Session, class_id: int, current_user: User)
 
 def verify_class_member_access(db: Session, class_id: int, current_user: User) -> None:
     """验证用户对班级的访问权限（班级内所有成员：主教师、助教、学生）"""
-    # 检查班级是否存在
-    target_class = db.query(Class).filter(Class.id == class_id).first()
-    if not target_class:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="班级不存在"
-        )
-    
-    # 检查是否是主教师
-    if target_class.teacher_id == current_user.id:
-        return  # 主教师有权限
+    # 班级成员（主教师、助教、学生）都有权限
+    if get_class_role(db, class_id, current_user) is not None:
+        return
     
-    # 检查是否是助教
-    teacher_relation = db.query(TeacherClass).filter(
-        TeacherClass.teacher_id == current_user.id,
-        TeacherClass.class_id == class_id
-    ).first()
-    if teacher_relation:
-        return  # 助教有权限
-    
-    # 检查是否是学生
-    student_relation = db.query(StudentClass).filter(
-        StudentClass.student_id == current_user.id,
-        StudentClass.class_id == class_id
-    ).first()
-    if student_relation:
-        return  # 学生有权限
+    # 检查班级是否存在
+    _verify_class_exists(db, class_id)
     
     # 如果都不是，则没有权限
     raise HTTPException(
         status_code=status.HTTP_403_FORBIDDEN,
         detail="您不是该班级的成员，无法查看班级任务"
-    )
\ No newline at end of file
+    )
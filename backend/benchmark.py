@@ -0,0 +1,137 @@
+"""
+接口并发压测脚本
+
+模拟多个并发用户持续访问常用接口（其中一部分请求为登录，用于观察 bcrypt 等耗时操作对其他请求的影响），
+统计各接口延迟的 p50/p95/p99。
+
+用法（先启动服务：uvicorn app.main:app）：
+    python benchmark.py --base-url http://127.0.0.1:8000 --users 100 --duration 30
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+import uuid
+
+import httpx
+
+PASSWORD = "benchmark-password"
+
+
+def percentile(values, q):
+    """计算百分位数（线性插值）"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q
+    lower = int(pos)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (pos - lower)
+
+
+async def register_and_login(client, name, role):
+    """注册并登录用户，返回认证请求头"""
+    await client.post("/auth/register", json={"name": name, "password": PASSWORD, "role": role})
+    response = await client.post("/auth/login", data={"username": name, "password": PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def prepare(client, users):
+    """准备压测数据：一个教师、一个班级、一个任务和若干学生"""
+    prefix = uuid.uuid4().hex[:8]
+    teacher = await register_and_login(client, f"bench_t_{prefix}", "teacher")
+    response = await client.post("/classes/", json={"name": f"压测班级_{prefix}"}, headers=teacher)
+    response.raise_for_status()
+    class_id = response.json()["id"]
+    response = await client.post("/assignments/", json={"title": "压测任务", "class_id": class_id}, headers=teacher)
+    response.raise_for_status()
+    assignment_id = response.json()["id"]
+
+    async def create_student(i):
+        name = f"bench_s_{prefix}_{i}"
+        headers = await register_and_login(client, name, "student")
+        await client.post("/classes/join", json={"class_id": class_id}, headers=headers)
+        return name, headers
+
+    # 限制准备阶段的并发，避免注册请求本身超时
+    semaphore = asyncio.Semaphore(10)
+
+    async def create_student_limited(i):
+        async with semaphore:
+            return await create_student(i)
+
+    students = await asyncio.gather(*(create_student_limited(i) for i in range(users)))
+    return teacher, class_id, assignment_id, students
+
+
+async def virtual_user(client, deadline, name, headers, teacher, class_id, assignment_id, login_ratio, samples):
+    """单个虚拟用户：在截止时间前循环发送请求"""
+    endpoints = [
+        ("GET /classes/my-classes", lambda: client.get("/classes/my-classes", headers=headers)),
+        ("GET /submissions/my-submissions", lambda: client.get("/submissions/my-submissions", headers=headers)),
+        ("GET /submissions/my-submissions/pending", lambda: client.get("/submissions/my-submissions/pending", headers=headers)),
+        ("GET /assignments/class/{id}", lambda: client.get(f"/assignments/class/{class_id}", headers=headers)),
+        ("GET /submissions/assignment/{id}", lambda: client.get(f"/submissions/assignment/{assignment_id}", headers=teacher)),
+    ]
+    login = ("POST /auth/login", lambda: client.post("/auth/login", data={"username": name, "password": PASSWORD}))
+    while time.perf_counter() < deadline:
+        label, send = login if random.random() < login_ratio else random.choice(endpoints)
+        start = time.perf_counter()
+        try:
+            response = await send()
+            ok = response.status_code < 500
+        except httpx.HTTPError:
+            ok = False
+        samples.append((label, (time.perf_counter() - start) * 1000, ok))
+
+
+async def run(args):
+    limits = httpx.Limits(max_connections=args.users + 10, max_keepalive_connections=args.users + 10)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60, limits=limits) as client:
+        print(f"准备数据（{args.users} 个学生）...")
+        teacher, class_id, assignment_id, students = await prepare(client, args.users)
+
+        print(f"开始压测：{args.users} 个并发用户，持续 {args.duration} 秒，登录请求占比 {args.login_ratio:.0%}")
+        samples = []
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(*(
+            virtual_user(client, deadline, name, headers, teacher, class_id, assignment_id, args.login_ratio, samples)
+            for name, headers in students
+        ))
+
+    report(samples, args.duration)
+
+
+def report(samples, duration):
+    """输出延迟统计"""
+    if not samples:
+        print("没有完成任何请求")
+        return
+    groups = {"ALL": [latency for _, latency, _ in samples]}
+    for label, latency, _ in samples:
+        groups.setdefault(label, []).append(latency)
+    errors = sum(1 for _, _, ok in samples if not ok)
+
+    print(f"\n请求总数: {len(samples)}  吞吐: {len(samples) / duration:.1f} req/s  错误: {errors}")
+    print(f"{'接口':<42}{'次数':>8}{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'max(ms)':>10}")
+    for label, latencies in groups.items():
+        print(f"{label:<42}{len(latencies):>8}"
+              f"{statistics.median(latencies):>10.1f}{percentile(latencies, 0.95):>10.1f}"
+              f"{percentile(latencies, 0.99):>10.1f}{max(latencies):>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="APRP 接口并发压测")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="服务地址")
+    parser.add_argument("--users", type=int, default=100, help="并发用户数")
+    parser.add_argument("--duration", type=float, default=30, help="压测时长（秒）")
+    parser.add_argument("--login-ratio", type=float, default=0.02, help="登录请求占比")
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args))
+    except httpx.HTTPError as e:
+        print(f"压测失败: {e!r}")
+        sys.exit(1)
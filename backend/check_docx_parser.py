@@ -0,0 +1,156 @@
+"""
+检查流式docx解析与 python-docx 解析的一致性并比较性能
+
+依次解析 test/test.docx 和若干合成文档（包括标题、表格、超链接、换行、制表符、空段落、
+未定义样式等情况，以及指定段落数的大文档），逐个比较两种解析方式的输出，任何不一致都会以非零状态退出。
+同时在独立进程中分别解析最大的合成文档，报告耗时和内存峰值（内存峰值只在支持 resource 模块的系统上统计）。
+
+用法：
+    python check_docx_parser.py                      # 默认大文档 20000 段（约 200 页论文的数倍）
+    python check_docx_parser.py --paragraphs 50000 --repeat 3
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+
+def add_hyperlink(paragraph, text, url):
+    """在段落末尾添加超链接（python-docx 没有直接的接口）"""
+    from docx.opc.constants import RELATIONSHIP_TYPE
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+
+    rel_id = paragraph.part.relate_to(url, RELATIONSHIP_TYPE.HYPERLINK, is_external=True)
+    hyperlink = OxmlElement("w:hyperlink")
+    hyperlink.set(qn("r:id"), rel_id)
+    run = OxmlElement("w:r")
+    text_element = OxmlElement("w:t")
+    text_element.text = text
+    run.append(text_element)
+    hyperlink.append(run)
+    paragraph._p.append(hyperlink)
+
+
+def build_document(paragraphs: int) -> bytes:
+    """生成合成文档：按章节循环写入各级标题、正文、表格和特殊内容"""
+    from docx import Document
+    from docx.enum.style import WD_STYLE_TYPE
+    from docx.enum.text import WD_BREAK
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+
+    document = Document()
+    document.styles.add_style("Heading Custom", WD_STYLE_TYPE.PARAGRAPH)
+    document.add_heading("合成测试文档", level=0)
+    written = 1
+    section = 0
+    while written < paragraphs:
+        section += 1
+        document.add_heading(f"第{section}章 测试章节", level=1)
+        document.add_heading(f"{section}.1 小节", level=2)
+        document.add_heading(f"{section}.1.1 三级标题", level=(section % 9) + 1)
+        for i in range(20):
+            document.add_paragraph(f"第{section}章第{i}段正文内容，包含 English words 和数字 {i * section}。" * 3)
+        paragraph = document.add_paragraph("制表符\t之后")
+        paragraph.add_run(" 空格 ").add_break()
+        paragraph.add_run("换行之后")
+        paragraph.add_run().add_break(WD_BREAK.PAGE)
+        add_hyperlink(document.add_paragraph("参见 "), "超链接文本", "https://example.com")
+        document.add_paragraph("")
+        document.add_paragraph("   ")
+        document.add_paragraph("自定义标题样式", style="Heading Custom")
+        paragraph = document.add_paragraph("未定义的样式ID")
+        paragraph._p.get_or_add_pPr().append(OxmlElement("w:pStyle", attrs={qn("w:val"): "NoSuchStyle"}))
+        table = document.add_table(rows=2, cols=2)
+        for row_index, row in enumerate(table.rows):
+            for column_index, cell in enumerate(row.cells):
+                cell.text = f"表格 {row_index}-{column_index}"
+        written += 32
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def measure(parser_name: str, content: bytes, repeat: int):
+    """在独立进程中解析文档，返回 (最短耗时, 内存峰值增量 MB 或 None)"""
+    from app.utils.parser_utils import parse_docx_stream, parse_docx_python_docx
+    parser = parse_docx_stream if parser_name == "stream" else parse_docx_python_docx
+    try:
+        import resource
+    except ImportError:
+        resource = None
+
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else 0
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parser(io.BytesIO(content))
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    if resource is None:
+        return best, None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before
+    # Linux 上 ru_maxrss 的单位是 KB，macOS 上是字节
+    return best, peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="检查流式docx解析与 python-docx 解析的一致性并比较性能")
+    parser.add_argument("--paragraphs", type=int, default=20000, help="大文档的段落数")
+    parser.add_argument("--repeat", type=int, default=1, help="性能测试的重复次数（取最短耗时）")
+    args = parser.parse_args()
+
+    # 确保在backend目录下操作
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(script_dir)
+    sys.path.append(script_dir)
+
+    from app.utils.parser_utils import parse_docx_stream, parse_docx_python_docx
+
+    samples = []
+    sample_path = os.path.join(script_dir, "..", "test", "test.docx")
+    if os.path.exists(sample_path):
+        with open(sample_path, "rb") as f:
+            samples.append(("test/test.docx", f.read()))
+    else:
+        print("⚠️  没有找到 test/test.docx，只检查合成文档")
+    for count in (50, 1000, args.paragraphs):
+        samples.append((f"合成文档（{count} 段）", build_document(count)))
+
+    failures = []
+    for name, content in samples:
+        expected = parse_docx_python_docx(io.BytesIO(content))
+        actual = parse_docx_stream(io.BytesIO(content))
+        if actual == expected:
+            print(f"✅ {name}：{actual['paragraph_count']} 个段落、{len(actual['outline'])} 个标题，输出一致")
+            continue
+        failures.append(name)
+        print(f"❌ {name}：输出不一致")
+        for key in ("total_words_count", "paragraph_count", "paragraphs", "outline", "outline_tree"):
+            if actual[key] != expected[key]:
+                print(f"   {key} 不同")
+
+    name, content = samples[-1]
+    print(f"\n性能对比：{name}，{len(content) / 1024 / 1024:.1f} MB")
+    results = {}
+    for parser_name in ("python-docx", "stream"):
+        # 每种解析方式使用新的进程，内存峰值互不影响
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            results[parser_name] = pool.submit(measure, parser_name, content, args.repeat).result()
+        elapsed, peak = results[parser_name]
+        memory = f"，内存峰值增加 {peak:.1f} MB" if peak is not None else ""
+        print(f"  {parser_name}: {elapsed:.2f} 秒{memory}")
+    print(f"  流式解析速度为 python-docx 的 {results['python-docx'][0] / results['stream'][0]:.1f} 倍")
+
+    if failures:
+        print(f"\n❌ 解析结果不一致: {', '.join(failures)}")
+        sys.exit(1)
+    print("\n✅ 两种解析方式的输出完全一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+检查列表接口的 SQL 语句数
+
+在临时 SQLite 数据库上执行全部迁移（alembic upgrade head），分别写入少量和较多的样例数据，依次调用各个
+列表接口的服务方法，通过 before_cursor_execute 事件统计每次调用发出的 SQL 语句数。语句数随数据量增长
+（出现 N+1 查询）或超过接口的预算时，脚本以非零状态退出，可以放在 CI 中防止列表查询退化。
+
+批量导入每个文件都要查询解析缓存，语句数必然随文件数增长，因此单独检查：每个文件增加的语句数不能超过
+每文件预算，总语句数不能超过固定预算加每文件预算乘以文件数。
+
+用法：
+    python check_query_counts.py            # 检查全部列表接口
+    python check_query_counts.py -v         # 同时打印每次调用的 SQL 语句
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+# 两种数据规模：班级数和学生数（每个班级两个任务，每个学生提交每个班级的第一个任务，一半已评分）
+SMALL_SIZE = 3
+LARGE_SIZE = 15
+
+
+def docx_upload(name: str):
+    """构造一个内容随名称变化的最小 docx 上传文件（只需是有效的 zip 压缩包，不会被解析）"""
+    import io
+    import zipfile
+    from fastapi import UploadFile
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", name)
+    buffer.seek(0)
+    return UploadFile(file=buffer, filename=f"{name}.docx")
+
+
+def seed(db, size: int):
+    """写入样例数据：主教师、助教、size 个学生和 size 个班级，所有学生加入所有班级，列表的记录数随 size 增长"""
+    from app.models import User, Class, TeacherClass, StudentClass, Assignment, Submission
+    from app.models.user import UserRole
+    from app.models.teacher_class import TeacherRole
+    from app.models.submission import ParseStatus
+    from app.utils.score_statistics import rebuild_assignment_stats
+
+    teacher = User(name=f"count_teacher_{size}", password_hash="x", role=UserRole.TEACHER)
+    assistant = User(name=f"count_assistant_{size}", password_hash="x", role=UserRole.TEACHER)
+    students = [User(name=f"count_student_{size}_{i}", password_hash="x", role=UserRole.STUDENT) for i in range(size)]
+    db.add_all([teacher, assistant, *students])
+    db.flush()
+
+    classes = [Class(name=f"语句数检查班级{size}_{i}", class_code=f"COUNT{size}X{i}", teacher_id=teacher.id)
+               for i in range(size)]
+    db.add_all(classes)
+    db.flush()
+    for class_obj in classes:
+        db.add(TeacherClass(teacher_id=teacher.id, class_id=class_obj.id, role=TeacherRole.MAIN_TEACHER))
+        db.add(TeacherClass(teacher_id=assistant.id, class_id=class_obj.id, role=TeacherRole.ASSISTANT_TEACHER))
+        db.add_all([StudentClass(student_id=s.id, class_id=class_obj.id) for s in students])
+
+    assignments = [Assignment(title=f"任务{i}", class_id=class_obj.id, teacher_id=teacher.id)
+                   for class_obj in classes for i in range(2)]
+    db.add_all(assignments)
+    db.flush()
+    # 每个班级的第二个任务没有人提交（待提交任务）
+    db.add_all([
+        Submission(student_id=student.id, assignment_id=assignment.id, file_name=f"{student.name}.docx",
+                   parse_status=ParseStatus.PARSED, score=60 + i if i % 2 else None)
+        for assignment in assignments[::2] for i, student in enumerate(students)
+    ])
+    rebuild_assignment_stats(db)
+    db.commit()
+    return {
+        "teacher": teacher, "assistant": assistant, "student": students[0], "students": students,
+        "class_id": classes[0].id, "assignment_id": assignments[0].id, "pending_assignment_id": assignments[1].id,
+    }
+
+
+def list_calls(data):
+    """列表接口：(名称, 语句数预算, 调用函数)；每个函数接收数据库会话并返回结果列表"""
+    from fastapi import Response
+    from app.schemas.pagination import PageParams
+    from app.schemas.class_schema import ClassRosterQuery
+    from app.schemas.submission_schema import SubmissionListFilter
+    from app.services.class_service import ClassService
+    from app.services.assignment_service import AssignmentService
+    from app.services.submission_service import SubmissionService
+    from app.utils.user_cache import UserPrincipal
+
+    teacher = UserPrincipal.from_user(data["teacher"])
+    assistant = UserPrincipal.from_user(data["assistant"])
+    student = UserPrincipal.from_user(data["student"])
+    class_id, assignment_id = data["class_id"], data["assignment_id"]
+
+    return [
+        ("我的提交", 1, lambda db: SubmissionService.get_my_submissions(db, student, PageParams(), Response())),
+        ("按班级查看我的提交", 2, lambda db: SubmissionService.get_my_submissions_by_class(
+            db, class_id, student, PageParams(), Response())),
+        ("按任务查看我的提交", 3, lambda db: SubmissionService.get_my_submissions_by_assignment(
+            db, assignment_id, student, PageParams(), Response())),
+        ("待提交任务", 1, lambda db: SubmissionService.get_pending_assignments(db, student, PageParams(), Response())),
+        ("任务提交列表", 3, lambda db: SubmissionService.get_assignment_submissions(
+            db, assignment_id, teacher, SubmissionListFilter(), Response())),
+        ("班级提交列表", 2, lambda db: SubmissionService.get_class_submissions(
+            db, class_id, assistant, SubmissionListFilter(), Response())),
+        ("学生提交列表", 2, lambda db: SubmissionService.get_student_submissions(
+            db, student.id, teacher, SubmissionListFilter(), Response())),
+        ("未批改提交", 3, lambda db: SubmissionService.get_ungraded_submissions(
+            db, assignment_id, teacher, SubmissionListFilter(), Response())),
+        ("我的班级（教师）", 2, lambda db: ClassService.get_my_classes(db, teacher, PageParams(), Response())),
+        ("我的班级（学生）", 2, lambda db: ClassService.get_my_classes(db, student, PageParams(), Response())),
+        ("我创建的班级", 1, lambda db: ClassService.get_my_created_classes(db, teacher, PageParams(), Response())),
+        ("我加入的班级", 1, lambda db: ClassService.get_my_joined_classes(db, assistant, PageParams(), Response())),
+        ("班级学生列表", 2, lambda db: ClassService.get_class_students(db, class_id, teacher).students),
+        ("班级花名册", 2, lambda db: ClassService.get_class_roster(
+            db, class_id, assistant, ClassRosterQuery(), Response())),
+        ("班级任务列表", 2, lambda db: AssignmentService.get_class_assignments(
+            db, class_id, student, PageParams(), Response())),
+        ("我创建的任务", 1, lambda db: AssignmentService.get_my_assignments(db, teacher, PageParams(), Response())),
+    ]
+
+
+def import_calls(data):
+    """批量导入接口：(名称, 固定语句数预算, 每文件语句数预算, 调用函数)；每个学生导入一个文件，返回逐个文件的结果
+
+    每个文件需要查询解析缓存、插入提交和解析任务，共 3 条语句；提交事务后不能再逐个重新加载提交和解析任务。
+    """
+    from app.services.submission_service import SubmissionService
+    from app.utils.user_cache import UserPrincipal
+
+    teacher = UserPrincipal.from_user(data["teacher"])
+    assignment_id = data["pending_assignment_id"]
+    names = [student.name for student in data["students"]]
+
+    return [
+        ("批量导入提交", 5, 3, lambda db: SubmissionService.bulk_import_submissions(
+            db, assignment_id, [docx_upload(name) for name in names], teacher).items),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="检查列表接口的 SQL 语句数")
+    parser.add_argument("-v", "--verbose", action="store_true", help="打印每次调用的 SQL 语句")
+    args = parser.parse_args()
+
+    # 在临时目录中执行（数据库地址是相对路径），并确保可以导入 app
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    sys.path.append(script_dir)
+    work_dir = tempfile.TemporaryDirectory()
+    os.chdir(work_dir.name)
+
+    from alembic import command
+    from alembic.config import Config
+    from sqlalchemy import event
+
+    command.upgrade(Config(os.path.join(script_dir, "alembic.ini")), "head")
+
+    from app.db.database import SessionLocal, engine
+    from app import models  # noqa: F401  注册所有模型
+
+    db = SessionLocal()
+    try:
+        small_data, large_data = seed(db, SMALL_SIZE), seed(db, LARGE_SIZE)
+        small_calls, large_calls = list_calls(small_data), list_calls(large_data)
+        small_imports, large_imports = import_calls(small_data), import_calls(large_data)
+    finally:
+        db.close()
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def count(call):
+        """调用一次列表接口，返回 (语句数, 返回的记录数)"""
+        statements.clear()
+        db = SessionLocal()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            result = call(db)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+            db.rollback()
+            db.close()
+        return len(statements), len(result)
+
+    failures = []
+    for (name, budget, small_call), (_, _, large_call) in zip(small_calls, large_calls):
+        small_count, small_rows = count(small_call)
+        large_count, large_rows = count(large_call)
+        if args.verbose:
+            print(f"\n[{name}]\n  " + "\n  ".join(statements))
+        summary = f"{name}：{small_rows} 条记录 {small_count} 条语句，{large_rows} 条记录 {large_count} 条语句"
+        if small_count != large_count or large_count > budget:
+            failures.append(name)
+            print(f"❌ {summary}（预算 {budget} 条）")
+        else:
+            print(f"✅ {summary}")
+
+    for (name, budget, per_file, small_call), (_, _, _, large_call) in zip(small_imports, large_imports):
+        small_count, small_rows = count(small_call)
+        large_count, large_rows = count(large_call)
+        if args.verbose:
+            print(f"\n[{name}]\n  " + "\n  ".join(statements))
+        summary = f"{name}：{small_rows} 个文件 {small_count} 条语句，{large_rows} 个文件 {large_count} 条语句"
+        if large_count - small_count > per_file * (large_rows - small_rows) or large_count > budget + per_file * large_rows:
+            failures.append(name)
+            print(f"❌ {summary}（预算 {budget} 条 + 每个文件 {per_file} 条）")
+        else:
+            print(f"✅ {summary}")
+
+    engine.dispose()
+    if failures:
+        print(f"\n{len(failures)} 个接口的语句数随数据量增长或超过预算")
+        sys.exit(1)
+    print("\n✅ 所有列表接口的语句数都是固定的，批量导入的语句数没有超过预算")
+
+
+if __name__ == "__main__":
+    main()
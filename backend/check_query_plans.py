@@ -0,0 +1,250 @@
+"""
+检查热点查询的执行计划
+
+在临时 SQLite 数据库上执行全部迁移（alembic upgrade head）并写入少量样例数据，然后依次调用各个
+服务方法，记录它们发出的 SQL 语句并逐条执行 EXPLAIN QUERY PLAN。只要有热点查询对业务表做全表扫描
+（计划中出现 SCAN 表名），脚本就以非零状态退出，可以放在 CI 中防止索引缺失或查询写法退化。
+
+临时数据库不执行 ANALYZE，SQLite 会按大表估算代价，因此得到的计划与数据量很大时一致。
+
+用法：
+    python check_query_plans.py            # 检查全部热点查询
+    python check_query_plans.py -v         # 同时打印每条语句的执行计划
+"""
+import argparse
+import asyncio
+import os
+import re
+import sys
+import tempfile
+
+# 计划中的全表扫描：SCAN 表名[ AS 别名][ USING [COVERING ]INDEX ...]（常量行以及使用 MATCH 的 FTS5 全文索引
+# 查询除外；只检查业务表，子查询和聚合子查询的 SCAN 不算）
+FULL_SCAN = re.compile(r"^SCAN (?!CONSTANT ROW)(?!\()(?!\w+ VIRTUAL TABLE INDEX \d+:M)(\w+)")
+
+
+def seed(db):
+    """写入样例数据：主教师、助教、三个学生、一个班级、两个任务和若干提交"""
+    from app.models import User, Class, TeacherClass, StudentClass, Assignment, Submission
+    from app.models.user import UserRole
+    from app.models.teacher_class import TeacherRole
+    from app.models.submission import ParseStatus
+    from app.utils.score_statistics import rebuild_assignment_stats
+    from app.utils.parsed_document import save_parsed_document
+
+    teacher = User(name="plan_teacher", password_hash="x", role=UserRole.TEACHER)
+    assistant = User(name="plan_assistant", password_hash="x", role=UserRole.TEACHER)
+    students = [User(name=f"plan_student_{i}", password_hash="x", role=UserRole.STUDENT) for i in range(3)]
+    db.add_all([teacher, assistant, *students])
+    db.flush()
+
+    class_obj = Class(name="执行计划检查班级", class_code="PLANCHECK01", teacher_id=teacher.id)
+    db.add(class_obj)
+    db.flush()
+    db.add(TeacherClass(teacher_id=teacher.id, class_id=class_obj.id, role=TeacherRole.MAIN_TEACHER))
+    db.add(TeacherClass(teacher_id=assistant.id, class_id=class_obj.id, role=TeacherRole.ASSISTANT_TEACHER))
+    db.add_all([StudentClass(student_id=s.id, class_id=class_obj.id) for s in students])
+
+    assignments = [Assignment(title=f"任务{i}", class_id=class_obj.id, teacher_id=teacher.id) for i in range(2)]
+    db.add_all(assignments)
+    db.flush()
+    submissions = [
+        Submission(student_id=students[0].id, assignment_id=assignments[0].id, file_name="a.docx",
+                   parse_status=ParseStatus.PARSED, score=85, report="ok"),
+        Submission(student_id=students[1].id, assignment_id=assignments[0].id, file_name="b.docx",
+                   parse_status=ParseStatus.PARSED),
+        Submission(student_id=students[0].id, assignment_id=assignments[1].id, file_name="c.docx",
+                   parse_status=ParseStatus.PARSED),
+    ]
+    db.add_all(submissions)
+    db.flush()
+    document = {
+        "total_words_count": 6, "paragraph_count": 2,
+        "paragraphs": [{"id": 0, "text": "标题", "word_count": 2}, {"id": 1, "text": "正文内容", "word_count": 4}],
+        "outline": [{"id": 0, "text": "标题", "level": 1, "style": "Heading 1"}],
+    }
+    for submission in submissions:
+        save_parsed_document(db, submission, document)
+    rebuild_assignment_stats(db)
+    db.commit()
+    return {
+        "teacher": teacher, "assistant": assistant, "student": students[0],
+        "class_id": class_obj.id, "class_code": class_obj.class_code, "assignment_id": assignments[0].id,
+        "submission_id": submissions[1].id,
+    }
+
+
+def hot_queries(data):
+    """热点查询：(名称, 调用函数)；每个函数接收数据库会话"""
+    from fastapi import Response
+    from app.schemas.pagination import PageParams
+    from app.schemas.class_schema import ClassSearch, ClassRosterQuery
+    from app.schemas.submission_schema import (
+        SubmissionListFilter, SubmissionGrade, SubmissionDetailQuery, SubmissionBatchGrade, ExportFormat
+    )
+    from app.services.auth_service import AuthService
+    from app.services.class_service import ClassService
+    from app.services.assignment_service import AssignmentService
+    from app.services.submission_service import SubmissionService
+    from app.utils.auth import create_access_token
+    from app.utils.user_cache import UserPrincipal, user_cache
+
+    teacher = UserPrincipal.from_user(data["teacher"])
+    assistant = UserPrincipal.from_user(data["assistant"])
+    student = UserPrincipal.from_user(data["student"])
+    class_id, assignment_id, submission_id = data["class_id"], data["assignment_id"], data["submission_id"]
+
+    def paged(call):
+        """先取第一页，再用返回的游标取第二页（两次查询都会被检查）"""
+        response = Response()
+        call(PageParams(limit=1), response)
+        call(PageParams(limit=1, cursor=response.headers.get("X-Next-Cursor")), Response())
+
+    def searched(db, search_term):
+        response = Response()
+        ClassService.search_classes(db, ClassSearch(search_term=search_term, limit=1), student, response)
+        cursor = response.headers.get("X-Next-Cursor")
+        ClassService.search_classes(db, ClassSearch(search_term=search_term, limit=1, cursor=cursor), student, Response())
+
+    def filtered(call, **filters):
+        response = Response()
+        call(SubmissionListFilter(limit=1, **filters), response)
+        call(SubmissionListFilter(limit=1, cursor=response.headers.get("X-Next-Cursor"), **filters), Response())
+
+    def drain(response):
+        """读取完流式响应（导出的查询在输出响应内容时才执行）"""
+        async def read():
+            async for _ in response.body_iterator:
+                pass
+        asyncio.run(read())
+
+    def authenticate(db):
+        user_cache.clear()
+        AuthService.get_current_user_by_token(create_access_token({"sub": str(teacher.id)}), db)
+
+    return [
+        ("认证：按 token 加载用户", authenticate),
+        ("我的班级（教师）", lambda db: paged(lambda p, r: ClassService.get_my_classes(db, teacher, p, r))),
+        ("我的班级（学生）", lambda db: paged(lambda p, r: ClassService.get_my_classes(db, student, p, r))),
+        ("我创建的班级", lambda db: paged(lambda p, r: ClassService.get_my_created_classes(db, teacher, p, r))),
+        ("我加入的班级", lambda db: paged(lambda p, r: ClassService.get_my_joined_classes(db, assistant, p, r))),
+        ("搜索班级（班级代码）", lambda db: searched(db, data["class_code"])),
+        ("搜索班级（全文索引）", lambda db: searched(db, "执行计划")),
+        ("班级学生列表", lambda db: ClassService.get_class_students(db, class_id, teacher)),
+        ("班级花名册", lambda db: paged(lambda p, r: ClassService.get_class_roster(
+            db, class_id, assistant, ClassRosterQuery(**p.model_dump(), sort_by="average_score", order="desc"), r))),
+        ("班级任务列表", lambda db: paged(lambda p, r: AssignmentService.get_class_assignments(db, class_id, student, p, r))),
+        ("我创建的任务", lambda db: paged(lambda p, r: AssignmentService.get_my_assignments(db, teacher, p, r))),
+        ("我的提交", lambda db: paged(lambda p, r: SubmissionService.get_my_submissions(db, student, p, r))),
+        ("按班级查看我的提交", lambda db: paged(lambda p, r: SubmissionService.get_my_submissions_by_class(db, class_id, student, p, r))),
+        ("按任务查看我的提交", lambda db: paged(lambda p, r: SubmissionService.get_my_submissions_by_assignment(db, assignment_id, student, p, r))),
+        ("待提交任务", lambda db: paged(lambda p, r: SubmissionService.get_pending_assignments(db, student, p, r))),
+        ("任务提交列表", lambda db: filtered(lambda f, r: SubmissionService.get_assignment_submissions(db, assignment_id, teacher, f, r))),
+        ("任务提交列表（按评分状态和分数筛选）", lambda db: filtered(
+            lambda f, r: SubmissionService.get_assignment_submissions(db, assignment_id, teacher, f, r),
+            graded=True, min_score=60, max_score=100)),
+        ("任务提交列表（按学生姓名前缀筛选）", lambda db: filtered(
+            lambda f, r: SubmissionService.get_assignment_submissions(db, assignment_id, teacher, f, r),
+            student_name="plan_student")),
+        ("班级提交列表", lambda db: filtered(lambda f, r: SubmissionService.get_class_submissions(db, class_id, teacher, f, r))),
+        ("学生提交列表", lambda db: filtered(lambda f, r: SubmissionService.get_student_submissions(db, student.id, teacher, f, r))),
+        ("未批改提交", lambda db: filtered(lambda f, r: SubmissionService.get_ungraded_submissions(db, assignment_id, teacher, f, r))),
+        ("提交详情", lambda db: SubmissionService.get_submission_detail(db, submission_id, teacher, SubmissionDetailQuery())),
+        ("提交详情（段落区间）", lambda db: SubmissionService.get_submission_detail(
+            db, submission_id, teacher, SubmissionDetailQuery(include=["paragraphs"], offset=1, limit=1))),
+        ("解析状态", lambda db: SubmissionService.get_parse_status(db, submission_id, teacher)),
+        ("任务统计", lambda db: SubmissionService.get_assignment_statistics(db, assignment_id, teacher)),
+        ("导出任务成绩表", lambda db: drain(SubmissionService.export_assignment_grades(db, assignment_id, teacher, ExportFormat.CSV))),
+        ("导出班级成绩册", lambda db: drain(SubmissionService.export_class_grades(db, class_id, teacher, ExportFormat.CSV))),
+        ("打包下载原始文件", lambda db: drain(SubmissionService.export_assignment_files(db, assignment_id, teacher))),
+        ("批改提交", lambda db: SubmissionService.grade_submission(
+            db, submission_id, SubmissionGrade(score=90, report="检查执行计划"), teacher)),
+        ("批量批改", lambda db: SubmissionService.batch_grade_submissions(db, SubmissionBatchGrade(items=[
+            {"submission_id": submission_id, "score": 80, "report": "检查执行计划"},
+            {"submission_id": submission_id + 1, "score": 70, "report": "检查执行计划"},
+        ]), assistant)),
+    ]
+
+
+def explain(connection, statement, parameters):
+    """返回语句的执行计划（每行为 detail 文本）"""
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+    return [row[-1] for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="检查热点查询的执行计划")
+    parser.add_argument("-v", "--verbose", action="store_true", help="打印每条语句的执行计划")
+    args = parser.parse_args()
+
+    # 在临时目录中执行（数据库地址是相对路径），并确保可以导入 app
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    sys.path.append(script_dir)
+    work_dir = tempfile.TemporaryDirectory()
+    os.chdir(work_dir.name)
+
+    from alembic import command
+    from alembic.config import Config
+    from sqlalchemy import event
+
+    command.upgrade(Config(os.path.join(script_dir, "alembic.ini")), "head")
+
+    from app.db.database import SessionLocal, engine
+    from app import models  # noqa: F401  注册所有模型
+    from app.db.database import Base
+    from app.models.class_search import class_search_table
+
+    tables = set(Base.metadata.tables) | {class_search_table.name}
+
+    db = SessionLocal()
+    try:
+        data = seed(db)
+        queries = hot_queries(data)
+    finally:
+        db.close()
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")):
+            statements.append((statement, parameters))
+
+    failures = []
+    for name, call in queries:
+        statements.clear()
+        db = SessionLocal()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            call(db)
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+            db.rollback()
+            db.close()
+
+        with engine.connect() as connection:
+            scans = []
+            for statement, parameters in statements:
+                plan = explain(connection, statement, parameters)
+                found = [line for line in plan if (scan := FULL_SCAN.match(line)) and scan.group(1) in tables]
+                if found:
+                    scans.append((statement, plan))
+                if args.verbose:
+                    print(f"\n[{name}]\n{statement}\n  " + "\n  ".join(plan))
+        if scans:
+            failures.append((name, scans))
+            print(f"❌ {name}：{len(scans)}/{len(statements)} 条语句存在全表扫描")
+        else:
+            print(f"✅ {name}：{len(statements)} 条语句")
+
+    engine.dispose()
+    if failures:
+        print("\n存在全表扫描的语句：")
+        for name, scans in failures:
+            for statement, plan in scans:
+                print(f"\n[{name}]\n{statement}\n  " + "\n  ".join(plan))
+        sys.exit(1)
+    print("\n✅ 所有热点查询都使用了索引")
+
+
+if __name__ == "__main__":
+    main()
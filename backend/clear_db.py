@@ -28,8 +28,12 @@ def clear_database():
         from app.models.class_model import Class
         from app.models.assignment import Assignment
         from app.models.submission import Submission
+        from app.models.submission_paragraph import SubmissionParagraph
         from app.models.student_class import StudentClass
         from app.models.teacher_class import TeacherClass
+        from app.models.parse_job import ParseJob
+        from app.models.parse_cache import ParseCache
+        from app.models.assignment_stats import AssignmentStats
         # 创建所有表
         Base.metadata.create_all(bind=engine)
         print("✅ 新数据库创建完成！")
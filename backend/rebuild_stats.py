@@ -0,0 +1,43 @@
+"""
+重建任务分数统计汇总表（assignment_stats）
+
+统计数据随提交和批改增量维护；如果数据库被手工修改或出现偏差，可以用本脚本根据提交表重新计算。
+
+用法：
+    python rebuild_stats.py                # 重建所有任务
+    python rebuild_stats.py 3 5 8          # 只重建指定任务
+"""
+import argparse
+import os
+import sys
+
+
+def main():
+    parser = argparse.ArgumentParser(description="重建任务分数统计汇总表")
+    parser.add_argument("assignment_ids", nargs="*", type=int, help="要重建的任务ID（默认全部）")
+    args = parser.parse_args()
+
+    # 确保在backend目录下操作
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(script_dir)
+    sys.path.append(script_dir)
+
+    from app.db.database import SessionLocal
+    from app import models  # noqa: F401  注册所有模型
+    from app.utils.score_statistics import rebuild_assignment_stats
+
+    db = SessionLocal()
+    try:
+        count = rebuild_assignment_stats(db, args.assignment_ids or None)
+        db.commit()
+        print(f"✅ 已重建 {count} 个任务的统计数据")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ 重建统计数据失败: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
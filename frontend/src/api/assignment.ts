@@ -4,6 +4,7 @@ import type {
   AssignmentUpdate, 
   AssignmentResponse 
 } from '../types/assignment'
+import type { PageParams } from '../types/pagination'
 
 // 任务相关API
 export const assignmentApi = {
@@ -14,14 +15,14 @@ export const assignmentApi = {
   },
 
   // 获取班级任务
-  getClassAssignments: async (classId: number): Promise<AssignmentResponse[]> => {
-    const response = await apiClient.get(`/assignments/class/${classId}`)
+  getClassAssignments: async (classId: number, params?: PageParams): Promise<AssignmentResponse[]> => {
+    const response = await apiClient.get(`/assignments/class/${classId}`, { params })
     return response.data
   },
 
   // 获取我创建的任务
-  getMyAssignments: async (): Promise<AssignmentResponse[]> => {
-    const response = await apiClient.get('/assignments/my-assignments')
+  getMyAssignments: async (params?: PageParams): Promise<AssignmentResponse[]> => {
+    const response = await apiClient.get('/assignments/my-assignments', { params })
     return response.data
   },
 
@@ -6,8 +6,11 @@ import type {
   ClassWithStudents, 
   JoinClassRequest, 
   ClassSearch, 
-  StudentClassResponse 
+  StudentClassResponse,
+  ClassRosterQuery,
+  ClassRosterEntry
 } from '../types/class'
+import type { PageParams } from '../types/pagination'
 
 // 班级相关API
 export const classApi = {
@@ -36,20 +39,20 @@ export const classApi = {
   },
 
   // 获取我的班级
-  getMyClasses: async (): Promise<ClassResponse[]> => {
-    const response = await apiClient.get('/classes/my-classes')
+  getMyClasses: async (params?: PageParams): Promise<ClassResponse[]> => {
+    const response = await apiClient.get('/classes/my-classes', { params })
     return response.data
   },
 
   // 获取我创建的班级
-  getMyCreatedClasses: async (): Promise<ClassResponse[]> => {
-    const response = await apiClient.get('/classes/my-created-classes')
+  getMyCreatedClasses: async (params?: PageParams): Promise<ClassResponse[]> => {
+    const response = await apiClient.get('/classes/my-created-classes', { params })
     return response.data
   },
 
   // 获取我加入的班级
-  getMyJoinedClasses: async (): Promise<ClassResponse[]> => {
-    const response = await apiClient.get('/classes/my-joined-classes')
+  getMyJoinedClasses: async (params?: PageParams): Promise<ClassResponse[]> => {
+    const response = await apiClient.get('/classes/my-joined-classes', { params })
     return response.data
   },
 
@@ -59,6 +62,12 @@ export const classApi = {
     return response.data
   },
 
+  // 获取班级花名册（每个学生的提交汇总，可排序、分页）
+  getClassRoster: async (classId: number, params?: ClassRosterQuery): Promise<ClassRosterEntry[]> => {
+    const response = await apiClient.get(`/classes/${classId}/roster`, { params })
+    return response.data
+  },
+
   // 更新班级
   update: async (classId: number, classData: ClassUpdate): Promise<ClassResponse> => {
     const response = await apiClient.put(`/classes/${classId}`, classData)
@@ -3,11 +3,20 @@ import type {
   SubmissionGrade,
   SubmissionDetailResponse,
   SubmissionCreateResponse,
+  SubmissionParseStatusResponse,
   SubmissionStatistics,
   StudentSubmissionResponse,
   TeacherSubmissionResponse,
-  PendingAssignmentResponse
+  PendingAssignmentResponse,
+  SubmissionListFilter,
+  SubmissionDetailQuery,
+  SubmissionGradeResponse,
+  BulkImportResponse,
+  SubmissionBatchGradeItem,
+  SubmissionBatchGradeResponse,
+  ExportFormat
 } from '../types/submission'
+import type { PageParams } from '../types/pagination'
 
 // 提交相关API
 export const submissionApi = {
@@ -25,66 +34,94 @@ export const submissionApi = {
     return response.data
   },
 
+  // 教师批量导入提交（docx 文件名为学生用户名，或包含这些文件的 zip 压缩包）
+  bulkImport: async (assignmentId: number, files: File[]): Promise<BulkImportResponse> => {
+    const formData = new FormData()
+    files.forEach(file => formData.append('files', file))
+    
+    const response = await apiClient.post(`/submissions/assignment/${assignmentId}/bulk-import`, formData, {
+      headers: {
+        'Content-Type': 'multipart/form-data',
+      },
+    })
+    return response.data
+  },
+
   // 获取我的提交
-  getMySubmissions: async (): Promise<StudentSubmissionResponse[]> => {
-    const response = await apiClient.get('/submissions/my-submissions')
+  getMySubmissions: async (params?: PageParams): Promise<StudentSubmissionResponse[]> => {
+    const response = await apiClient.get('/submissions/my-submissions', { params })
     return response.data
   },
 
   // 按班级获取我的提交
-  getMySubmissionsByClass: async (classId: number): Promise<StudentSubmissionResponse[]> => {
-    const response = await apiClient.get(`/submissions/my-submissions/class/${classId}`)
+  getMySubmissionsByClass: async (classId: number, params?: PageParams): Promise<StudentSubmissionResponse[]> => {
+    const response = await apiClient.get(`/submissions/my-submissions/class/${classId}`, { params })
     return response.data
   },
 
   // 按任务获取我的提交
-  getMySubmissionsByAssignment: async (assignmentId: number): Promise<StudentSubmissionResponse[]> => {
-    const response = await apiClient.get(`/submissions/my-submissions/assignment/${assignmentId}`)
+  getMySubmissionsByAssignment: async (assignmentId: number, params?: PageParams): Promise<StudentSubmissionResponse[]> => {
+    const response = await apiClient.get(`/submissions/my-submissions/assignment/${assignmentId}`, { params })
     return response.data
   },
 
   // 获取待提交任务
-  getPendingAssignments: async (): Promise<PendingAssignmentResponse[]> => {
-    const response = await apiClient.get('/submissions/my-submissions/pending')
+  getPendingAssignments: async (params?: PageParams): Promise<PendingAssignmentResponse[]> => {
+    const response = await apiClient.get('/submissions/my-submissions/pending', { params })
     return response.data
   },
 
   // 获取任务提交（教师）
-  getAssignmentSubmissions: async (assignmentId: number): Promise<TeacherSubmissionResponse[]> => {
-    const response = await apiClient.get(`/submissions/assignment/${assignmentId}`)
+  getAssignmentSubmissions: async (assignmentId: number, params?: SubmissionListFilter): Promise<TeacherSubmissionResponse[]> => {
+    const response = await apiClient.get(`/submissions/assignment/${assignmentId}`, { params })
     return response.data
   },
 
   // 获取班级提交（教师）
-  getClassSubmissions: async (classId: number): Promise<TeacherSubmissionResponse[]> => {
-    const response = await apiClient.get(`/submissions/class/${classId}`)
+  getClassSubmissions: async (classId: number, params?: SubmissionListFilter): Promise<TeacherSubmissionResponse[]> => {
+    const response = await apiClient.get(`/submissions/class/${classId}`, { params })
     return response.data
   },
 
   // 获取学生提交（教师）
-  getStudentSubmissions: async (studentId: number): Promise<TeacherSubmissionResponse[]> => {
-    const response = await apiClient.get(`/submissions/student/${studentId}`)
+  getStudentSubmissions: async (studentId: number, params?: SubmissionListFilter): Promise<TeacherSubmissionResponse[]> => {
+    const response = await apiClient.get(`/submissions/student/${studentId}`, { params })
     return response.data
   },
 
   // 获取未批改提交
-  getUngradedSubmissions: async (assignmentId: number): Promise<TeacherSubmissionResponse[]> => {
-    const response = await apiClient.get(`/submissions/assignment/${assignmentId}/ungraded`)
+  getUngradedSubmissions: async (assignmentId: number, params?: SubmissionListFilter): Promise<TeacherSubmissionResponse[]> => {
+    const response = await apiClient.get(`/submissions/assignment/${assignmentId}/ungraded`, { params })
+    return response.data
+  },
+
+  // 获取提交详情（include 重复传参：include=outline&include=report）
+  getSubmissionDetail: async (submissionId: number, params?: SubmissionDetailQuery): Promise<SubmissionDetailResponse> => {
+    const response = await apiClient.get(`/submissions/${submissionId}`, {
+      params,
+      paramsSerializer: { indexes: null }
+    })
     return response.data
   },
 
-  // 获取提交详情
-  getSubmissionDetail: async (submissionId: number): Promise<SubmissionDetailResponse> => {
-    const response = await apiClient.get(`/submissions/${submissionId}`)
+  // 获取文件解析状态
+  getParseStatus: async (submissionId: number): Promise<SubmissionParseStatusResponse> => {
+    const response = await apiClient.get(`/submissions/${submissionId}/parse-status`)
     return response.data
   },
 
   // 批改提交
-  gradeSubmission: async (submissionId: number, gradeData: SubmissionGrade): Promise<SubmissionDetailResponse> => {
+  gradeSubmission: async (submissionId: number, gradeData: SubmissionGrade): Promise<SubmissionGradeResponse> => {
     const response = await apiClient.put(`/submissions/${submissionId}/grade`, gradeData)
     return response.data
   },
 
+  // 批量批改提交（例如导入评分表）
+  batchGradeSubmissions: async (items: SubmissionBatchGradeItem[]): Promise<SubmissionBatchGradeResponse> => {
+    const response = await apiClient.put('/submissions/grades', { items })
+    return response.data
+  },
+
   // 获取提交统计
   getAssignmentStatistics: async (assignmentId: number): Promise<SubmissionStatistics> => {
     const response = await apiClient.get(`/submissions/assignment/${assignmentId}/statistics`)
@@ -97,5 +134,31 @@ export const submissionApi = {
       responseType: 'blob'
     })
     return response.data
+  },
+
+  // 导出任务成绩表
+  exportAssignmentGrades: async (assignmentId: number, format: ExportFormat = 'csv'): Promise<Blob> => {
+    const response = await apiClient.get(`/submissions/assignment/${assignmentId}/export`, {
+      params: { format },
+      responseType: 'blob'
+    })
+    return response.data
+  },
+
+  // 导出班级成绩册
+  exportClassGrades: async (classId: number, format: ExportFormat = 'csv'): Promise<Blob> => {
+    const response = await apiClient.get(`/submissions/class/${classId}/export`, {
+      params: { format },
+      responseType: 'blob'
+    })
+    return response.data
+  },
+
+  // 打包下载任务的全部原始文件（zip）
+  exportAssignmentFiles: async (assignmentId: number): Promise<Blob> => {
+    const response = await apiClient.get(`/submissions/assignment/${assignmentId}/export/files`, {
+      responseType: 'blob'
+    })
+    return response.data
   }
 }
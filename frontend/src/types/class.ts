@@ -1,4 +1,5 @@
 // 班级相关类型定义
+import type { PageParams } from './pagination'
 
 export interface ClassCreate {
   name: string
@@ -37,11 +38,30 @@ export interface ClassWithStudents {
   }>
 }
 
+// 班级花名册排序字段
+export type RosterSortField = 'name' | 'joined_at' | 'submission_count' | 'graded_count' | 'average_score'
+
+// 班级花名册查询参数（翻页时排序参数需保持不变）
+export interface ClassRosterQuery extends PageParams {
+  sort_by?: RosterSortField
+  order?: 'asc' | 'desc'
+}
+
+export interface ClassRosterEntry {
+  student_id: number
+  name: string
+  joined_at: string
+  submission_count: number
+  graded_count: number
+  average_score?: number
+}
+
 export interface JoinClassRequest {
   class_id: number
 }
 
-export interface ClassSearch {
+// 搜索班级（结果按相关度排序，默认每页 20 条，下一页游标在响应头 X-Next-Cursor 中返回）
+export interface ClassSearch extends PageParams {
   search_term: string
 }
 
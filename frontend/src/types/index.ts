@@ -6,6 +6,7 @@ export interface ApiResponse<T = any> {
 }
 
 // 导出其他模块类型
+export * from './pagination'
 export * from './auth'
 export * from './class'
 export * from './assignment'
@@ -0,0 +1,7 @@
+// 游标分页相关类型定义
+
+// 游标分页参数（下一页游标在响应头 X-Next-Cursor 中返回）
+export interface PageParams {
+  cursor?: string
+  limit?: number
+}
@@ -1,4 +1,5 @@
 // 提交相关类型定义
+import type { PageParams } from './pagination'
 
 export interface SubmissionGrade {
   score: number
@@ -29,6 +30,15 @@ export interface TeacherSubmissionResponse {
   is_graded: boolean
 }
 
+// 提交详情中可以按需加载的部分
+export type SubmissionDetailSection = 'metadata' | 'outline' | 'paragraphs' | 'report'
+
+export interface SubmissionDetailQuery {
+  include?: SubmissionDetailSection[]
+  offset?: number
+  limit?: number
+}
+
 export interface SubmissionDetailResponse {
   id: number
   student_name: string
@@ -36,6 +46,7 @@ export interface SubmissionDetailResponse {
   class_id: number
   class_name: string
   file_json?: any
+  parse_status: string
   report?: string
   score?: number
   submitted_at: string
@@ -43,13 +54,75 @@ export interface SubmissionDetailResponse {
   is_graded: boolean
 }
 
+export interface SubmissionBatchGradeItem extends SubmissionGrade {
+  submission_id: number
+}
+
+export type BatchGradeStatus = 'graded' | 'not_found' | 'forbidden'
+
+export interface SubmissionBatchGradeResponse {
+  graded: number
+  failed: number
+  items: {
+    submission_id: number
+    status: BatchGradeStatus
+  }[]
+}
+
+export interface SubmissionGradeResponse {
+  id: number
+  score?: number
+  report?: string
+  graded_at?: string
+  is_graded: boolean
+}
+
 export interface SubmissionCreateResponse {
   id: number
   assignment_title: string
   submitted_at: string
+  parse_status: string
+  cache_hit: boolean
   message: string
 }
 
+export type BulkImportStatus = 'created' | 'updated' | 'failed'
+
+export interface BulkImportItem {
+  file_name: string
+  student_name?: string
+  status: BulkImportStatus
+  submission_id?: number
+  parse_status?: string
+  cache_hit: boolean
+  message: string
+}
+
+export interface BulkImportResponse {
+  assignment_id: number
+  total: number
+  created: number
+  updated: number
+  failed: number
+  items: BulkImportItem[]
+}
+
+// 成绩表导出格式
+export type ExportFormat = 'csv' | 'xlsx'
+
+export interface SubmissionParseStatusResponse {
+  submission_id: number
+  parse_status: string
+  error?: string
+  updated_at?: string
+}
+
+export interface ScoreHistogramBucket {
+  range_start: number
+  range_end: number
+  count: number
+}
+
 export interface SubmissionStatistics {
   total_submissions: number
   graded_submissions: number
@@ -57,6 +130,12 @@ export interface SubmissionStatistics {
   average_score?: number
   highest_score?: number
   lowest_score?: number
+  std_deviation?: number
+  median_score?: number
+  percentile_25?: number
+  percentile_75?: number
+  percentile_90?: number
+  histogram: ScoreHistogramBucket[]
 }
 
 export interface PendingAssignmentResponse {
@@ -69,3 +148,12 @@ export interface PendingAssignmentResponse {
   created_at: string
   deadline?: string
 }
+
+// 提交列表筛选条件（教师端）
+export interface SubmissionListFilter extends PageParams {
+  graded?: boolean
+  min_score?: number
+  max_score?: number
+  student_name?: string
+  submitted_after?: string
+}